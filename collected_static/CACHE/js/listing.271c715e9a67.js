@@ -0,0 +1,2 @@
+# TODO: Move to static/js (?)
+$('.listing li').click -> window.location.href = $(this).find('a:first').attr('href')
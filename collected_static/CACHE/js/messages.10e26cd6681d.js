@@ -0,0 +1 @@
+$(".messages").delay(2000).fadeOut(400);
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import SESSION_KEY, BACKEND_SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+from openreview.apps.accounts.models import get_user_cache_key, USER_CACHE_TTL
+
+
+def get_user(request):
+    """
+    Behaves the same as django.contrib.auth.get_user, but loads users from the cache
+    if possible. Cached users are invalidated when they are saved or deleted; users
+    changed by QuerySet.update() need to be invalidated with uncache_users().
+    """
+    user_id = request.session.get(SESSION_KEY)
+    backend_path = request.session.get(BACKEND_SESSION_KEY)
+
+    # Like auth.get_user, do not trust sessions of backends which are no longer enabled
+    if user_id is None or backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return auth.get_user(request)
+
+    key = get_user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = auth.get_user(request)
+        if user.is_authenticated():
+            cache.set(key, user, USER_CACHE_TTL)
+    else:
+        user.backend = backend_path
+
+    return user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """AuthenticationMiddleware which does not query the user table on every request."""
+    def process_request(self, request):
+        assert hasattr(request, 'session'), "The authentication middleware requires session middleware."
+        request.user = SimpleLazyObject(lambda: get_user(request))
@@ -1,7 +1,30 @@
 from django.contrib.auth.models import AbstractUser
-from openreview.apps.main.models.review import bulk_delete
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from openreview.apps.main.models.review import bulk_delete, update_vote_counts, Review
+from openreview.apps.main.models.score import update_controversy_sums
+from openreview.apps.main.versions import bump_versions
 from django.db import models
 
+# Users are cached by CachedAuthenticationMiddleware for this many seconds
+USER_CACHE_TTL = 60 * 60
+
+
+def get_user_cache_key(user_id):
+    return "user-{user_id}".format(user_id=user_id)
+
+
+def uncache_users(user_ids):
+    """
+    Removes users from the cache of CachedAuthenticationMiddleware. This happens when
+    a user is saved or deleted, but QuerySet.update() does not send signals: call this
+    after updating users that way (for example when deactivating them in bulk).
+
+    @type user_ids: iterable
+    """
+    cache.delete_many([get_user_cache_key(user_id) for user_id in user_ids])
+
 
 class User(AbstractUser):
     """Copies properties of default User model. Defining it ourselves
@@ -16,8 +39,15 @@ class User(AbstractUser):
         if delete_reviews:
             bulk_delete(self.reviews.all())
         else:
+            posted = dict(self.reviews.values_list("id", "paper_id"))
             self.reviews.all().update(poster=None, anonymous=True)
+            bump_versions(set(posted.values()), posted)
+
+        # Votes are removed by a cascading delete, which bypasses Vote.delete()
+        voted_on = list(self.votes.values_list("review_id", "review__paper_id"))
         super().delete()
+        update_vote_counts(Review.objects.filter(id__in=[review_id for review_id, _ in voted_on]))
+        update_controversy_sums(paper_id for _, paper_id in voted_on)
 
     def full_name(self):
         full_name = "{self.username}"
@@ -28,3 +58,13 @@ class User(AbstractUser):
             full_name += " ({self.title}, {self.university})"
 
         return full_name.format(self=self)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    uncache_users([instance.id])
+
+    # Pages showing reviews of this user show their name
+    posted = dict(Review.objects.filter(poster_id=instance.id).values_list("id", "paper_id"))
+    bump_versions(set(posted.values()), posted)
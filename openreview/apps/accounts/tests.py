@@ -3,11 +3,11 @@ import unittest
 from django.core.urlresolvers import reverse
 from django.test.client import Client
 from openreview.apps.accounts.forms import is_email, RegisterForm, SettingsForm, AccountDeleteForm
-from openreview.apps.accounts.models import User
+from openreview.apps.accounts.models import User, uncache_users
 from openreview.apps.tools.testing import BaseTestCase
 from openreview.apps.main.models.review import Review
 from openreview.apps.tools.testing import SeleniumTestCase, create_test_user, create_test_author, \
-    create_test_review, create_test_paper
+    create_test_review, create_test_paper, list_queries
 
 
 class TestForms(BaseTestCase):
@@ -176,6 +176,52 @@ class TestSettingsForm(BaseTestCase):
         self.assertEqual(len(self.u.reviews.all()), 5)
 
 
+class TestCachedUser(BaseTestCase):
+    def setUp(self):
+        User.objects.filter(username="CachedUser").delete()
+        self.u = User.objects.create_user(username="CachedUser", password="test123")
+        self.client = Client()
+        self.client.login(username="CachedUser", password="test123")
+        super().setUp()
+
+    def _user_queries(self):
+        with list_queries() as queries:
+            response = self.client.get(reverse("team"))
+        return response, [q for q in queries if "accounts_user" in q["sql"]]
+
+    def test_cached(self):
+        self._user_queries()
+        response, queries = self._user_queries()
+        self.assertEqual(queries, [])
+        self.assertEqual(response.context["user"], self.u)
+
+    def test_disabled_backend(self):
+        self._user_queries()
+
+        # Cached users of sessions with a backend which is no longer enabled are ignored
+        with self.settings(AUTHENTICATION_BACKENDS=("django.contrib.auth.backends.RemoteUserBackend",)):
+            response, _ = self._user_queries()
+        self.assertFalse(response.context["user"].is_authenticated())
+
+    def test_invalidation(self):
+        self._user_queries()
+        self.client.post(reverse("accounts-settings"), {"first_name": "Cached", "last_name": "User"})
+
+        response, queries = self._user_queries()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.context["user"].first_name, "Cached")
+
+        # QuerySet.update() does not send signals
+        User.objects.filter(id=self.u.id).update(first_name="Updated")
+        self.assertEqual(self._user_queries()[0].context["user"].first_name, "Cached")
+        uncache_users([self.u.id])
+        self.assertEqual(self._user_queries()[0].context["user"].first_name, "Updated")
+
+        self.u.delete()
+        response, _ = self._user_queries()
+        self.assertTrue(response.context["user"].is_anonymous())
+
+
 class TestSettingsFormLive(SeleniumTestCase):
     def setUp(self):
         User.objects.all().delete()
@@ -6,7 +6,6 @@ from django.shortcuts import redirect
 from django.db import transaction
 from django.views.generic import TemplateView, RedirectView
 from django.utils.decorators import method_decorator
-from openreview.apps.main.models.review import set_n_votes_cache
 
 from openreview.apps.accounts.forms import RegisterForm, SettingsForm, AccountDeleteForm
 
@@ -89,7 +88,6 @@ class SettingsView(TemplateView):
 
     def get(self, request, *args, **kwargs):
         reviews = request.user.reviews.all()
-        set_n_votes_cache(reviews)
         return super().get(request, reviews=reviews, settings_form=self.settings_form, *args, **kwargs)
 
 
@@ -126,5 +124,4 @@ class ContributionsView(TemplateView):
     @method_decorator(login_required)
     def get(self, request, *args, **kwargs):
         reviews = request.user.reviews.all()
-        set_n_votes_cache(reviews)
         return super().get(request, reviews=reviews, *args, **kwargs)
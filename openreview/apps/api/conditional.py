@@ -0,0 +1,34 @@
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from openreview.apps.main.versions import get_etag
+
+__all__ = ["ConditionalRetrieveMixin"]
+
+
+class ConditionalRetrieveMixin(object):
+    """
+    Adds an ETag to responses of single objects, and answers requests passing the
+    current one in If-None-Match with 304 Not Modified. This is decided before the
+    object is fetched or serialized. Viewsets define `get_version_keys()`, which
+    returns keys of version stamps (see main.versions) covering the object.
+    """
+    def get_version_keys(self):
+        raise NotImplementedError("Subclasses should implement get_version_keys()")
+
+    def retrieve(self, request, *args, **kwargs):
+        # Forms of the browsable API embed the CSRF token
+        csrf_token = request.accepted_renderer.format == "api"
+        etag = get_etag(request, *self.get_version_keys(), csrf_token=csrf_token)
+        etags = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+
+        # "*" is not handled, as it requires knowing whether the object exists
+        if etag in etags:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().retrieve(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = quote_etag(etag)
+        return response
@@ -1,9 +1,51 @@
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
+from django.core.urlresolvers import reverse
 from rest_framework.exceptions import APIException
 from rest_framework.fields import Field
 from rest_framework.relations import HyperlinkedRelatedField, HyperlinkedIdentityField
 from openreview.apps.tools.string import to_bool
 
+# Reversed in place of url arguments, and replaced by placeholders afterwards. Digits
+# only, so it matches the patterns of all routes.
+SENTINEL = 987654321000
+
+# (view_name, argument names) -> url template, see get_url_template()
+_url_templates = {}
+
+
+def get_url_template(view_name, kwarg_names=("pk",)):
+    """
+    Reverses `view_name` once per process, and returns its path as a %-format string
+    with a named placeholder for each argument:
+
+    >>> get_url_template("review-detail")
+    '/api/v1/reviews/%(pk)s/'
+
+    @type kwarg_names: tuple
+    @raises NoReverseMatch: if the view does not exist
+    """
+    key = (view_name, kwarg_names)
+    if key not in _url_templates:
+        sentinels = {name: str(SENTINEL + i) for i, name in enumerate(kwarg_names)}
+        path = reverse(view_name, kwargs=sentinels).replace("%", "%%")
+        for name, sentinel in sentinels.items():
+            path = path.replace(sentinel, "%({name})s".format(name=name))
+        _url_templates[key] = path
+    return _url_templates[key]
+
+def build_url(request, view_name, kwargs):
+    """
+    Returns the absolute url of `view_name` for `kwargs`. Equivalent to DRF's reverse(),
+    but without resolving urls for every object.
+    """
+    path = get_url_template(view_name, tuple(sorted(kwargs))) % kwargs
+    if request is None:
+        return path
+
+    # Scheme and host are the same for all urls of a request
+    if not hasattr(request, "_base_url"):
+        request._base_url = request.build_absolute_uri("/")[:-1]
+    return request._base_url + path
 
 class RelativeField(Field):
     def field_to_native(self, obj, field_name):
@@ -13,6 +55,10 @@ class RelativeField(Field):
         return "{url}{field_name}/".format(**locals())
 
 def show_hyperlinks(request):
+    """Parses GET parameter `hyperlinks` (default: true), once per request."""
+    if hasattr(request, "_show_hyperlinks"):
+        return request._show_hyperlinks
+
     hyperlinks = request.GET.get("hyperlinks", True)
 
     try:
@@ -20,13 +66,34 @@ def show_hyperlinks(request):
     except ValueError:
         raise APIException("GET parameter hyperlinks (=> {hyperlinks}) is not a valid boolean.".format(**locals()))
 
+    request._show_hyperlinks = hyperlinks
     return hyperlinks
 
 
-class CustomHyperlinkedRelatedField(HyperlinkedRelatedField):
+class URLTemplateMixin(object):
+    """
+    Builds urls with build_url() instead of reversing them for every object. Views with
+    more arguments than a primary key (nested routes) are supported by passing
+    `url_kwargs`, which maps url arguments to attributes of the object.
+    """
+    def __init__(self, *args, **kwargs):
+        self.url_kwargs = kwargs.pop("url_kwargs", {"pk": "pk"})
+        super().__init__(*args, **kwargs)
+
+    def get_url(self, obj, view_name, request, format):
+        if format or self.lookup_field != "pk":
+            return super().get_url(obj, view_name, request, format)
+
+        kwargs = {name: getattr(obj, attr) for name, attr in self.url_kwargs.items()}
+        return build_url(request, view_name, kwargs)
+
+class CustomHyperlinkedIdentityField(URLTemplateMixin, HyperlinkedIdentityField):
+    pass
+
+class CustomHyperlinkedRelatedField(URLTemplateMixin, HyperlinkedRelatedField):
     """
     Patched version of `rest_framework.fields.HyperlinkedRelatedField`: also accepts
-    primary keys (along urls) when parsing.
+    primary keys (along urls) when parsing, and builds urls from templates.
     """
     def to_native(self, obj):
         if not show_hyperlinks(self.context["request"]):
@@ -0,0 +1,76 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePaginationSerializer
+from rest_framework.templatetags.rest_framework import replace_query_param
+
+from openreview.apps.tools.pagination import CursorPaginator, CursorPage, InvalidCursor
+
+__all__ = ["CursorPaginationMixin", "CursorPaginationSerializer"]
+
+CURSOR_PARAM = "cursor"
+COUNT_PARAM = "count"
+
+
+class NextCursorField(serializers.Field):
+    """
+    Field that returns a link to the next page of cursor paginated results.
+    """
+    def to_native(self, page):
+        if not page.has_next():
+            return None
+        request = self.context.get("request")
+        url = request and request.build_absolute_uri() or ""
+        return replace_query_param(url, CURSOR_PARAM, page.next_cursor)
+
+
+class CursorPaginationSerializer(BasePaginationSerializer):
+    next = NextCursorField(source="*")
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        # Counting all objects is expensive, and only done if explicitly asked for
+        request = self.context.get("request")
+        if request is not None and request.QUERY_PARAMS.get(COUNT_PARAM) in ("1", "true", "True"):
+            fields["count"] = serializers.Field(source="paginator.count")
+
+        return fields
+
+
+class CursorPaginationMixin(object):
+    """
+    Paginates list views on id if the parameter `cursor` is passed (it may be empty to
+    fetch the first page). Unlike page numbers, cursors do not get slower as pages get
+    deeper. The total number of objects is only returned when passing `count=true`.
+    """
+    cursor_key = "id"
+    cursor_key_type = int
+
+    def paginate_queryset(self, queryset, page_size=None):
+        if CURSOR_PARAM not in self.request.QUERY_PARAMS:
+            return super().paginate_queryset(queryset, page_size)
+
+        page_size = page_size or self.get_paginate_by()
+        if not page_size:
+            return None
+
+        paginator = CursorPaginator(
+            queryset, page_size, key=self.cursor_key,
+            key_type=self.cursor_key_type, descending=False
+        )
+
+        try:
+            return paginator.page(self.request.QUERY_PARAMS[CURSOR_PARAM] or None)
+        except InvalidCursor as e:
+            raise ParseError(str(e))
+
+    def get_pagination_serializer(self, page):
+        if not isinstance(page, CursorPage):
+            return super().get_pagination_serializer(page)
+
+        class SerializerClass(CursorPaginationSerializer):
+            class Meta:
+                object_serializer_class = self.get_serializer_class()
+
+        # CursorPage is iterable, which DRF would otherwise serialize as a list of pages
+        return SerializerClass(instance=page, many=False, context=self.get_serializer_context())
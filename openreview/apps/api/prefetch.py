@@ -0,0 +1,20 @@
+__all__ = ["PrefetchMixin"]
+
+
+class PrefetchMixin(object):
+    """
+    Fetches the relations rendered by the serializer along with the objects, instead of
+    issuing a query per object. Viewsets declare their plan as `select_related` (foreign
+    keys, joined into the same query) and `prefetch_related` (many-to-many relations, one
+    query each per page). Applied to both list and detail views.
+    """
+    select_related = ()
+    prefetch_related = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
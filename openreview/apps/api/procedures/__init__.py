@@ -3,7 +3,8 @@ from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
 from openreview.apps.api.procedures.preview import PreviewProcedure
-from openreview.apps.api.procedures.vote import VoteProcedure
+from openreview.apps.api.procedures.review import ReviewsProcedure
+from openreview.apps.api.procedures.vote import VoteProcedure, VotesProcedure
 
 
 __all__ = [
@@ -12,7 +13,7 @@ __all__ = [
     "PreviewProcedure"
 ]
 
-PROCEDURES = [PreviewProcedure, VoteProcedure]
+PROCEDURES = [PreviewProcedure, VoteProcedure, VotesProcedure, ReviewsProcedure]
 
 def get_procedure_name(viewcls):
     """
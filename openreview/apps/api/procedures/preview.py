@@ -43,8 +43,6 @@ class PreviewProcedure(APIView):
         review = preview_form.save(commit=False)
         review.id = 0
         review._n_comments = 0
-        review._n_downvotes = 0
-        review._n_upvotes = 0
         review._reviews_children = {0: []}
         review.timestamp = datetime.now()
 
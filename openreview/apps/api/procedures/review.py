@@ -0,0 +1,71 @@
+from django import forms
+from django.db import transaction
+from django.utils.decorators import method_decorator
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from openreview.apps.main.forms import ReviewForm
+from openreview.apps.main.models import Paper
+from openreview.apps.tools.auth import login_required
+
+# Maximum number of reviews per request
+MAX_REVIEWS = 500
+
+
+class ImportReviewForm(ReviewForm):
+    paper = forms.IntegerField()
+
+
+class ReviewsProcedure(APIView):
+    """
+    Imports many reviews at once, and is only available to staff members. Takes
+    argument `reviews`: a list of objects with properties `paper` (primary key),
+    `rating`, `text` and `visibility` (see `preview`). Reviews are posted by the
+    logged in user; use visibility `external` for reviews written by somebody else.
+
+    Either all reviews are imported, or none if one of them is invalid. Returns the
+    primary keys of the new reviews in property `reviews`.
+    """
+    def get(self, request, format=None):
+        return Response({"details": "POST only."})
+
+    @method_decorator(login_required)
+    def post(self, request, format=None):
+        if not request.user.is_staff:
+            return Response({"details": "Only staff members can import reviews."}, status=403)
+
+        reviews = request.DATA.get("reviews") if isinstance(request.DATA, dict) else None
+        if not isinstance(reviews, list) or not reviews:
+            return Response({"details": {"reviews": ["This field is required."]}}, status=400)
+        if len(reviews) > MAX_REVIEWS:
+            return Response({"details": {"reviews": ["At most %d reviews are allowed." % MAX_REVIEWS]}}, status=400)
+
+        errors, review_forms = [], []
+        for i, review in enumerate(reviews):
+            review_form = ImportReviewForm(user=request.user, data=review if isinstance(review, dict) else {})
+            if review_form.is_valid():
+                review_forms.append(review_form)
+            else:
+                errors.append({"index": i, "errors": review_form._errors})
+
+        # All papers are checked at once, instead of by each form
+        paper_ids = {form.cleaned_data["paper"] for form in review_forms}
+        existing = set(Paper.objects.filter(id__in=paper_ids).values_list("id", flat=True))
+        for paper_id in paper_ids - existing:
+            errors.append({"paper": paper_id, "errors": {"paper": ["Paper does not exist."]}})
+
+        if errors:
+            return Response({"details": {"reviews": errors}}, status=400)
+
+        # Reviews are saved one by one, as Review.save() maintains paths and counters
+        ids = []
+        try:
+            with transaction.atomic():
+                for form in review_forms:
+                    review = form.save(commit=False)
+                    review.paper_id = form.cleaned_data["paper"]
+                    review.save()
+                    ids.append(review.id)
+        except ValueError as e:
+            return Response({"details": str(e)}, status=400)
+
+        return Response({"details": "OK", "reviews": ids}, status=201)
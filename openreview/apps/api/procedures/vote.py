@@ -3,7 +3,7 @@ from django.forms import ModelForm
 from django.utils.decorators import method_decorator
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from openreview.apps.main.models import Vote
+from openreview.apps.main.models import Vote, Review, cast_votes
 from openreview.apps.tools.auth import login_required
 
 
@@ -24,14 +24,59 @@ class VoteProcedure(APIView):
         if not vote_form.is_valid():
             return Response({"details": vote_form._errors}, status=400)
 
-        review = vote_form.cleaned_data["review"]
-        vote, _ = Vote.objects.get_or_create(voter=request.user, review=review)
-        vote.vote = vote_form.cleaned_data["vote"]
-        vote.save()
+        Vote.cast(request.user, vote_form.cleaned_data["review"], vote_form.cleaned_data["vote"])
 
         return Response({"details": "OK"}, status=201)
 
 
+# Maximum number of votes per request
+MAX_VOTES = 1000
+
+
+class VotesProcedure(APIView):
+    """
+    Casts many votes at once, for example when synchronising votes cast offline. Takes
+    argument `votes`: a list of objects with properties `review` and `vote`, like the
+    arguments of the `vote` procedure. At most 1000 votes can be cast per request. If
+    a review occurs more than once, the last vote counts.
+    """
+    def get(self, request, format=None):
+        return Response({"details": "POST only."})
+
+    @method_decorator(login_required)
+    def post(self, request, format=None):
+        votes = request.DATA.get("votes") if isinstance(request.DATA, dict) else None
+        if not isinstance(votes, list) or not votes:
+            return Response({"details": {"votes": ["This field is required."]}}, status=400)
+        if len(votes) > MAX_VOTES:
+            return Response({"details": {"votes": ["At most %d votes are allowed." % MAX_VOTES]}}, status=400)
+
+        errors, values = [], []
+        for i, vote in enumerate(votes):
+            vote_form = VoteValuesForm(data=vote if isinstance(vote, dict) else {})
+            if vote_form.is_valid():
+                values.append((vote_form.cleaned_data["review"], vote_form.cleaned_data["vote"]))
+            else:
+                errors.append({"index": i, "errors": vote_form._errors})
+
+        # All reviews are fetched at once, instead of by each form
+        reviews = Review.objects.only("id", "paper").in_bulk([review_id for review_id, _ in values])
+        for review_id, _ in values:
+            if review_id not in reviews:
+                errors.append({"review": review_id, "errors": {"review": ["Review does not exist."]}})
+
+        if errors:
+            return Response({"details": {"votes": errors}}, status=400)
+
+        cast_votes(request.user, [(reviews[review_id], vote) for review_id, vote in values])
+        return Response({"details": "OK"}, status=201)
+
+
+class VoteValuesForm(forms.Form):
+    review = forms.IntegerField()
+    vote = forms.IntegerField(min_value=-1, max_value=1)
+
+
 class VoteForm(ModelForm):
     vote = forms.IntegerField(min_value=-1, max_value=1)
 
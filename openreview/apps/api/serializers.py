@@ -1,11 +1,12 @@
 from itertools import chain
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.serializers import HyperlinkedModelSerializer
-from openreview.apps.api.fields import CustomHyperlinkedRelatedField
+from openreview.apps.api.fields import CustomHyperlinkedRelatedField, CustomHyperlinkedIdentityField
 
 
 class CustomHyperlinkedModelSerializer(HyperlinkedModelSerializer):
     _hyperlink_field_class = CustomHyperlinkedRelatedField
+    _hyperlink_identify_field_class = CustomHyperlinkedIdentityField
 
     @property
     def request(self):
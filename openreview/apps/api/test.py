@@ -3,3 +3,5 @@ from openreview.apps.api.tests.category import *
 from openreview.apps.api.tests.paper import *
 from openreview.apps.api.tests.preview import *
 from openreview.apps.api.tests.vote import *
+from openreview.apps.api.tests.queries import *
+from openreview.apps.api.tests.fields import *
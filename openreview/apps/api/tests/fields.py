@@ -0,0 +1,34 @@
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from openreview.apps.api.fields import get_url_template, build_url
+from openreview.apps.api.tests.review import _get_json
+from openreview.apps.tools.testing import create_test_review, create_test_vote, create_test_user
+
+__all__ = ["TestURLTemplates"]
+
+
+class TestURLTemplates(TestCase):
+    def test_template(self):
+        self.assertEqual(get_url_template("review-detail") % {"pk": 12}, reverse("review-detail", kwargs={"pk": 12}))
+        self.assertEqual(
+            get_url_template("vote-detail", ("pk", "user_id")) % {"pk": 3, "user_id": 4},
+            reverse("vote-detail", kwargs={"pk": 3, "user_id": 4})
+        )
+
+    def test_build_url(self):
+        self.assertEqual(build_url(None, "user-detail", {"pk": 1}), reverse("user-detail", kwargs={"pk": 1}))
+
+    def test_serialized_urls(self):
+        review = create_test_review()
+        _, content = _get_json(reverse("review-detail", kwargs={"pk": review.id}))
+        self.assertEqual(content["url"], "http://testserver" + reverse("review-detail", kwargs={"pk": review.id}))
+        self.assertEqual(content["poster"], "http://testserver" + reverse("user-detail", kwargs={"pk": review.poster_id}))
+
+    def test_nested_urls(self):
+        voter = create_test_user(votes_public=True)
+        vote = create_test_vote(voter=voter)
+
+        _, content = _get_json(reverse("vote-list", kwargs={"user_id": voter.id}))
+        url = reverse("vote-detail", kwargs={"user_id": voter.id, "pk": vote.id})
+        self.assertEqual(content["results"][0]["url"], "http://testserver" + url)
@@ -88,3 +88,20 @@ class TestPaperAPI(TestCase):
         self.assertEqual(set(paper[0].authors.all()), {a1})
         self.assertEqual(set(paper[0].keywords.all()), {k1})
         self.assertEqual(set(paper[0].categories.all()), {c1})
+
+    def test_cursor(self):
+        papers = [create_test_paper() for i in range(15)]
+
+        # Cursor pagination does not count unless asked for
+        _, content = _get_json(self.url + "?cursor=")
+        self.assertNotIn("count", content)
+        self.assertNotIn("previous", content)
+        self.assertEqual([p["id"] for p in content["results"]], [p.id for p in papers[:10]])
+
+        _, content = _get_json(content["next"] + "&count=true")
+        self.assertEqual(content["count"], 15)
+        self.assertIsNone(content["next"])
+        self.assertEqual([p["id"] for p in content["results"]], [p.id for p in papers[10:]])
+
+        response, _ = _get_json(self.url + "?cursor=abc")
+        self.assertEqual(response.status_code, 400)
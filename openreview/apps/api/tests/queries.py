@@ -0,0 +1,76 @@
+from django.test import TestCase, Client
+
+from openreview.apps.api import urls
+from openreview.apps.tools.testing import list_queries, create_test_user, create_test_author
+from openreview.apps.tools.testing import create_test_keyword, create_test_category
+from openreview.apps.tools.testing import create_test_paper, create_test_review, create_test_vote
+
+__all__ = ["TestQueryCounts"]
+
+
+class TestQueryCounts(TestCase):
+    """
+    Requests a page of every list route in api/urls.py, before and after adding more
+    objects to it. Relations rendered by the serializers should be fetched along with
+    the page (see PrefetchMixin), so the number of queries must not change.
+    """
+    def setUp(self):
+        self.user = create_test_user(password="test", votes_public=True)
+        self.category = create_test_category()
+        self.keyword = create_test_keyword()
+        self.paper = create_test_paper()
+        self.review = create_test_review(paper=self.paper, poster=self.user)
+
+        self.client = Client()
+        self.client.login(username=self.user.username, password="test")
+
+    def _populate(self):
+        """Adds objects (with all relations set) to every list route."""
+        paper = create_test_paper()
+        paper.authors.add(create_test_author(user=create_test_user()))
+        paper.keywords.add(self.keyword, create_test_keyword())
+        paper.categories.add(self.category, create_test_category(parent=self.category))
+
+        self.paper.authors.add(create_test_author(user=create_test_user()))
+        self.paper.keywords.add(create_test_keyword())
+
+        review = create_test_review(paper=paper, poster=self.user)
+        create_test_review(paper=self.paper, parent=self.review, poster=self.user, anonymous=True)
+        create_test_vote(review=review, voter=self.user)
+
+    def _get_list_urls(self):
+        routers = (
+            (urls.top_router, ""),
+            (urls.users_router, "users/{self.user.id}/"),
+            (urls.papers_router, "papers/{self.paper.id}/"),
+            (urls.keywords_router, "keywords/{self.keyword.id}/"),
+            (urls.categories_router, "categories/{self.category.id}/"),
+            (urls.reviews_router, "reviews/{self.review.id}/"),
+        )
+
+        for router, parent in routers:
+            for prefix, viewset, _ in router.registry:
+                # Procedures are not backed by a model
+                if getattr(viewset, "model", None) is None:
+                    continue
+                yield "/api/v1/" + parent.format(self=self) + prefix + "/"
+
+    def _count_queries(self, url):
+        with list_queries() as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(queries)
+
+    def test_constant_queries(self):
+        self._populate()
+        list_urls = [url + params for url in self._get_list_urls() for params in ("", "?cursor=")]
+
+        # Warm up caches (such as the logged in user) which are only filled once
+        self.client.get(list_urls[0])
+        counts = [self._count_queries(url) for url in list_urls]
+
+        for i in range(4):
+            self._populate()
+
+        for url, count in zip(list_urls, counts):
+            self.assertEqual(self._count_queries(url), count, url)
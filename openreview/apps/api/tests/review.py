@@ -2,9 +2,10 @@ import json
 from django.core.urlresolvers import reverse
 from django.test import Client, TestCase
 from openreview.apps.main.models import Review
-from openreview.apps.tools.testing import create_test_review, create_test_user, create_test_paper
+from openreview.apps.tools.testing import create_test_review, create_test_user, create_test_paper, create_test_vote
+from openreview.apps.tools.testing import assert_max_queries
 
-__all__ = ["TestReviewAPI"]
+__all__ = ["TestReviewAPI", "ReviewsProcedureTest"]
 
 def _get_json(url, client=None, data=None, encoding="utf-8"):
     client = client or Client()
@@ -182,3 +183,65 @@ class TestReviewAPI(TestCase):
         review = Review.objects.filter(paper=paper, poster=u.id, rating=2, parent=review[0])
         self.assertTrue(review.exists())
         self.assertEqual(review[0].text, "comment")
+
+    def test_conditional_get(self):
+        review = create_test_review()
+        url = reverse("review-detail", args=[review.id])
+        client = Client()
+
+        etag = client.get(url)["ETag"]
+        with assert_max_queries(n=0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        create_test_vote(review=review)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        # If-None-Match: * does not hide that a review does not exist
+        url = reverse("review-detail", args=[review.id + 1])
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH="*").status_code, 404)
+
+
+class ReviewsProcedureTest(TestCase):
+    def setUp(self):
+        self.user = create_test_user(password="test")
+        self.user.is_staff = True
+        self.user.save()
+        self.client = Client()
+        self.client.login(username=self.user.username, password="test")
+        self.paper = create_test_paper()
+
+    @property
+    def url(self):
+        return reverse("procedure-reviews")
+
+    def _review(self, **kwargs):
+        return dict(dict(paper=self.paper.id, rating=4, text="foo", visibility="external"), **kwargs)
+
+    def test_staff_only(self):
+        user = create_test_user(password="test")
+        client = Client()
+        client.login(username=user.username, password="test")
+
+        response, _ = _get_json(self.url, data=dict(reviews=[self._review()]), client=client)
+        self.assertEqual(response.status_code, 403)
+
+    def test_post(self):
+        reviews = [self._review(), self._review(text="bar", visibility="public")]
+        response, content = _get_json(self.url, data=dict(reviews=reviews), client=self.client)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(content["reviews"]), 2)
+        self.assertEqual(2, Review.objects.filter(paper=self.paper, poster=self.user).count())
+        self.assertTrue(Review.objects.get(id=content["reviews"][0]).external)
+
+    def test_invalid_post(self):
+        reviews = [self._review(), self._review(rating=9), self._review(paper=self.paper.id + 1000)]
+        response, content = _get_json(self.url, data=dict(reviews=reviews), client=self.client)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(content["details"]["reviews"]), 2)
+        self.assertFalse(Review.objects.filter(paper=self.paper).exists())
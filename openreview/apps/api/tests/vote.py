@@ -2,11 +2,11 @@ from django.core.urlresolvers import reverse
 from django.test import TestCase, Client
 
 from openreview.apps.api.tests.review import _get_json
-from openreview.apps.main.models import Vote
+from openreview.apps.main.models import Vote, Review
 from openreview.apps.tools.testing import create_test_user, create_test_review
 
 
-__all__ = ["VoteProcedureTest"]
+__all__ = ["VoteProcedureTest", "VotesProcedureTest"]
 
 
 class VoteProcedureTest(TestCase):
@@ -54,3 +54,43 @@ class VoteProcedureTest(TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.content, b'{"details": "OK"}')
         self.assertTrue(Vote.objects.filter(review=review, vote=-1, voter=self.user))
+
+
+class VotesProcedureTest(TestCase):
+    def setUp(self):
+        self.user = create_test_user(password="test")
+        self.client = Client()
+        self.client.login(username=self.user.username, password="test")
+
+    @property
+    def url(self):
+        return reverse("procedure-votes")
+
+    def test_anonymous_post(self):
+        response = Client().post(self.url)
+        self.assertEqual(response.status_code, 403, "Anonymous users cannot post.")
+
+    def test_invalid_post(self):
+        response, content = _get_json(self.url, data={}, client=self.client)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content["details"]["votes"], ["This field is required."])
+
+        review = create_test_review()
+        votes = [dict(review=review.id, vote=2), dict(review=review.id + 1000, vote=1)]
+        response, content = _get_json(self.url, data=dict(votes=votes), client=self.client)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(content["details"]["votes"]), 2)
+        self.assertFalse(Vote.objects.exists())
+
+    def test_post(self):
+        review1, review2 = create_test_review(), create_test_review()
+        Vote.objects.create(voter=self.user, vote=1, review=review1)
+
+        votes = [dict(review=review1.id, vote=-1), dict(review=review2.id, vote=1)]
+        response, content = _get_json(self.url, data=dict(votes=votes), client=self.client)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(content, {"details": "OK"})
+        self.assertTrue(Vote.objects.filter(review=review1, vote=-1, voter=self.user))
+        self.assertTrue(Vote.objects.filter(review=review2, vote=1, voter=self.user))
+        self.assertEqual((0, 1), Review.objects.values_list("n_upvotes", "n_downvotes").get(id=review1.id))
@@ -1,10 +1,13 @@
 from rest_framework import viewsets, serializers
 from openreview.apps.api.serializers import CustomHyperlinkedModelSerializer
+from openreview.apps.api.pagination import CursorPaginationMixin
+from openreview.apps.api.prefetch import PrefetchMixin
 from openreview.apps.main.models import Author
 
 
-class AuthorViewSet(viewsets.ReadOnlyModelViewSet):
+class AuthorViewSet(CursorPaginationMixin, PrefetchMixin, viewsets.ReadOnlyModelViewSet):
     model = Author
+    select_related = ("user",)
 
 class AuthorSerializer(CustomHyperlinkedModelSerializer):
     class Meta:
@@ -1,6 +1,10 @@
 from rest_framework import viewsets
 from openreview.apps.api.serializers import CustomHyperlinkedModelSerializer
+from openreview.apps.api.pagination import CursorPaginationMixin
+from openreview.apps.api.conditional import ConditionalRetrieveMixin
+from openreview.apps.api.prefetch import PrefetchMixin
 from openreview.apps.main.models import Category, Paper
+from openreview.apps.main.versions import get_paper_version_key
 from openreview.apps.tools.views import ModelSerializerMixin
 
 
@@ -8,7 +12,7 @@ class CategorySerializer(CustomHyperlinkedModelSerializer):
     class Meta:
         model = Category
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class CategoryViewSet(CursorPaginationMixin, PrefetchMixin, viewsets.ReadOnlyModelViewSet):
     """
     Categories are fixed and can only change between releases of OpenReview. Each
     category contains a property `arxiv_code` which is used on
@@ -16,9 +20,14 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     """
     model = Category
     model_serializer_class = CategorySerializer
+    select_related = ("parent",)
 
-class PaperViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
+class PaperViewSet(CursorPaginationMixin, PrefetchMixin, ConditionalRetrieveMixin, ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
     model = Paper
+    prefetch_related = ("authors", "keywords", "categories")
+
+    def get_version_keys(self):
+        return [get_paper_version_key(self.kwargs["pk"])]
 
     def get_serializer_class(self):
         # Prevent circular import
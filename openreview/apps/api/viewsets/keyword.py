@@ -2,12 +2,20 @@ from rest_framework import viewsets
 
 from openreview.apps.api.fields import RelativeField
 from openreview.apps.api.serializers import CustomHyperlinkedModelSerializer
+from openreview.apps.api.pagination import CursorPaginationMixin
+from openreview.apps.api.conditional import ConditionalRetrieveMixin
+from openreview.apps.api.prefetch import PrefetchMixin
 from openreview.apps.main.models import Keyword, Paper
+from openreview.apps.main.versions import get_paper_version_key
 from openreview.apps.tools.views import ModelSerializerMixin
 
 
-class PaperViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
+class PaperViewSet(CursorPaginationMixin, PrefetchMixin, ConditionalRetrieveMixin, ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
     model = Paper
+    prefetch_related = ("authors", "keywords", "categories")
+
+    def get_version_keys(self):
+        return [get_paper_version_key(self.kwargs["pk"])]
 
     def get_serializer_class(self):
         # Prevent circular import
@@ -23,6 +31,6 @@ class KeywordSerializer(CustomHyperlinkedModelSerializer):
     class Meta:
         model = Keyword
 
-class KeywordViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
+class KeywordViewSet(CursorPaginationMixin, PrefetchMixin, ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
     model = Keyword
     model_serializer_class = KeywordSerializer
\ No newline at end of file
@@ -3,21 +3,30 @@ from rest_framework import viewsets
 from openreview.apps.api.fields import RelativeField, CustomHyperlinkedRelatedField
 from openreview.apps.api.serializers import CustomHyperlinkedModelSerializer
 from openreview.apps.api.viewsets.review import ReviewSerializer
+from openreview.apps.api.pagination import CursorPaginationMixin
+from openreview.apps.api.conditional import ConditionalRetrieveMixin
+from openreview.apps.api.prefetch import PrefetchMixin
 from openreview.apps.main.models import Paper, Review, Author, Keyword
+from openreview.apps.main.versions import get_paper_version_key, get_review_version_key
 from openreview.apps.tools.views import ModelSerializerMixin
 
 
-class ReviewViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
+class ReviewViewSet(CursorPaginationMixin, PrefetchMixin, ConditionalRetrieveMixin, ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
     model = Review
     model_serializer_class = ReviewSerializer
+    select_related = ("poster", "paper", "parent")
+
+    def get_version_keys(self):
+        return [get_review_version_key(self.kwargs["pk"])]
 
     def get_queryset(self):
         return self.objects.paper.reviews.all()
 
-class AuthorViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
+class AuthorViewSet(CursorPaginationMixin, PrefetchMixin, ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
     model = Author
+    select_related = ("user",)
 
-class KeywordViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
+class KeywordViewSet(CursorPaginationMixin, PrefetchMixin, ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
     model = Keyword
 
 class PaperSerializer(CustomHyperlinkedModelSerializer):
@@ -30,7 +39,7 @@ class PaperSerializer(CustomHyperlinkedModelSerializer):
     class Meta:
         model = Paper
 
-class PaperViewSet(ModelSerializerMixin, viewsets.ModelViewSet):
+class PaperViewSet(CursorPaginationMixin, PrefetchMixin, ConditionalRetrieveMixin, ModelSerializerMixin, viewsets.ModelViewSet):
     """
     Although not explicitly said below, you can use `./authors` and `./keywords` to
     fetch more details about both related fields.
@@ -63,3 +72,7 @@ class PaperViewSet(ModelSerializerMixin, viewsets.ModelViewSet):
     """
     model = Paper
     model_serializer_class = PaperSerializer
+    prefetch_related = ("authors", "keywords", "categories")
+
+    def get_version_keys(self):
+        return [get_paper_version_key(self.kwargs["pk"])]
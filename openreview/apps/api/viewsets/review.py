@@ -4,8 +4,12 @@ from rest_framework.fields import Field
 
 from openreview.apps.api.fields import HyperlinkedRelatedFieldOrNone
 from openreview.apps.api.serializers import CustomHyperlinkedModelSerializer
+from openreview.apps.api.pagination import CursorPaginationMixin
+from openreview.apps.api.conditional import ConditionalRetrieveMixin
+from openreview.apps.api.prefetch import PrefetchMixin
 from openreview.apps.main.forms import VISIBILITY_CHOICES
-from openreview.apps.main.models import Review, set_n_votes_cache
+from openreview.apps.main.models import Review
+from openreview.apps.main.versions import get_review_version_key
 
 
 def show_poster(user, review):
@@ -13,7 +17,8 @@ def show_poster(user, review):
     # is not anonymous
     if review is None:
         return False
-    return review.poster == user or not review.anonymous
+    # Compare ids, so the poster is not fetched for every review
+    return (user.id is not None and review.poster_id == user.id) or not review.anonymous
 
 class ReviewSerializer(CustomHyperlinkedModelSerializer):
     def __init__(self, *args, **kwargs):
@@ -44,11 +49,10 @@ class ReviewSerializer(CustomHyperlinkedModelSerializer):
     class Meta:
         model = Review
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(CursorPaginationMixin, PrefetchMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet):
     model = Review
     serializer_class = ReviewSerializer
+    select_related = ("poster", "paper", "parent")
 
-    def paginate_queryset(self, queryset, page_size=None):
-        page = super().paginate_queryset(queryset, page_size)
-        set_n_votes_cache(page.object_list)
-        return page
+    def get_version_keys(self):
+        return [get_review_version_key(self.kwargs["pk"])]
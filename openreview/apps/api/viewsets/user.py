@@ -1,10 +1,14 @@
 from rest_framework import viewsets
 
 from openreview.apps.accounts.models import User
-from openreview.apps.api.fields import RelativeField
+from openreview.apps.api.fields import RelativeField, CustomHyperlinkedIdentityField
 from openreview.apps.api.serializers import CustomHyperlinkedModelSerializer
 from openreview.apps.api.viewsets.review import ReviewSerializer
+from openreview.apps.api.pagination import CursorPaginationMixin
+from openreview.apps.api.conditional import ConditionalRetrieveMixin
+from openreview.apps.api.prefetch import PrefetchMixin
 from openreview.apps.main.models import Review, Vote
+from openreview.apps.main.versions import get_review_version_key
 from openreview.apps.tools.views import ModelSerializerMixin
 
 
@@ -13,13 +17,17 @@ NON_OWNER_FIELDS = (
     "reviews", "votes"
 )
 
-class ReviewViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
+class ReviewViewSet(CursorPaginationMixin, PrefetchMixin, ConditionalRetrieveMixin, ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
     """
     Anonymous reviews are not displayed (unless you're logged in and viewing your
     own users' contributions).
     """
     model = Review
     model_serializer_class = ReviewSerializer
+    select_related = ("poster", "paper", "parent")
+
+    def get_version_keys(self):
+        return [get_review_version_key(self.kwargs["pk"])]
 
     def get_queryset(self):
         reviews = self.objects.user.reviews
@@ -27,13 +35,22 @@ class ReviewViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
             return reviews.filter(anonymous=False)
         return reviews.all()
 
-class VoteViewSet(ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
+class VoteSerializer(CustomHyperlinkedModelSerializer):
+    # Votes are only routed below their voter
+    url = CustomHyperlinkedIdentityField(view_name="vote-detail", url_kwargs={"user_id": "voter_id", "pk": "pk"})
+
+    class Meta:
+        model = Vote
+
+class VoteViewSet(CursorPaginationMixin, PrefetchMixin, ModelSerializerMixin, viewsets.ReadOnlyModelViewSet):
     """
     If user has set `votes_public` to `False` (default) no votes are displayed. You
     cannot vote twice on the same post: if a duplicate vote is detected, the first one
     will be overridden.
     """
     model = Vote
+    model_serializer_class = VoteSerializer
+    select_related = ("review", "voter")
 
     def get_queryset(self):
         if not self.objects.user.votes_public:
@@ -58,7 +75,7 @@ class UserSerializer(CustomHyperlinkedModelSerializer):
     class Meta:
         model = User
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+class UserViewSet(CursorPaginationMixin, PrefetchMixin, viewsets.ReadOnlyModelViewSet):
     """
     Displays fields `id`, `is_active`, `date_joined`, `username` which are mapped 1:1 to
     the model User. If the detailed view of the logged in user is request, additional
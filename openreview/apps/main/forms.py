@@ -4,7 +4,8 @@ from django.utils.html import mark_safe
 from openreview.apps.main.models import Author, Keyword, Category
 
 from openreview.apps.main.models.review import Review
-from openreview.apps.main.models.paper import Paper
+from openreview.apps.main.models.paper import Paper, get_author_line
+from openreview.apps.main.search import deferred_indexing
 
 from django.utils.functional import memoize
 
@@ -131,24 +132,43 @@ class PaperForm(forms.ModelForm):
             paper = super(PaperForm, self).save(commit=False, **kwargs)
 
             if commit:
-                paper.save()
-
-                # TODO: More efficient implementation. This calls the database N times, which is
-                # TODO: stupid. We can use use Postgres RETURNING ID as used in the following manner:
-                # TODO: https://github.com/amcat/amcat/blob/master/amcat/models/coding/codedarticle.py#L130
-                for author in self.cleaned_data["authors"]:
-                    if author.id is None:
-                        author.save()
-                paper.authors.add(*self.cleaned_data["authors"])
-
-                for keyword in self.cleaned_data["keywords"]:
-                    if keyword.id is None:
-                        keyword.save()
-                paper.keywords.add(*self.cleaned_data["keywords"])
-
-                paper.categories.add(*self.cleaned_data["categories"])
+                with deferred_indexing():
+                    self._save_relations(paper)
             return paper
 
+    def _save_relations(self, paper):
+        """
+        Saves the new paper and its authors, keywords and categories. The relations of a
+        new paper are added in bulk: m2m_changed is not sent, but all fields it maintains
+        are already set (author_line) or default to outdated (related_outdated).
+        """
+        authors = self._save_all(self.cleaned_data["authors"])
+        keywords = self._save_all(self.cleaned_data["keywords"])
+
+        paper.author_line = get_author_line([author.name for author in authors])
+        paper.save()
+
+        relations = (
+            (Paper.authors.through, "author_id", authors),
+            (Paper.keywords.through, "keyword_id", keywords),
+            (Paper.categories.through, "category_id", self.cleaned_data["categories"]),
+        )
+
+        for through, column, objects in relations:
+            through.objects.bulk_create([
+                through(**{"paper_id": paper.id, column: obj.id}) for obj in objects
+            ])
+
+    def _save_all(self, objects):
+        """Saves new objects, and returns all objects without duplicates."""
+        unique = []
+        for obj in objects:
+            if obj.id is None:
+                obj.save()
+            if obj not in unique:
+                unique.append(obj)
+        return unique
+
     class Meta:
         model = Paper
         fields = [
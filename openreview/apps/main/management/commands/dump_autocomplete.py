@@ -0,0 +1,28 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from openreview.apps.papers.autocomplete import PrefixIndex
+
+
+class Command(BaseCommand):
+    args = "[path]"
+    help = (
+        "Writes a snapshot of the autocomplete index to `path` (default: "
+        "settings.AUTOCOMPLETE_SNAPSHOT), which processes load on startup."
+    )
+
+    def handle(self, path=None, **options):
+        path = path or settings.AUTOCOMPLETE_SNAPSHOT
+        if not path:
+            raise CommandError("Specify a path, or set DJANGO_AUTOCOMPLETE_SNAPSHOT.")
+
+        index = PrefixIndex.from_database()
+        # Write atomically, as processes may be loading the snapshot
+        with open(path + ".tmp", "w") as fp:
+            index.dump(fp)
+        os.replace(path + ".tmp", path)
+
+        if int(options.get("verbosity", 1)) > 0:
+            self.stdout.write("Wrote {n} entries to {path}.".format(n=len(index.entries), path=path))
@@ -0,0 +1,32 @@
+from optparse import make_option
+import time
+
+from django.core.management.base import NoArgsCommand
+
+from openreview.apps.main.search import flush_index_queue, BATCH_SIZE
+
+
+class Command(NoArgsCommand):
+    help = (
+        "Indexes objects queued for (re)indexing since the last run. Run periodically, "
+        "or continuously with --interval."
+    )
+
+    option_list = NoArgsCommand.option_list + (
+        make_option("--batch-size", type="int", dest="batch_size", default=BATCH_SIZE,
+                    help="Number of objects indexed per request (default: %d)." % BATCH_SIZE),
+        make_option("--interval", type="float", dest="interval", default=None,
+                    help="Keep running, flushing the queue every INTERVAL seconds."),
+    )
+
+    def handle_noargs(self, **options):
+        interval = options.get("interval")
+
+        while True:
+            n = flush_index_queue(options.get("batch_size"))
+            if int(options.get("verbosity", 1)) > 0 and (n or interval is None):
+                self.stdout.write("Indexed {n} queued object(s).".format(n=n))
+
+            if interval is None:
+                return
+            time.sleep(interval)
@@ -0,0 +1,33 @@
+from optparse import make_option
+
+from django.core.management.base import BaseCommand, CommandError
+
+from openreview.apps.papers.importer import import_papers, read_dump, CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    args = "<dump dump ...>"
+    help = (
+        "Imports papers from arXiv metadata dumps: Atom feeds, OAI-PMH responses (arXiv "
+        "metadata format) or JSON lines, optionally gzipped. Papers with an existing "
+        "document identifier are skipped. Run flush_index_queue and update_related_papers "
+        "afterwards."
+    )
+
+    option_list = BaseCommand.option_list + (
+        make_option("--chunk-size", type="int", dest="chunk_size", default=CHUNK_SIZE,
+                    help="Number of papers imported per transaction (default: %d)." % CHUNK_SIZE),
+    )
+
+    def handle(self, *paths, **options):
+        if not paths:
+            raise CommandError("Specify at least one dump to import.")
+
+        for path in paths:
+            try:
+                n_imported, n_skipped = import_papers(read_dump(path), options.get("chunk_size"))
+            except (IOError, ValueError) as e:
+                raise CommandError("Could not import {path}: {e}".format(**locals()))
+
+            if int(options.get("verbosity", 1)) > 0:
+                self.stdout.write("Imported {n_imported} paper(s) from {path}, skipped {n_skipped}.".format(**locals()))
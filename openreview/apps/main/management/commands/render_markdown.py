@@ -0,0 +1,50 @@
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+
+from openreview.apps.main.models import Review, Paper
+from openreview.apps.tools.markdown import RENDERER_VERSION
+
+# Number of objects rendered per transaction
+CHUNK_SIZE = 500
+
+
+class Command(NoArgsCommand):
+    help = (
+        "Renders the stored HTML of review texts and paper abstracts. By default only "
+        "HTML rendered by an older version of the renderer is rendered again."
+    )
+
+    option_list = NoArgsCommand.option_list + (
+        make_option("--all", action="store_true", dest="all", default=False,
+                    help="Render all reviews and papers, regardless of their renderer version."),
+    )
+
+    def render(self, model, render_method, fields, render_all):
+        objects = model.objects.order_by("id")
+        if not render_all:
+            objects = objects.exclude(**{fields[1]: RENDERER_VERSION})
+
+        n, last_id = 0, 0
+        while True:
+            chunk = list(objects.filter(id__gt=last_id)[:CHUNK_SIZE])
+            if not chunk:
+                return n
+
+            with transaction.atomic():
+                for obj in chunk:
+                    getattr(obj, render_method)()
+                    values = {field: getattr(obj, field) for field in fields}
+                    model.objects.filter(id=obj.id).update(**values)
+
+            n += len(chunk)
+            last_id = chunk[-1].id
+
+    def handle_noargs(self, **options):
+        render_all = options.get("all")
+        n_reviews = self.render(Review, "render_text", ("text_html", "text_html_version"), render_all)
+        n_papers = self.render(Paper, "render_abstract", ("abstract_html", "abstract_html_version"), render_all)
+
+        if int(options.get("verbosity", 1)) > 0:
+            self.stdout.write("Rendered {n_reviews} review(s) and {n_papers} paper(s).".format(**locals()))
@@ -0,0 +1,13 @@
+from django.core.management.base import NoArgsCommand
+
+from openreview.apps.main.models import update_paper_scores
+
+
+class Command(NoArgsCommand):
+    help = "Rebuilds the precomputed scores (used for trending and controversial papers) of all papers."
+
+    def handle_noargs(self, **options):
+        n = update_paper_scores()
+
+        if int(options.get("verbosity", 1)) > 0:
+            self.stdout.write("Updated scores of {n} paper(s).".format(n=n))
@@ -0,0 +1,30 @@
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+
+from openreview.apps.main.models import Paper, update_related_papers
+
+
+class Command(NoArgsCommand):
+    help = (
+        "Updates the related papers of papers whose authors, keywords or categories "
+        "changed. Meant to be run periodically."
+    )
+
+    option_list = NoArgsCommand.option_list + (
+        make_option("--all", action="store_true", dest="all", default=False,
+                    help="Update the related papers of all papers."),
+    )
+
+    def handle_noargs(self, **options):
+        if options.get("all"):
+            Paper.objects.update(related_outdated=True)
+
+        n = 0
+        outdated = Paper.objects.filter(related_outdated=True).order_by("id")
+        for paper_id in outdated.values_list("id", flat=True).iterator():
+            update_related_papers(paper_id)
+            n += 1
+
+        if int(options.get("verbosity", 1)) > 0:
+            self.stdout.write("Updated related papers of {n} paper(s).".format(n=n))
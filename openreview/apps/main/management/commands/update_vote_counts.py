@@ -0,0 +1,15 @@
+from django.core.management.base import NoArgsCommand
+from django.db import transaction
+
+from openreview.apps.main.models import update_vote_counts
+
+
+class Command(NoArgsCommand):
+    help = "Recalculates the stored up- and downvote counters of all reviews from their votes."
+
+    def handle_noargs(self, **options):
+        with transaction.atomic():
+            n = update_vote_counts()
+
+        if int(options.get("verbosity", 1)) > 0:
+            self.stdout.write("Updated vote counters of {n} review(s).".format(n=n))
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+from south.utils import datetime_utils as datetime
+from south.db import db
+from south.v2 import SchemaMigration
+from django.db import models
+
+
+class Migration(SchemaMigration):
+
+    def forwards(self, orm):
+        # Adding field 'Review.path'
+        db.add_column('main_review', 'path',
+                      self.gf('django.db.models.fields.TextField')(default='', blank=True, db_index=True),
+                      keep_default=False)
+
+        # Adding field 'Review.depth'
+        db.add_column('main_review', 'depth',
+                      self.gf('django.db.models.fields.PositiveIntegerField')(default=0),
+                      keep_default=False)
+
+        # Descendants are selected with LIKE 'prefix%', which needs an index with
+        # text_pattern_ops on PostgreSQL.
+        if db.backend_name == "postgres":
+            db.execute("CREATE INDEX main_review_path_like ON main_review (path text_pattern_ops)")
+
+        if not db.dry_run:
+            self.fill_paths(orm)
+
+    def fill_paths(self, orm):
+        parents = dict(orm['main.Review'].objects.values_list("id", "parent_id"))
+
+        for review_id in parents:
+            # Walk up to the root. Loops should not exist, but stop if we find one.
+            path, seen, parent_id = [], {review_id}, parents[review_id]
+            while parent_id is not None and parent_id not in seen:
+                seen.add(parent_id)
+                path.insert(0, str(parent_id).zfill(10))
+                parent_id = parents.get(parent_id)
+
+            if path:
+                orm['main.Review'].objects.filter(id=review_id).update(path="".join(path), depth=len(path))
+
+
+    def backwards(self, orm):
+        if db.backend_name == "postgres":
+            db.execute("DROP INDEX main_review_path_like")
+
+        # Deleting field 'Review.path'
+        db.delete_column('main_review', 'path')
+
+        # Deleting field 'Review.depth'
+        db.delete_column('main_review', 'depth')
+
+
+    models = {
+        'accounts.user': {
+            'Meta': {'object_name': 'User'},
+            'date_joined': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'email': ('django.db.models.fields.EmailField', [], {'blank': 'True', 'max_length': '75'}),
+            'first_name': ('django.db.models.fields.CharField', [], {'blank': 'True', 'max_length': '30'}),
+            'groups': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'related_name': "'user_set'", 'to': "orm['auth.Group']", 'symmetrical': 'False'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'is_active': ('django.db.models.fields.BooleanField', [], {'default': 'True'}),
+            'is_staff': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'is_superuser': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'last_login': ('django.db.models.fields.DateTimeField', [], {'default': 'datetime.datetime.now'}),
+            'last_name': ('django.db.models.fields.CharField', [], {'blank': 'True', 'max_length': '30'}),
+            'password': ('django.db.models.fields.CharField', [], {'max_length': '128'}),
+            'user_permissions': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'related_name': "'user_set'", 'to': "orm['auth.Permission']", 'symmetrical': 'False'}),
+            'username': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '30'})
+        },
+        'auth.group': {
+            'Meta': {'object_name': 'Group'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'unique': 'True', 'max_length': '80'}),
+            'permissions': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'to': "orm['auth.Permission']", 'symmetrical': 'False'})
+        },
+        'auth.permission': {
+            'Meta': {'unique_together': "(('content_type', 'codename'),)", 'object_name': 'Permission', 'ordering': "('content_type__app_label', 'content_type__model', 'codename')"},
+            'codename': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'content_type': ('django.db.models.fields.related.ForeignKey', [], {'to': "orm['contenttypes.ContentType']"}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '50'})
+        },
+        'contenttypes.contenttype': {
+            'Meta': {'db_table': "'django_content_type'", 'object_name': 'ContentType', 'unique_together': "(('app_label', 'model'),)", 'ordering': "('name',)"},
+            'app_label': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'model': ('django.db.models.fields.CharField', [], {'max_length': '100'}),
+            'name': ('django.db.models.fields.CharField', [], {'max_length': '100'})
+        },
+        'main.author': {
+            'Meta': {'object_name': 'Author'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.TextField', [], {'db_index': 'True', 'unique': 'True'}),
+            'user': ('django.db.models.fields.related.ForeignKey', [], {'null': 'True', 'related_name': "'authors'", 'to': "orm['accounts.User']"})
+        },
+        'main.category': {
+            'Meta': {'object_name': 'Category'},
+            'arxiv_code': ('django.db.models.fields.TextField', [], {'null': 'True', 'unique': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'name': ('django.db.models.fields.TextField', [], {}),
+            'parent': ('django.db.models.fields.related.ForeignKey', [], {'null': 'True', 'related_name': "'children'", 'to': "orm['main.Category']"})
+        },
+        'main.keyword': {
+            'Meta': {'object_name': 'Keyword'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'label': ('django.db.models.fields.TextField', [], {'db_index': 'True'})
+        },
+        'main.paper': {
+            'Meta': {'object_name': 'Paper'},
+            'abstract': ('django.db.models.fields.TextField', [], {}),
+            'authors': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['main.Author']", 'symmetrical': 'False'}),
+            'categories': ('django.db.models.fields.related.ManyToManyField', [], {'blank': 'True', 'to': "orm['main.Category']", 'symmetrical': 'False'}),
+            'doc_id': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'keywords': ('django.db.models.fields.related.ManyToManyField', [], {'to': "orm['main.Keyword']", 'symmetrical': 'False'}),
+            'publish_date': ('django.db.models.fields.DateField', [], {'blank': 'True', 'null': 'True'}),
+            'publisher': ('django.db.models.fields.TextField', [], {'blank': 'True', 'null': 'True'}),
+            'title': ('django.db.models.fields.TextField', [], {}),
+            'urls': ('django.db.models.fields.TextField', [], {'blank': 'True', 'null': 'True'})
+        },
+        'main.review': {
+            'Meta': {'object_name': 'Review'},
+            'anonymous': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'external': ('django.db.models.fields.BooleanField', [], {'default': 'False'}),
+            'depth': ('django.db.models.fields.PositiveIntegerField', [], {'default': '0'}),
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'n_downvotes': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'n_upvotes': ('django.db.models.fields.IntegerField', [], {'default': '0'}),
+            'paper': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'reviews'", 'to': "orm['main.Paper']"}),
+            'parent': ('django.db.models.fields.related.ForeignKey', [], {'null': 'True', 'to': "orm['main.Review']"}),
+            'path': ('django.db.models.fields.TextField', [], {'default': "''", 'blank': 'True', 'db_index': 'True'}),
+            'poster': ('django.db.models.fields.related.ForeignKey', [], {'null': 'True', 'related_name': "'reviews'", 'to': "orm['accounts.User']"}),
+            'rating': ('django.db.models.fields.SmallIntegerField', [], {}),
+            'text': ('django.db.models.fields.TextField', [], {'null': 'True'}),
+            'timestamp': ('django.db.models.fields.DateTimeField', [], {'auto_now_add': 'True', 'blank': 'True'})
+        },
+        'main.vote': {
+            'Meta': {'unique_together': "(('review', 'voter'),)", 'object_name': 'Vote'},
+            'id': ('django.db.models.fields.AutoField', [], {'primary_key': 'True'}),
+            'review': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'votes'", 'to': "orm['main.Review']"}),
+            'vote': ('django.db.models.fields.SmallIntegerField', [], {'db_index': 'True'}),
+            'voter': ('django.db.models.fields.related.ForeignKey', [], {'related_name': "'votes'", 'to': "orm['accounts.User']"})
+        }
+    }
+
+    complete_apps = ['main']
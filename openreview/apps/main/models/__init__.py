@@ -2,3 +2,6 @@ from .author import *
 from .paper import *
 from .review import *
 from .category import *
+from .score import *
+from .related import *
+from .search import *
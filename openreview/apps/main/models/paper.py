@@ -2,16 +2,40 @@ import datetime
 
 from django.utils import timezone
 from django.db import models
-from django.db.models import Count
+from django.db.models.signals import m2m_changed, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from django.utils.safestring import mark_safe
 from urllib.parse import urlparse
 
 from openreview.apps.main.models.category import Category
 from openreview.apps.main.models.review import Vote, Review
 from openreview.apps.main.models.author import Author
+from openreview.apps.main.models.score import REVIEW_WEIGHT, get_activity_weight
+from openreview.apps.main.versions import bump_versions
+from openreview.apps.tools.markdown import render_markdown, RENDERER_VERSION
 
 
 __all__ = ["Keyword", "Paper", "Category"]
 
+# Number of authors stored in Paper.author_line
+AUTHOR_LINE_LENGTH = 5
+
+# Fields maintained by atomic updates or signals, which Paper.save() must not overwrite
+MAINTAINED_FIELDS = {"n_reviews", "author_line", "related_outdated"}
+
+
+def get_author_line(names, authors=AUTHOR_LINE_LENGTH):
+    """
+    Returns the first `authors` names, followed by "et al." if there are more.
+
+    @type names: list
+    @rtype: str
+    """
+    result = ", ".join(names[:authors])
+    if len(names) > authors:
+        result += " et al."
+    return result
+
 
 class Keyword(models.Model):
     label = models.TextField(db_index=True)
@@ -28,13 +52,29 @@ class Keyword(models.Model):
 
 
 class Paper(models.Model):
-    doc_id = models.TextField(verbose_name="document identifier", null=True)
+    doc_id = models.TextField(verbose_name="document identifier", null=True, db_index=True)
     title = models.TextField()
     abstract = models.TextField()
+
+    # Rendered version of `abstract`, see get_rendered_abstract()
+    abstract_html = models.TextField(null=True, editable=False)
+    abstract_html_version = models.PositiveSmallIntegerField(default=0, editable=False)
+
     publisher = models.TextField(null=True, blank=True)
     publish_date = models.DateField(null=True, blank=True)
     urls = models.TextField(null=True, blank=True)
 
+    # Number of reviews (not comments), maintained by Review.save()
+    n_reviews = models.IntegerField(default=0, editable=False)
+
+    # Output of get_authors(), maintained when authors are added or removed. None if
+    # it was not yet calculated.
+    author_line = models.TextField(null=True, editable=False)
+
+    # Set if authors, keywords or categories changed since related papers were
+    # calculated (see RelatedPaper)
+    related_outdated = models.BooleanField(default=True, editable=False, db_index=True)
+
     # These fields are *probably* a bad idea performance wise.
     authors = models.ManyToManyField(Author)
     keywords = models.ManyToManyField(Keyword)
@@ -42,33 +82,36 @@ class Paper(models.Model):
 
     @classmethod
     def trending(cls, top=5, days=7):
-        """Returns the trending papers. The paper with the most reviews the last
-        seven days will end on top. Papers without (recent) reviews cannot be trending.
+        """Returns the trending papers, ordered by their (decaying) amount of recent
+        reviews, comments and votes (see PaperScore). Papers with less activity than
+        a single review written `days` ago cannot be trending.
 
-        @param top: return the top N papers
+        @param top: return the top N papers (all if None)
         @type top: int
 
-        @rtype: list
+        @rtype: QuerySet
         """
-        seven_days_ago = timezone.now() - datetime.timedelta(days=days)
-        reviews = Review.objects.filter(parent__isnull=True, timestamp__gt=seven_days_ago)
-        papers = reviews.values_list('paper').annotate(n=Count('paper')).order_by("-n")[0:top]
-        papers_objects = Paper.objects.in_bulk(pid for pid, pcount in papers)
-        return [papers_objects[pid] for pid, pcount in papers]
+        threshold = get_activity_weight(REVIEW_WEIGHT, timezone.now() - datetime.timedelta(days=days))
+        papers = Paper.objects.filter(score__trending__gte=threshold).order_by("-score__trending")
+        return papers if top is None else papers[:top]
 
     @classmethod
     def latest(cls):
         return Paper.objects.order_by('-id')
 
     @classmethod
-    def controversial(cls, top=5, days=7):
-        """Returns list of the most controversial papers.
+    def controversial(cls, top=None):
+        """Returns the most controversial papers, based on the variance of the ratings of
+        their reviews and the balance of up- and downvotes (see PaperScore). Papers
+        without any controversy are omitted.
 
-        TODO: Implement ;-)
+        @param top: return the top N papers (all if None)
+        @type top: int
+
+        @rtype: QuerySet
         """
-        seven_days_ago = timezone.now() - datetime.timedelta(days=days)
-        reviews = Review.objects.filter(parent__isnull=True, timestamp__gt=seven_days_ago)
-        return Paper.objects.order_by()
+        papers = Paper.objects.filter(score__controversy__gt=0).order_by("-score__controversy")
+        return papers if top is None else papers[:top]
 
     def get_reviews(self):
         return self.reviews.filter(parent__isnull=True)
@@ -77,7 +120,7 @@ class Paper(models.Model):
         return self.reviews.filter(parent__isnull=False)
 
     def num_reviews(self):
-        return self.get_reviews().count()
+        return self.n_reviews
 
     def get_votes(self, include_comments):
         """
@@ -91,11 +134,75 @@ class Paper(models.Model):
         votes = Vote.objects.filter(review__paper=self)
         return votes if include_comments else votes.filter(parent=None)
 
-    def get_authors(self, authors=5):
-        result = ", ".join([x.name for x in self.authors.all()][:authors])
-        if self.authors.count() > authors:
-            result += " et al."
-        return result
+    def get_related_papers(self, top=4):
+        """
+        Returns related papers which share authors with this paper, and related papers
+        which do not, as two lists of at most `top` papers each. Papers which have no
+        related papers stored and are outdated (probably because they are new) calculate
+        them on the fly, until `manage.py update_related_papers` stores them.
+
+        @rtype: tuple
+        """
+        related = list(self.related_papers.select_related("related").order_by("-score"))
+        if not related and self.related_outdated:
+            related = self._calculate_related_papers()
+
+        by_author, by_subject = [], []
+        for related_paper in related:
+            papers = by_author if related_paper.n_shared_authors else by_subject
+            if len(papers) < top:
+                papers.append(related_paper.related)
+        return by_author, by_subject
+
+    def _calculate_related_papers(self):
+        from openreview.apps.main.models.related import RelatedPaper, get_similar_papers, TOP_K
+
+        similar = get_similar_papers(self.id)
+        top = sorted(similar, key=lambda other_id: similar[other_id][0], reverse=True)[:TOP_K]
+        papers = Paper.objects.in_bulk(top)
+        return [
+            RelatedPaper(paper=self, related=papers[other_id], score=similar[other_id][0], n_shared_authors=similar[other_id][1])
+            for other_id in top
+        ]
+
+    def get_authors(self, authors=AUTHOR_LINE_LENGTH):
+        """
+        Returns the names of the first `authors` authors, followed by "et al." if there
+        are more. Prefetched authors are used if available, otherwise the stored author
+        line is returned (and calculated, if it wasn't yet).
+
+        @rtype: str
+        """
+        prefetched = "authors" in getattr(self, "_prefetched_objects_cache", {})
+        if authors != AUTHOR_LINE_LENGTH or prefetched or self.author_line is None:
+            line = get_author_line([author.name for author in self.authors.all()], authors)
+            if authors == AUTHOR_LINE_LENGTH and self.author_line is None:
+                self.author_line = line
+                Paper.objects.filter(id=self.id).update(author_line=line)
+            return line
+        return self.author_line
+
+    def update_author_line(self):
+        """Recalculates and stores self.author_line."""
+        names = list(self.authors.values_list("name", flat=True))
+        self.author_line = get_author_line(names)
+        Paper.objects.filter(id=self.id).update(author_line=self.author_line)
+
+    def render_abstract(self):
+        """Renders self.abstract (as markdown) into self.abstract_html."""
+        self.abstract_html = render_markdown(self.abstract)
+        self.abstract_html_version = RENDERER_VERSION
+
+    def get_rendered_abstract(self):
+        """
+        Returns self.abstract as HTML. The HTML is rendered upon saving, but if it was
+        rendered by an older renderer it is rendered (and stored) again.
+        """
+        if self.abstract_html_version != RENDERER_VERSION:
+            self.render_abstract()
+            Paper.objects.filter(id=self.id).update(
+                abstract_html=self.abstract_html, abstract_html_version=self.abstract_html_version)
+        return mark_safe(self.abstract_html)
 
     def get_url_domain(self):
         if self.urls:
@@ -103,8 +210,57 @@ class Paper(models.Model):
             return '{uri.netloc}'.format(uri=parsed_uri)     
         return None
 
+    def save(self, *args, **kwargs):
+        self.render_abstract()
+
+        # n_reviews and author_line are maintained elsewhere. Writing back our (possibly
+        # outdated) copy would undo concurrently added reviews or authors.
+        if not self._state.adding and not kwargs.get("force_insert") and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in MAINTAINED_FIELDS
+            ]
+
+        return super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
 
     class Meta:
         app_label = "main"
+
+
+@receiver(post_save, sender=Paper)
+@receiver(post_delete, sender=Paper)
+def paper_changed(sender, instance, **kwargs):
+    bump_versions([instance.id])
+
+
+@receiver(m2m_changed, sender=Paper.authors.through)
+@receiver(m2m_changed, sender=Paper.keywords.through)
+@receiver(m2m_changed, sender=Paper.categories.through)
+def relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_versions([instance.id] if not reverse else pk_set or ())
+
+
+@receiver(m2m_changed, sender=Paper.authors.through)
+def authors_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            instance.update_author_line()
+    elif action in ("post_add", "post_remove"):
+        # Papers of an author changed, their author lines are recalculated lazily
+        Paper.objects.filter(id__in=pk_set).update(author_line=None)
+    elif action == "pre_clear":
+        Paper.objects.filter(authors=instance).update(author_line=None)
+
+
+@receiver(post_save, sender=Author)
+@receiver(pre_delete, sender=Author)
+def author_changed(sender, instance, created=False, **kwargs):
+    # Author might have been renamed or removed
+    if not created:
+        papers = Paper.objects.filter(authors=instance)
+        bump_versions(list(papers.values_list("id", flat=True)))
+        papers.update(author_line=None)
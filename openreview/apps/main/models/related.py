@@ -0,0 +1,146 @@
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import Count
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from openreview.apps.main.models.paper import Paper
+from openreview.apps.main.versions import bump_versions
+
+__all__ = ["RelatedPaper", "get_similar_papers", "update_related_papers"]
+
+# Weight of each shared author, keyword and category
+SIMILARITY_WEIGHTS = (
+    ("authors", 3.0),
+    ("keywords", 2.0),
+    ("categories", 1.0),
+)
+
+# Number of related papers stored per paper
+TOP_K = 10
+
+# Number of papers considered per kind of overlap, those sharing the most. Without a
+# limit, sharing a popular category would make most papers candidates.
+MAX_CANDIDATES = 300
+
+# Maximum number of values per `__in` lookup (SQLite allows 999 parameters)
+IN_BATCH_SIZE = 900
+
+
+def get_similar_papers(paper_id, max_candidates=MAX_CANDIDATES):
+    """
+    Calculates the similarity between `paper_id` and papers which share at least one
+    author, keyword or category with it, as the weighted overlap of these. Per kind of
+    overlap, only the `max_candidates` papers sharing the most are taken into account.
+
+    @rtype: dict
+    @return: maps paper ids to tuples (similarity, number of shared authors)
+    """
+    scores = defaultdict(float)
+    shared_authors = defaultdict(int)
+
+    for field_name, weight in SIMILARITY_WEIGHTS:
+        field = Paper._meta.get_field(field_name)
+        through = field.rel.through
+        paper_column, target_column = field.m2m_field_name(), field.m2m_reverse_field_name()
+
+        targets = through.objects.filter(**{paper_column: paper_id}).values(target_column)
+        overlap = through.objects.filter(**{target_column + "__in": targets})
+        overlap = overlap.exclude(**{paper_column: paper_id}).values_list(paper_column)
+
+        for other_id, n in overlap.annotate(n=Count("id")).order_by("-n")[:max_candidates]:
+            scores[other_id] += weight * n
+            if field_name == "authors":
+                shared_authors[other_id] = n
+
+    return {other_id: (score, shared_authors[other_id]) for other_id, score in scores.items()}
+
+
+def update_related_papers(paper_id):
+    """
+    Recalculates the related papers of `paper_id`, and updates its entry in the
+    related papers of all papers similar to it. Papers which fall outside the top
+    TOP_K of another paper because of this are not replaced until that paper is
+    updated itself.
+    """
+    # Changes made while calculating mark this paper outdated again
+    Paper.objects.filter(id=paper_id).update(related_outdated=False)
+
+    similar = get_similar_papers(paper_id)
+    top = sorted(similar.items(), key=lambda s: s[1][0], reverse=True)[:TOP_K]
+
+    with transaction.atomic():
+        RelatedPaper.objects.filter(paper_id=paper_id).delete()
+        RelatedPaper.objects.bulk_create([
+            RelatedPaper(paper_id=paper_id, related_id=other_id, score=score, n_shared_authors=n_authors)
+            for other_id, (score, n_authors) in top
+        ])
+
+        # Remove this paper from all lists it is listed in, and add it again to lists
+        # which are not full, or where it beats the least related paper
+        referencing = RelatedPaper.objects.filter(related_id=paper_id)
+        changed = set(referencing.values_list("paper_id", flat=True))
+        referencing.delete()
+
+        candidates, new = list(similar), []
+        for i in range(0, len(candidates), IN_BATCH_SIZE):
+            batch = candidates[i:i + IN_BATCH_SIZE]
+            lists = defaultdict(list)
+            for other_id, id, score in RelatedPaper.objects.filter(paper_id__in=batch).values_list("paper_id", "id", "score"):
+                lists[other_id].append((score, id))
+
+            evicted = []
+            for other_id in batch:
+                score, n_authors = similar[other_id]
+                if len(lists[other_id]) >= TOP_K:
+                    min_score, least_related = min(lists[other_id])
+                    if score <= min_score:
+                        continue
+                    evicted.append(least_related)
+                new.append(RelatedPaper(paper_id=other_id, related_id=paper_id, score=score, n_shared_authors=n_authors))
+
+            RelatedPaper.objects.filter(id__in=evicted).delete()
+
+        RelatedPaper.objects.bulk_create(new)
+
+    # Paper pages show their related papers
+    bump_versions({paper_id} | changed | {related.paper_id for related in new})
+
+
+class RelatedPaper(models.Model):
+    """
+    Precomputed top TOP_K of related papers of a paper. Papers are marked outdated
+    when their authors, keywords or categories change; use
+    `manage.py update_related_papers` to update them.
+    """
+    paper = models.ForeignKey("main.Paper", related_name="related_papers")
+    related = models.ForeignKey("main.Paper", related_name="+")
+    score = models.FloatField()
+    n_shared_authors = models.IntegerField(default=0)
+
+    class Meta:
+        app_label = "main"
+        index_together = [("paper", "score")]
+
+    def __str__(self):
+        return "{self.related_id} related to {self.paper_id} ({self.score})".format(self=self)
+
+
+@receiver(m2m_changed, sender=Paper.authors.through)
+@receiver(m2m_changed, sender=Paper.keywords.through)
+@receiver(m2m_changed, sender=Paper.categories.through)
+def relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        papers = Paper.objects.filter(id=instance.id)
+    elif action == "pre_clear":
+        # Author, keyword or category is removed from all its papers
+        paper_ids = sender.objects.filter(**{instance._meta.model_name: instance}).values("paper_id")
+        papers = Paper.objects.filter(id__in=paper_ids)
+    else:
+        papers = Paper.objects.filter(id__in=pk_set)
+
+    papers.update(related_outdated=True)
@@ -1,27 +1,44 @@
 from collections import namedtuple, defaultdict, OrderedDict
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
-from django.core.cache.utils import make_template_fragment_key
-from django.db import models, IntegrityError, connection
-from django.db.models import Sum
+from django.db import models, IntegrityError, connection, transaction
+from django.db.models import Sum, F, Q
 from django.conf import settings
+from django.utils.safestring import mark_safe
+from openreview.apps.main.models.score import PaperScore, REVIEW_WEIGHT, COMMENT_WEIGHT, VOTE_WEIGHT
+from openreview.apps.main.models.score import update_controversy_sums
+from openreview.apps.main.versions import bump_versions
+from openreview.apps.tools.markdown import render_markdown, RENDERER_VERSION
 
-__all__ = ["Review", "Vote", "ReviewTree", "set_n_votes_cache"]
+__all__ = ["Review", "Vote", "ReviewTree", "update_vote_counts", "cast_votes"]
 
-def set_n_votes_cache(reviews):
+def update_vote_counts(reviews=None):
     """
-    Set caches of n_downvotes, n_upvotes on `reviews`.
+    Recalculates n_upvotes and n_downvotes of `reviews` from the Vote table. These
+    counters are normally maintained by Vote.save() and Vote.delete(), but bulk
+    operations (QuerySet.update(), cascading deletes) bypass them.
 
-    @param reviews: reviews which votes to cache
-    @type reviews: iterable of Review objects
+    @param reviews: reviews to update, or None for all reviews
+    @type reviews: django.db.QuerySet
+
+    @rtype: int
+    @return: number of reviews updated
     """
+    if reviews is None:
+        reviews = Review.objects.all()
+
     votes = Vote.objects.filter(review__in=reviews).values_list("review").annotate(n=Sum("vote"))
     upvotes = dict(votes.filter(vote__gt=0))
     downvotes = dict(votes.filter(vote__lt=0))
 
-    for review in reviews:
-        review._n_downvotes = -downvotes.get(review.id, 0)
-        review._n_upvotes = upvotes.get(review.id, 0)
+    changed = {}
+    for review_id, paper_id, n_upvotes, n_downvotes in reviews.values_list("id", "paper_id", "n_upvotes", "n_downvotes"):
+        new_upvotes, new_downvotes = upvotes.get(review_id, 0), -downvotes.get(review_id, 0)
+        if (new_upvotes, new_downvotes) != (n_upvotes, n_downvotes):
+            Review.objects.filter(id=review_id).update(n_upvotes=new_upvotes, n_downvotes=new_downvotes)
+            changed[review_id] = paper_id
+
+    bump_versions(set(changed.values()), changed)
+    return len(changed)
 
 def bulk_delete(reviews):
     """
@@ -30,7 +47,7 @@ def bulk_delete(reviews):
     >>> len([r.delete() for r in reviews])
 
     This does NOT update given reviews, so they may - for example - still hold
-    a non-empty text property.
+    a non-empty text property. Scores of the affected papers are recounted.
 
     @type reviews: django.db.QuerySet
     @param reviews: reviews to delete
@@ -38,14 +55,195 @@ def bulk_delete(reviews):
     @rtype: int
     @return: number of reviews deleted (includes already deleted reviews)
     """
-    return reviews.update(**DELETED_VALUES)
+    deleted = dict(reviews.values_list("id", "paper_id"))
+    n = reviews.update(**DELETED_VALUES)
+    update_controversy_sums(deleted.values())
+    bump_versions(set(deleted.values()), deleted)
+    return n
+
+def get_vote_deltas(old, new):
+    """
+    @return: changes of (n_upvotes, n_downvotes) if a vote changes from `old` to `new`
+    @rtype: tuple
+    """
+    return max(new, 0) - max(old, 0), max(-new, 0) - max(-old, 0)
+
+# Maximum number of votes written per statement (SQLite allows 999 parameters)
+VOTE_BATCH_SIZE = 300
+
+# Subqueries see the table as it was before the statement, which gives the old values
+# of updated votes. xmax is 0 for inserted rows.
+# ON CONFLICT requires PostgreSQL 9.5. Rows inserted by the statement are detected by
+# xmax = 0, which relies on an undocumented implementation detail of PostgreSQL: an
+# updated row version carries the id of the updating transaction in xmax.
+UPSERT_MIN_PG_VERSION = 90500
+
+UPSERT_VOTES_SQL = """
+    INSERT INTO {table} AS v (review_id, voter_id, vote) VALUES {values}
+    ON CONFLICT (review_id, voter_id) DO UPDATE SET vote = EXCLUDED.vote
+    RETURNING v.review_id, (SELECT stored.vote FROM {table} stored WHERE stored.id = v.id), v.xmax = 0
+"""
+
+def _upsert_votes_postgresql(voter_id, votes):
+    values = ", ".join(["(%s, %s, %s)"] * len(votes))
+    params = [p for review_id, vote in votes.items() for p in (review_id, voter_id, vote)]
+
+    cursor = connection.cursor()
+    cursor.execute(UPSERT_VOTES_SQL.format(table=Vote._meta.db_table, values=values), params)
+    return {review_id: (0 if inserted else old, inserted) for review_id, old, inserted in cursor.fetchall()}
+
+def _upsert_votes(voter_id, votes):
+    old = dict(Vote.objects.filter(voter__id=voter_id, review__id__in=votes).values_list("review_id", "vote"))
+
+    Vote.objects.bulk_create([
+        Vote(review_id=review_id, voter_id=voter_id, vote=vote)
+        for review_id, vote in votes.items() if review_id not in old
+    ])
+
+    changed = defaultdict(list)
+    for review_id, vote in votes.items():
+        if review_id in old and old[review_id] != vote:
+            changed[vote].append(review_id)
+
+    for vote, review_ids in changed.items():
+        Vote.objects.filter(voter__id=voter_id, review__id__in=review_ids).update(vote=vote)
+
+    return {review_id: (old.get(review_id, 0), review_id not in old) for review_id in votes}
+
+def _upsert_vote_sqlite(voter_id, review_id, vote):
+    # Inserting first takes the write lock of the database (unlike selecting first), so
+    # the old vote cannot change before this transaction ends.
+    cursor = connection.cursor()
+    cursor.execute(
+        "INSERT OR IGNORE INTO {table} (review_id, voter_id, vote) VALUES (%s, %s, %s)".format(table=Vote._meta.db_table),
+        [review_id, voter_id, vote]
+    )
+    if cursor.rowcount:
+        return {review_id: (0, True)}
+
+    votes = Vote.objects.filter(voter__id=voter_id, review__id=review_id)
+    old = votes.values_list("vote", flat=True).get()
+    if old != vote:
+        votes.update(vote=vote)
+    return {review_id: (old, False)}
+
+def upsert_votes(voter_id, votes):
+    """
+    Inserts or updates votes of `voter_id` in a single statement on PostgreSQL 9.5+. On
+    SQLite a single vote is inserted first, and only updated if it existed. Other
+    databases select the existing votes first. This does NOT update vote counters.
+
+    @param votes: review_id -> vote
+    @type votes: dict
+
+    @return: review_id -> (old vote, created). The old vote is 0 for new votes, and
+             None if it is unknown: a concurrent transaction inserted the vote after
+             this statement started.
+    @rtype: dict
+    """
+    if connection.vendor == "postgresql" and connection.pg_version >= UPSERT_MIN_PG_VERSION:
+        return _upsert_votes_postgresql(voter_id, votes)
+    if connection.vendor == "sqlite" and len(votes) == 1:
+        return _upsert_vote_sqlite(voter_id, *next(iter(votes.items())))
+    return _upsert_votes(voter_id, votes)
+
+def cast_votes(voter, votes):
+    """
+    Sets votes of `voter` on many reviews at once, with one upsert per VOTE_BATCH_SIZE
+    votes. Vote counters, paper scores and template caches of the affected reviews are
+    updated in bulk, instead of per vote as Vote.save() does.
+
+    @param votes: (review, vote) pairs. Only the last vote on a review counts.
+    @type votes: iterable
+
+    @return: review_id -> (old vote, new vote), see upsert_votes() for old votes
+    @rtype: dict
+    """
+    reviews, values = OrderedDict(), {}
+    for review, vote in votes:
+        reviews[review.id] = review
+        values[review.id] = vote
+
+    review_ids = list(reviews)
+    counter_deltas = defaultdict(list)
+    paper_deltas = defaultdict(lambda: [0, 0])
+    n_created = defaultdict(int)
+    recount = []
+    result = {}
+
+    with transaction.atomic():
+        for i in range(0, len(review_ids), VOTE_BATCH_SIZE):
+            batch = {review_id: values[review_id] for review_id in review_ids[i:i + VOTE_BATCH_SIZE]}
+            for review_id, (old, created) in upsert_votes(voter.id, batch).items():
+                review, new = reviews[review_id], values[review_id]
+                result[review_id] = (old, new)
+
+                if created:
+                    n_created[review.paper_id] += 1
+
+                if old is None:
+                    recount.append(review_id)
+                    continue
+
+                delta_up, delta_down = get_vote_deltas(old, new)
+                if delta_up or delta_down:
+                    counter_deltas[delta_up, delta_down].append(review_id)
+                    paper_deltas[review.paper_id][0] += delta_up
+                    paper_deltas[review.paper_id][1] += delta_down
+                    review.n_upvotes += delta_up
+                    review.n_downvotes += delta_down
+
+        # Reviews with the same changes are updated together
+        for (delta_up, delta_down), ids in counter_deltas.items():
+            Review.objects.filter(id__in=ids).update(
+                n_upvotes=F("n_upvotes") + delta_up,
+                n_downvotes=F("n_downvotes") + delta_down
+            )
+
+        # Counters of recounted reviews change by the difference between their recount
+        # and their stored counts
+        for i in range(0, len(recount), VOTE_BATCH_SIZE):
+            recounted = Review.objects.filter(id__in=recount[i:i + VOTE_BATCH_SIZE])
+            before = list(recounted.values_list("id", "n_upvotes", "n_downvotes"))
+            update_vote_counts(recounted)
+            after = {id: (up, down) for id, up, down in recounted.values_list("id", "n_upvotes", "n_downvotes")}
+            for review_id, up, down in before:
+                paper_id = reviews[review_id].paper_id
+                paper_deltas[paper_id][0] += after[review_id][0] - up
+                paper_deltas[paper_id][1] += after[review_id][1] - down
+
+        for paper_id, (delta_up, delta_down) in paper_deltas.items():
+            PaperScore.update_controversy(paper_id, delta_up=delta_up, delta_down=delta_down)
+
+        for paper_id, n in n_created.items():
+            PaperScore.add_activity(paper_id, VOTE_WEIGHT * n)
+
+    changed = set(recount).union(*counter_deltas.values())
+    bump_versions({reviews[review_id].paper_id for review_id in changed}, changed)
+    return result
 
 ReviewTree = namedtuple('ReviewTree', ['review', 'level', 'children'])
 
-REVIEW_FIELDS = {"text", "rating", "timestamp", "anonymous", "external"}
+# Review.path consists of the zero-padded ids of all ancestors of a review, which
+# makes sure the descendants of a review share a common prefix.
+PATH_SEGMENT_LENGTH = 10
+
+def get_path_segment(review_id):
+    return str(review_id).zfill(PATH_SEGMENT_LENGTH)
+
+# Placeholder for values which are not (yet) retrieved from the database
+NOT_LOADED = object()
+
+VOTE_COUNTER_FIELDS = {"n_upvotes", "n_downvotes"}
+
+REVIEW_FIELDS = {
+    "text", "text_html", "text_html_version", "rating", "timestamp", "anonymous",
+    "external", "n_upvotes", "n_downvotes"
+}
 
 DELETED_VALUES = {
     "text": None,
+    "text_html": None,
     "poster": None,
     "rating": -1,
     "anonymous": True
@@ -57,6 +255,11 @@ class Review(models.Model):
     referred to as a comment in the user interface (parent != None).
     """
     text = models.TextField(verbose_name="contents", null=True)
+
+    # Rendered version of `text`, see get_rendered_text()
+    text_html = models.TextField(null=True, editable=False)
+    text_html_version = models.PositiveSmallIntegerField(default=0, editable=False)
+
     rating = models.SmallIntegerField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
@@ -67,13 +270,31 @@ class Review(models.Model):
     anonymous = models.BooleanField(help_text="Poster isn't be publicly visible.", default=False)
     external = models.BooleanField(help_text="This review is posted by on behalf of somebody else.", default=False)
 
+    # Sum of all positive votes and (the absolute value of) the sum of all negative votes
+    # on this review. Kept up to date by Vote.save() and Vote.delete(), use
+    # update_vote_counts() or `manage.py update_vote_counts` to fix drift.
+    n_upvotes = models.IntegerField(default=0)
+    n_downvotes = models.IntegerField(default=0)
+
+    # Materialized path of this review in its tree (see get_path_segment()), and
+    # the number of ancestors. Both are set upon saving.
+    path = models.TextField(default="", blank=True, db_index=True)
+    depth = models.PositiveIntegerField(default=0)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._n_upvotes = None
-        self._n_downvotes = None
         self._n_comments = None
         self._tree_size = None
 
+        # Rating as counted in PaperScore, see _get_scored_rating(). We don't want to
+        # trigger queries for deferred fields, so it is determined when saving if needed.
+        if self.id is None:
+            self._stored_rating = None
+        elif {"text", "rating"} <= set(self.__dict__):
+            self._stored_rating = self._get_scored_rating()
+        else:
+            self._stored_rating = NOT_LOADED
+
         # If cache() is called this is a defaultdict(list) with
         # review_id -> [children_ids].
         self._reviews_children = None
@@ -105,18 +326,6 @@ class Review(models.Model):
             return self._reviews_children[self.id]
         return []
 
-    @property
-    def n_upvotes(self):
-        if self._n_upvotes is not None:
-            return self._n_upvotes
-        return self.votes.filter(vote__gt=0).aggregate(n=Sum("vote"))["n"] or 0
-
-    @property
-    def n_downvotes(self):
-        if self._n_downvotes is not None:
-            return self._n_downvotes
-        return -(self.votes.filter(vote__lt=0).aggregate(n=Sum("vote"))["n"] or 0)
-
     @property
     def score(self):
         return self.n_upvotes - self.n_downvotes
@@ -143,10 +352,25 @@ class Review(models.Model):
         """Returns True if this is 'top-level' review (i.e.: not a comment)"""
         return self.parent_id is None
 
+    @property
+    def descendants_path(self):
+        """Path prefix shared by all descendants of this review."""
+        return self.path + get_path_segment(self.id)
+
+    def get_descendants(self):
+        """Returns all (direct and indirect) comments on this review."""
+        return Review.objects.filter(path__startswith=self.descendants_path)
+
+    def _get_scored_rating(self):
+        """Returns rating as it should be counted in PaperScore, or None if it does not count."""
+        if self.is_review and not self.is_deleted and self.rating is not None and 1 <= self.rating <= 7:
+            return self.rating
+        return None
+
     def has_valid_rating(self):
         return self.rating == -1 or 1 <= self.rating <= 7
 
-    def cache(self, select_related=None, defer=None, order=False, order_reverse=False):
+    def cache(self, select_related=None, defer=None, order=False, order_reverse=False, descendants_only=False):
         """
         Caches all reviews in the complete review tree of self.paper. After calling the
         following properties are available (discouraged to use outside of this class):
@@ -169,11 +393,18 @@ class Review(models.Model):
 
         @param order_reverse: reverse ordering (default ordering is descending)
         @type order_reverse: bool
+
+        @param descendants_only: only cache this review and its descendants, instead
+                                 of all reviews of self.paper.
+        @type descendants_only: bool
         """
         if self.cached: return
 
-        # Select review objects in complete tree
-        reviews = self.paper.reviews.all()
+        # Select review objects in complete tree (or subtree)
+        if descendants_only:
+            reviews = Review.objects.filter(Q(id=self.id) | Q(path__startswith=self.descendants_path))
+        else:
+            reviews = self.paper.reviews.all()
         if select_related:
             reviews = reviews.select_related(*select_related)
         if defer:
@@ -207,7 +438,10 @@ class Review(models.Model):
             review._reviews = reviews
             review._reviews_children = mapping
             review._paper_cache = paper
-            review._parent_cache = reviews.get(review.parent_id, None)
+
+            # Parent of the root of a subtree is not cached
+            if review.parent_id is None or review.parent_id in reviews:
+                review._parent_cache = reviews.get(review.parent_id, None)
 
     def _get_tree(self, level, seen, lazy):
         if self.id in seen:
@@ -236,6 +470,8 @@ class Review(models.Model):
         return self._get_tree(level=0, seen=set(), lazy=lazy)
 
     def _get_tree_size(self):
+        if not self.cached:
+            return 1 + self.get_descendants().count()
         return 1 + sum(r.review.get_tree_size() for r in self.get_tree().children)
 
     def get_tree_size(self):
@@ -251,8 +487,31 @@ class Review(models.Model):
         str += "anonymous" if self.anonymous else "{self.poster}"
         return str.format(self=self)
 
-    def _invalidate_template_caches(self):
-        cache.delete(make_template_fragment_key('review', [self.paper_id, self.id]))
+    def _bump_versions(self):
+        bump_versions([self.paper_id], [self.id])
+
+    def render_text(self):
+        """Renders self.text (as urlized markdown) into self.text_html."""
+        self.text_html = None if self.text is None else render_markdown(self.text, urls=True)
+        self.text_html_version = RENDERER_VERSION
+
+    def get_rendered_text(self):
+        """
+        Returns self.text as HTML. The HTML is rendered upon saving, but if it was
+        rendered by an older renderer it is rendered (and stored) again.
+        """
+        if self.text is None:
+            return None
+
+        if self.text_html_version != RENDERER_VERSION:
+            self.render_text()
+
+            # Previews have id=0, and are not in the database
+            if self.id:
+                Review.objects.filter(id=self.id).update(
+                    text_html=self.text_html, text_html_version=self.text_html_version)
+
+        return mark_safe(self.text_html)
 
     def set_public(self):
         self.anonymous = False
@@ -292,15 +551,23 @@ class Review(models.Model):
         if self.text is not None and not self.text.strip():
             raise ValueError("Review or comment does not have any text")
 
-        # We need to clean template caches if this is an existing review
-        if self.id is not None:
-            self._invalidate_template_caches()
-
         # Note: we should probably also check for loops, but this makes saving very
         # inefficient. Instead, when generating trees this issue is detected.
         if not self.is_review and self.parent.paper_id is not self.paper_id:
             raise ValueError("parent.paper ({self.parent.paper_id}) was not {self.paper_id}".format(self=self))
 
+        self.render_text()
+
+        # Update materialized path. If this review moved, its descendants move along.
+        old_path = self.path
+        self.path = "" if self.is_review else self.parent.descendants_path
+        self.depth = len(self.path) // PATH_SEGMENT_LENGTH
+        existing = self.id is not None
+        moved = existing and old_path != self.path
+
+        if self._stored_rating is NOT_LOADED:
+            self._stored_rating = Review.objects.get(id=self.id)._stored_rating
+
         if not self.anonymous and self.external:
             raise ValueError("External reviews must be anonymous.")
 
@@ -311,7 +578,68 @@ class Review(models.Model):
         if self.id is None and self.is_deleted:
             raise ValueError("Cannot save new, deleted review.")
 
-        return super().save(*args, **kwargs)
+        # Vote counters are maintained by Vote using atomic updates. Writing back our
+        # (possibly outdated) copy would undo concurrent votes. Reviews with an explicit id
+        # which were not loaded from the database may still need to be inserted.
+        if not self._state.adding and not kwargs.get("force_insert") and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in VOTE_COUNTER_FIELDS
+            ]
+
+        # The review and its descendants move together, or not at all
+        with transaction.atomic():
+            result = super().save(*args, **kwargs)
+            if moved:
+                self._move_descendants(old_path + get_path_segment(self.id))
+
+        # Pages showing an existing review change. This is done after saving, to prevent
+        # the old text to be cached again in the meantime.
+        if existing:
+            self._bump_versions()
+        else:
+            # The paper (page) contains a new review
+            bump_versions([self.paper_id])
+            weight = REVIEW_WEIGHT if self.is_review else COMMENT_WEIGHT
+            PaperScore.add_activity(self.paper_id, weight, self.timestamp)
+
+        # Keep Paper.n_reviews up to date if this became a review (or stopped being one).
+        # Only reviews have an empty path.
+        was_review = existing and not old_path
+        if self.is_review != was_review:
+            self._update_paper_counts(1 if self.is_review else -1)
+
+        rating = self._get_scored_rating()
+        if rating != self._stored_rating:
+            PaperScore.update_controversy(self.paper_id, old_rating=self._stored_rating, new_rating=rating)
+            self._stored_rating = rating
+
+        return result
+
+    def _update_paper_counts(self, delta):
+        """
+        Atomically adds `delta` to the review counter of self.paper. The cached paper
+        object (if any) is updated too.
+        """
+        # Prevent circular imports
+        from openreview.apps.main.models import Paper
+
+        Paper.objects.filter(id=self.paper_id).update(n_reviews=F("n_reviews") + delta)
+
+        paper = getattr(self, "_paper_cache", None)
+        if paper is not None:
+            paper.n_reviews += delta
+
+    def _move_descendants(self, old_prefix):
+        # Rewrites the prefix of all descendants in one statement. Paths only contain
+        # digits, so the prefix needs no escaping in LIKE.
+        new_prefix = self.descendants_path
+        depth_delta = (len(new_prefix) - len(old_prefix)) // PATH_SEGMENT_LENGTH
+        connection.cursor().execute(
+            "UPDATE {table} SET path = %s || SUBSTR(path, %s), depth = depth + %s "
+            "WHERE path LIKE %s AND id <> %s".format(table=Review._meta.db_table),
+            [new_prefix, len(old_prefix) + 1, depth_delta, old_prefix + "%", self.id]
+        )
 
     ### PERMISSIONS ###
     def can_delete(self, user):
@@ -338,20 +666,78 @@ class Vote(models.Model):
         # You can only vote once on a review
         unique_together = (("review", "voter"),)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Value of this vote as stored in the database, used to calculate the deltas
+        # applied to Review.n_upvotes and Review.n_downvotes.
+        self._stored_vote = self.vote if self.id is not None else 0
+
     def __str__(self):
         return "{self.voter} voted {self.vote} on {self.review}".format(self=self)
 
+    def _update_review_counts(self, old, new):
+        """
+        Atomically applies the difference between `old` and `new` to the vote counters
+        of self.review. The cached review object (if any) is updated too.
+        """
+        delta_up, delta_down = get_vote_deltas(old, new)
+
+        if not (delta_up or delta_down):
+            return
+
+        Review.objects.filter(id=self.review_id).update(
+            n_upvotes=F("n_upvotes") + delta_up,
+            n_downvotes=F("n_downvotes") + delta_down
+        )
+
+        PaperScore.update_controversy(self.review.paper_id, delta_up=delta_up, delta_down=delta_down)
+
+        review = getattr(self, "_review_cache", None)
+        if review is not None:
+            review.n_upvotes += delta_up
+            review.n_downvotes += delta_down
+
+    @classmethod
+    def cast(cls, user, review, value):
+        """
+        Sets the vote of `user` on `review` to `value`, whether or not it voted before.
+        Unlike get_or_create() followed by save(), this is a single upsert (see
+        upsert_votes()), so concurrent requests cannot fail on the unique constraint.
+        Vote counters and scores are updated.
+
+        @return: (old value, new value), where the old value is 0 if `user` did not vote
+                 on `review` yet (or None if unknown, see upsert_votes())
+        @rtype: tuple
+        """
+        return cast_votes(user, [(review, value)])[review.id]
+
     def delete(self, using=None):
-        self.review._invalidate_template_caches()
-        super().delete(using=using)
+        with transaction.atomic(using=using):
+            super().delete(using=using)
+            self._update_review_counts(self._stored_vote, 0)
+        self._stored_vote = 0
+
+        # Invalidated after writing, so outdated counts are not cached in the meantime
+        self.review._bump_versions()
 
     @property
     def _same(self):
         return Vote.objects.filter(review__id=self.review_id, voter__id=self.voter_id)
 
     def save(self, *args, **kwargs):
-        self.review._invalidate_template_caches()
-        return super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get("using")):
+            created = self.id is None
+            result = super().save(*args, **kwargs)
+            self._update_review_counts(self._stored_vote, self.vote)
+
+            if created:
+                PaperScore.add_activity(self.review.paper_id, VOTE_WEIGHT)
+        self._stored_vote = self.vote
+
+        # Invalidated after writing, so outdated counts are not cached in the meantime
+        self.review._bump_versions()
+        return result
 
     ### PERMISSIONS ###
     def can_delete(self, user):
@@ -0,0 +1,238 @@
+import datetime
+import math
+
+from django.db import models, transaction, IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+
+__all__ = ["PaperScore", "get_activity_weight", "update_paper_scores", "update_controversy_sums"]
+
+# Trending scores decay exponentially: activity of HALF_LIFE ago is worth half of the
+# activity of now. Instead of decaying all scores periodically, new activity is worth
+# more as time passes. Scores are relative to EPOCH, which needs to be moved (and
+# stored scores scaled, see migration 0024) before 2**(time since EPOCH / HALF_LIFE)
+# overflows a double, which is after roughly 19 years.
+EPOCH = datetime.datetime(2026, 1, 1, tzinfo=timezone.utc)
+HALF_LIFE = datetime.timedelta(days=7)
+
+# Weight of each type of activity
+REVIEW_WEIGHT = 1.0
+COMMENT_WEIGHT = 0.25
+VOTE_WEIGHT = 0.1
+
+# Ratings are between 1 and 7, so their variance is at most 3 ** 2
+MAX_RATING_VARIANCE = 9.0
+
+# Running sums controversy is calculated from
+SUM_FIELDS = ("n_ratings", "rating_sum", "rating_sum_squares", "n_upvotes", "n_downvotes")
+
+# Maximum number of papers per query in update_controversy_sums() (SQLite allows 999
+# parameters)
+RECOUNT_BATCH_SIZE = 500
+
+
+def get_activity_weight(weight, timestamp=None):
+    """
+    Returns the trending score of activity with weight `weight`, happening at
+    `timestamp` (defaults to now).
+
+    @type weight: float
+    @type timestamp: datetime.datetime
+    @rtype: float
+    """
+    if timestamp is None:
+        timestamp = timezone.now()
+    elif timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp, timezone.get_default_timezone())
+
+    half_lives = (timestamp - EPOCH).total_seconds() / HALF_LIFE.total_seconds()
+    return weight * math.pow(2, half_lives)
+
+
+def update_paper_scores():
+    """
+    Rebuilds all paper scores from scratch. Votes have no timestamp, so they are
+    counted as if they were cast when the review they were cast on was written.
+
+    @rtype: int
+    @return: number of papers with a score
+    """
+    # Prevent circular imports
+    from openreview.apps.main.models import Review, Vote
+
+    scores = {}
+    def get_score(paper_id):
+        if paper_id not in scores:
+            scores[paper_id] = PaperScore(paper_id=paper_id)
+        return scores[paper_id]
+
+    reviews = Review.objects.values_list("paper_id", "parent_id", "timestamp", "rating")
+    for paper_id, parent_id, timestamp, rating in reviews.iterator():
+        score = get_score(paper_id)
+        weight = REVIEW_WEIGHT if parent_id is None else COMMENT_WEIGHT
+        score.trending += get_activity_weight(weight, timestamp)
+
+        if parent_id is None and 1 <= rating <= 7:
+            score.add_rating(rating)
+
+    votes = Vote.objects.values_list("review__paper_id", "review__timestamp", "vote")
+    for paper_id, timestamp, vote in votes.iterator():
+        score = get_score(paper_id)
+        score.trending += get_activity_weight(VOTE_WEIGHT, timestamp)
+        score.n_upvotes += max(vote, 0)
+        score.n_downvotes += max(-vote, 0)
+
+    for score in scores.values():
+        score.controversy = score.get_controversy()
+
+    with transaction.atomic():
+        PaperScore.objects.all().delete()
+        PaperScore.objects.bulk_create(list(scores.values()))
+
+    return len(scores)
+
+
+def update_controversy_sums(paper_ids):
+    """
+    Recalculates the rating and vote sums (and controversy) of papers `paper_ids` from
+    their reviews and votes. These are normally maintained by Review.save() and
+    Vote.save(), but bulk operations (bulk_delete(), cascading deletes) bypass them.
+
+    @type paper_ids: iterable
+    """
+    # Prevent circular imports
+    from openreview.apps.main.models import Review, Vote
+
+    paper_ids = list(set(paper_ids))
+    for i in range(0, len(paper_ids), RECOUNT_BATCH_SIZE):
+        batch = paper_ids[i:i + RECOUNT_BATCH_SIZE]
+        scores = {paper_id: PaperScore(paper_id=paper_id) for paper_id in batch}
+
+        # Deleted reviews have rating -1
+        ratings = Review.objects.filter(paper__id__in=batch, parent=None, rating__gte=1, rating__lte=7)
+        for paper_id, rating in ratings.values_list("paper_id", "rating").iterator():
+            scores[paper_id].add_rating(rating)
+
+        votes = Vote.objects.filter(review__paper__id__in=batch)
+        upvotes = votes.filter(vote__gt=0).values_list("review__paper_id").annotate(n=Sum("vote"))
+        downvotes = votes.filter(vote__lt=0).values_list("review__paper_id").annotate(n=Sum("vote"))
+        for paper_id, n in upvotes:
+            scores[paper_id].n_upvotes = n
+        for paper_id, n in downvotes:
+            scores[paper_id].n_downvotes = -n
+
+        for paper_id, score in scores.items():
+            values = {field: getattr(score, field) for field in SUM_FIELDS}
+            values["controversy"] = score.get_controversy()
+            if not PaperScore.objects.filter(paper_id=paper_id).update(**values):
+                try:
+                    with transaction.atomic():
+                        PaperScore.objects.create(paper_id=paper_id, **values)
+                except IntegrityError:
+                    # Created concurrently
+                    PaperScore.objects.filter(paper_id=paper_id).update(**values)
+
+
+class PaperScore(models.Model):
+    """
+    Precomputed scores used to rank papers. Scores are maintained incrementally when
+    reviews and votes are written. Use `manage.py update_paper_scores` to rebuild them.
+    """
+    paper = models.OneToOneField("main.Paper", primary_key=True, related_name="score")
+    trending = models.FloatField(default=0)
+
+    # Running sums of the ratings of all reviews (not comments) and the votes on
+    # all reviews and comments of a paper, used to calculate `controversy`.
+    n_ratings = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_sum_squares = models.IntegerField(default=0)
+    n_upvotes = models.IntegerField(default=0)
+    n_downvotes = models.IntegerField(default=0)
+    controversy = models.FloatField(default=0)
+
+    class Meta:
+        app_label = "main"
+        # Listings are paginated on (score, paper id)
+        index_together = [("trending", "paper"), ("controversy", "paper")]
+
+    def __str__(self):
+        return "Scores of {self.paper_id}".format(self=self)
+
+    def add_rating(self, rating, n=1):
+        """Adds `rating` to running sums, or removes it if `n` is -1."""
+        self.n_ratings += n
+        self.rating_sum += n * rating
+        self.rating_sum_squares += n * rating ** 2
+
+    def get_controversy(self):
+        """
+        Calculates controversy based on the variance of the ratings and the balance
+        between up- and downvotes. Both are scaled to [0, 1] and weighted by the
+        (logarithm of) the number of ratings / votes.
+
+        @rtype: float
+        """
+        rating_variance = 0
+        if self.n_ratings > 0:
+            mean = self.rating_sum / self.n_ratings
+            rating_variance = max(self.rating_sum_squares / self.n_ratings - mean ** 2, 0)
+
+        vote_balance = 0
+        if self.n_upvotes > 0 and self.n_downvotes > 0:
+            vote_balance = min(self.n_upvotes, self.n_downvotes) / max(self.n_upvotes, self.n_downvotes)
+
+        return sum((
+            rating_variance / MAX_RATING_VARIANCE * math.log2(1 + self.n_ratings),
+            vote_balance * math.log2(1 + self.n_upvotes + self.n_downvotes)
+        ))
+
+    @classmethod
+    def update_controversy(cls, paper_id, old_rating=None, new_rating=None, delta_up=0, delta_down=0):
+        """
+        Replaces rating `old_rating` by `new_rating` (either may be None), and adds
+        `delta_up` and `delta_down` to the vote sums of paper `paper_id`.
+
+        The sums are updated atomically, without locking the scores first, and the
+        controversy is calculated from the updated sums afterwards.
+        """
+        deltas = dict.fromkeys(SUM_FIELDS, 0)
+        deltas.update(n_upvotes=delta_up, n_downvotes=delta_down)
+        for rating, n in ((old_rating, -1), (new_rating, 1)):
+            if rating is not None:
+                deltas["n_ratings"] += n
+                deltas["rating_sum"] += n * rating
+                deltas["rating_sum_squares"] += n * rating ** 2
+
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if not updates:
+            return
+
+        if not cls.objects.filter(paper_id=paper_id).update(**updates):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(paper_id=paper_id, **deltas)
+            except IntegrityError:
+                # Created concurrently
+                cls.objects.filter(paper_id=paper_id).update(**updates)
+
+        # If the sums changed concurrently in the meantime, the other update writes the
+        # controversy of the newer sums instead.
+        sums = cls.objects.filter(paper_id=paper_id).values(*SUM_FIELDS).get()
+        controversy = cls(**sums).get_controversy()
+        cls.objects.filter(paper_id=paper_id, **sums).update(controversy=controversy)
+
+    @classmethod
+    def add_activity(cls, paper_id, weight, timestamp=None):
+        """
+        Adds activity with weight `weight` to trending score of paper `paper_id`.
+        """
+        value = get_activity_weight(weight, timestamp)
+        if cls.objects.filter(paper_id=paper_id).update(trending=F("trending") + value):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(paper_id=paper_id, trending=value)
+        except IntegrityError:
+            # Created concurrently
+            cls.objects.filter(paper_id=paper_id).update(trending=F("trending") + value)
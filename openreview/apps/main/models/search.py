@@ -0,0 +1,19 @@
+from django.db import models
+
+__all__ = ["QueuedIndexUpdate"]
+
+
+class QueuedIndexUpdate(models.Model):
+    """
+    Object whose search index entry is outdated. Objects are queued by
+    QueuedSignalProcessor, and (re)indexed or removed from the index in bulk
+    by `manage.py flush_index_queue`. An object may be queued more than once.
+    """
+    model = models.CharField(max_length=100)
+    object_id = models.IntegerField()
+
+    class Meta:
+        app_label = "main"
+
+    def __str__(self):
+        return "{self.model}.{self.object_id}".format(self=self)
@@ -0,0 +1,168 @@
+"""
+Queued search indexing. Saving or deleting an indexed object only queues it (a
+single INSERT in the current transaction), so writes do not wait for the search
+backend. Queued objects are indexed in bulk by flush_index_queue(), which is run
+periodically or continuously by `manage.py flush_index_queue`.
+
+Models are imported lazily, as Haystack loads the signal processor before the
+models of this app are loaded.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from logging import getLogger
+import threading
+
+from django.db import models
+from haystack import connections
+from haystack.exceptions import NotHandled
+from haystack.signals import BaseSignalProcessor
+
+__all__ = ["QueuedSignalProcessor", "deferred_indexing", "queue_index_update", "flush_index_queue"]
+
+# Number of objects sent to the search backend per request
+BATCH_SIZE = 500
+
+_local = threading.local()
+
+log = getLogger(__name__)
+
+
+def _get_label(model):
+    return "{meta.app_label}.{meta.model_name}".format(meta=model._meta)
+
+
+def _is_indexed(model):
+    return model in connections["default"].get_unified_index().get_indexed_models()
+
+
+def queue_index_update(model, ids):
+    """
+    Queues objects of `model` with primary keys `ids` for (re)indexing, or for
+    removal from the index if they don't exist anymore. Ignored if `model` is
+    not indexed.
+
+    @type ids: iterable
+    """
+    from openreview.apps.main.models import QueuedIndexUpdate
+
+    if not _is_indexed(model):
+        return
+
+    label = _get_label(model)
+    deferred = getattr(_local, "deferred", None)
+    if deferred is not None:
+        deferred.update((label, object_id) for object_id in ids)
+    else:
+        QueuedIndexUpdate.objects.bulk_create([
+            QueuedIndexUpdate(model=label, object_id=object_id) for object_id in set(ids)
+        ])
+
+
+@contextmanager
+def deferred_indexing():
+    """
+    Collects objects changed within this context, and queues them all at once (and
+    only once) when it exits, also if it exits with an exception. Meant for bulk
+    changes, such as imports:
+
+    >>> with deferred_indexing():
+    >>>     for paper in papers:
+    >>>         paper.save()
+    """
+    from openreview.apps.main.models import QueuedIndexUpdate
+
+    if getattr(_local, "deferred", None) is not None:
+        # Nested, the outermost context queues the objects
+        yield
+        return
+
+    _local.deferred = set()
+    try:
+        yield
+    finally:
+        # Objects changed before an exception may have been saved. Queueing objects
+        # which do not exist only removes them from the index.
+        deferred, _local.deferred = _local.deferred, None
+        QueuedIndexUpdate.objects.bulk_create([
+            QueuedIndexUpdate(model=label, object_id=object_id) for label, object_id in deferred
+        ])
+
+
+def flush_index_queue(batch_size=BATCH_SIZE, using="default"):
+    """
+    Indexes all queued objects in batches of `batch_size`, and removes objects which
+    no longer exist from the index. Queue entries are only removed after they are
+    indexed, so they are retried if the search backend fails. Entries of models which
+    no longer exist or are no longer indexed are dropped.
+
+    @return: number of processed queue entries
+    @rtype: int
+    """
+    from openreview.apps.main.models import QueuedIndexUpdate
+
+    unified_index = connections[using].get_unified_index()
+    backend = connections[using].get_backend()
+
+    n = 0
+    while True:
+        queued = list(QueuedIndexUpdate.objects.order_by("id").values_list("id", "model", "object_id")[:batch_size])
+        if not queued:
+            return n
+
+        ids = defaultdict(set)
+        for _, label, object_id in queued:
+            ids[label].add(object_id)
+
+        for label, object_ids in ids.items():
+            try:
+                index = unified_index.get_index(models.get_model(*label.split(".", 1)))
+            except NotHandled:
+                # Would otherwise block the queue forever
+                log.warning("Dropping %d queued index updates of unknown model %s", len(object_ids), label)
+                continue
+
+            objects = list(index.index_queryset(using=using).filter(pk__in=object_ids))
+            if objects:
+                backend.update(index, objects)
+
+            for object_id in object_ids - {obj.pk for obj in objects}:
+                backend.remove("{label}.{object_id}".format(**locals()))
+
+        QueuedIndexUpdate.objects.filter(id__in=[queue_id for queue_id, _, _ in queued]).delete()
+        n += len(queued)
+
+
+class QueuedSignalProcessor(BaseSignalProcessor):
+    """
+    Queues indexed objects when they are saved or deleted, or when their relations
+    change (the index of a paper contains its authors, keywords and categories).
+    """
+    def setup(self):
+        models.signals.post_save.connect(self.handle_save)
+        models.signals.post_delete.connect(self.handle_delete)
+        models.signals.m2m_changed.connect(self.handle_m2m_changed)
+
+    def teardown(self):
+        models.signals.post_save.disconnect(self.handle_save)
+        models.signals.post_delete.disconnect(self.handle_delete)
+        models.signals.m2m_changed.disconnect(self.handle_m2m_changed)
+
+    def handle_save(self, sender, instance, **kwargs):
+        queue_index_update(sender, [instance.pk])
+
+    def handle_delete(self, sender, instance, **kwargs):
+        queue_index_update(sender, [instance.pk])
+
+    def handle_m2m_changed(self, sender, instance, action, model, pk_set, **kwargs):
+        if action not in ("post_add", "post_remove", "pre_clear"):
+            return
+
+        queue_index_update(type(instance), [instance.pk])
+
+        if pk_set is None and _is_indexed(model):
+            # Cleared, find the related objects in the intermediary table
+            instance_field = next(f for f in sender._meta.fields if f.rel and f.rel.to == type(instance))
+            model_field = next(f for f in sender._meta.fields if f.rel and f.rel.to == model)
+            pk_set = sender.objects.filter(**{instance_field.name: instance}).values_list(model_field.attname, flat=True)
+
+        queue_index_update(model, pk_set or ())
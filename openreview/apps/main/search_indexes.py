@@ -3,15 +3,34 @@ from .models.paper import Paper, Author
 
 
 class PaperIndex(indexes.SearchIndex, indexes.Indexable):
-    text = indexes.CharField(document=True, model_attr='title')
+    # Title, abstract, authors, keywords and categories, see search/indexes/main/paper_text.txt
+    text = indexes.CharField(document=True, use_template=True)
     content_auto = indexes.EdgeNgramField(model_attr='title')
 
+    authors = indexes.MultiValueField(faceted=True)
+    keywords = indexes.MultiValueField(faceted=True)
+    categories = indexes.MultiValueField(faceted=True)
+    publish_date = indexes.DateField(model_attr='publish_date', null=True)
+
     def get_model(self):
         return Paper
 
+    def index_queryset(self, using=None):
+        return self.get_model().objects.prefetch_related("authors", "keywords", "categories")
+
+    def prepare_authors(self, obj):
+        return [author.name for author in obj.authors.all()]
+
+    def prepare_keywords(self, obj):
+        return [keyword.label for keyword in obj.keywords.all()]
+
+    def prepare_categories(self, obj):
+        return [category.name for category in obj.categories.all()]
+
 
 class AuthorIndex(indexes.SearchIndex, indexes.Indexable):
     text = indexes.CharField(document=True, model_attr='name')
+    content_auto = indexes.EdgeNgramField(model_attr='name')
 
     def get_model(self):
         return Author
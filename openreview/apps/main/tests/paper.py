@@ -1,5 +1,14 @@
-from openreview.apps.main.models import Paper
-from openreview.apps.tools.testing import create_test_paper, BaseTestCase
+import datetime
+
+from django.core import management
+from django.utils import timezone
+from openreview.apps.main.models import Paper, Review, PaperScore, RelatedPaper, update_related_papers
+from openreview.apps.main.models.score import get_activity_weight, HALF_LIFE
+from openreview.apps.main.models.related import get_similar_papers, TOP_K
+from openreview.apps.main.models.review import bulk_delete
+from openreview.apps.tools.testing import create_test_paper, create_test_review, create_test_votes, BaseTestCase
+from openreview.apps.tools.testing import create_test_author, create_test_keyword, assert_max_queries
+from openreview.apps.tools.testing import create_test_category
 
 __all__ = ["TestPaper"]
 
@@ -11,6 +20,55 @@ class TestPaper(BaseTestCase):
         self.assertEqual(paper.get_comments().count(), 2)
         self.assertNotEqual(paper.reviews.all().count(), 3)
         self.assertEqual(paper.num_reviews(), paper.get_reviews().count())
+        self.assertEqual(Paper.objects.get(id=paper.id).num_reviews(), 3)
+
+    def test_get_authors(self):
+        paper = create_test_paper(n_authors=6)
+        names = [a.name for a in paper.authors.all()]
+        expected = ", ".join(names[:5]) + " et al."
+
+        with assert_max_queries(n=1):
+            fetched = Paper.objects.get(id=paper.id)
+        with assert_max_queries(n=0):
+            self.assertEqual(fetched.get_authors(), expected)
+
+        paper = Paper.objects.prefetch_related("authors").get(id=paper.id)
+        with assert_max_queries(n=0):
+            self.assertEqual(paper.get_authors(), expected)
+            self.assertEqual(paper.get_authors(authors=2), ", ".join(names[:2]) + " et al.")
+
+        # Removing authors (from either side) updates the author line
+        paper.authors.remove(*paper.authors.all()[:5])
+        self.assertEqual(Paper.objects.get(id=paper.id).get_authors(), names[5])
+        author = create_test_author()
+        author.paper_set.add(paper)
+        self.assertEqual(Paper.objects.get(id=paper.id).get_authors(), names[5] + ", " + author.name)
+
+        # Outdated author lines are calculated when needed
+        author.name = "foo"
+        author.save()
+        paper = Paper.objects.get(id=paper.id)
+        self.assertIsNone(paper.author_line)
+        self.assertEqual(paper.get_authors(), names[5] + ", foo")
+        self.assertEqual(Paper.objects.get(id=paper.id).author_line, names[5] + ", foo")
+
+    def test_review_counter(self):
+        paper = create_test_paper()
+        review = create_test_review(paper=paper)
+        comment = create_test_review(paper=paper, parent=review)
+        self.assertEqual(Paper.objects.get(id=paper.id).n_reviews, 1)
+
+        # Saving a stale copy of the paper does not overwrite the counter
+        stale = Paper.objects.get(id=paper.id)
+        create_test_review(paper=paper)
+        stale.title = "foo"
+        stale.save()
+        self.assertEqual(Paper.objects.get(id=paper.id).n_reviews, 2)
+
+        # Deleting a review does not remove it from the paper
+        review.delete()
+        comment.delete()
+        self.assertEqual(Paper.objects.get(id=paper.id).n_reviews, 2)
 
     def test_home_columns(self):
         Paper.objects.all().delete()
@@ -27,12 +85,169 @@ class TestPaper(BaseTestCase):
 
         self.assertIn(trending, Paper.latest())
         self.assertIn(non_trending, Paper.latest())
-        self.assertIn(trending, Paper.controversial())
-        self.assertIn(non_trending, Paper.controversial())
         self.assertEqual(len(Paper.latest()), 3)
 
-        # TODO: test controversiality
-        #self.assertEqual(len(Paper.controversial()), 2)
+        # All reviews have the same rating, so nothing is controversial
+        self.assertEqual(len(Paper.controversial()), 0)
+
+    def test_controversial(self):
+        Paper.objects.all().delete()
+
+        agreed = create_test_paper()
+        for rating in (4, 4, 4):
+            create_test_review(paper=agreed, rating=rating)
+
+        disputed = create_test_paper()
+        for rating in (1, 7, 1, 7):
+            create_test_review(paper=disputed, rating=rating)
+
+        divided = create_test_paper()
+        review = create_test_review(paper=divided, rating=3)
+        create_test_review(paper=divided, rating=5)
+        self.assertEqual(list(Paper.controversial()), [disputed, divided])
+
+        # Balanced votes make a paper more controversial
+        create_test_votes({1: 10, -1: 10}, review)
+        self.assertEqual(list(Paper.controversial()), [divided, disputed])
+        self.assertEqual(list(Paper.controversial(top=1)), [divided])
+
+        # Changing and deleting reviews should update running sums
+        for review in disputed.reviews.all():
+            review.rating = 4
+            review.save()
+        self.assertEqual(list(Paper.controversial()), [divided])
+
+        score = PaperScore.objects.get(paper=disputed)
+        self.assertEqual((4, 16, 64), (score.n_ratings, score.rating_sum, score.rating_sum_squares))
+        disputed.reviews.all()[0].delete()
+        score = PaperScore.objects.get(paper=disputed)
+        self.assertEqual((3, 12, 48), (score.n_ratings, score.rating_sum, score.rating_sum_squares))
+
+        # Bulk deletes bypass Review.delete(), but are recounted as well
+        bulk_delete(disputed.reviews.all())
+        score = PaperScore.objects.get(paper=disputed)
+        self.assertEqual((0, 0, 0), (score.n_ratings, score.rating_sum, score.rating_sum_squares))
+
+        # Rebuilding yields the same scores
+        scores = dict(PaperScore.objects.values_list("paper_id", "controversy"))
+        management.call_command("update_paper_scores", verbosity=0)
+        self.assertEqual(scores, dict(PaperScore.objects.values_list("paper_id", "controversy")))
+
+    def test_trending_scores(self):
+        Paper.objects.all().delete()
+
+        # Reviews are timestamped on creation, so scores of (almost) simultaneous
+        # reviews are (almost) equal
+        paper1 = create_test_paper(n_reviews=1)
+        paper2 = create_test_paper(n_reviews=1)
+        self.assertAlmostEqual(paper1.score.trending / paper2.score.trending, 1.0, places=3)
+
+        # Votes count as activity too
+        create_test_votes({1: 2}, paper2.reviews.all()[0])
+        self.assertEqual(list(Paper.trending()), [paper2, paper1])
+
+        # Rebuilding should result in the same ranking
+        scores = dict(PaperScore.objects.values_list("paper_id", "trending"))
+        PaperScore.objects.all().delete()
+        management.call_command("update_paper_scores", verbosity=0)
+        self.assertEqual(list(Paper.trending()), [paper2, paper1])
+        self.assertEqual(set(scores), set(PaperScore.objects.values_list("paper_id", flat=True)))
+
+        # Activity of a half life later scores twice as much, and scores stay far from overflowing
+        now = timezone.now()
+        self.assertAlmostEqual(get_activity_weight(1, now + HALF_LIFE) / get_activity_weight(1, now), 2.0)
+        self.assertLess(get_activity_weight(1, now + datetime.timedelta(days=365)), 1e100)
+
+    def test_rendered_abstract(self):
+        paper = create_test_paper(abstract="*foo*")
+        paper = Paper.objects.get(id=paper.id)
+        self.assertEqual("<p><em>foo</em></p>", paper.abstract_html.strip())
+        self.assertEqual("<p><em>foo</em></p>", paper.get_rendered_abstract().strip())
+
+    def test_render_markdown_command(self):
+        paper = create_test_paper(abstract="*foo*")
+        review = create_test_review(paper=paper, text="*bar*")
+        Paper.objects.filter(id=paper.id).update(abstract_html="old", abstract_html_version=0)
+        Review.objects.filter(id=review.id).update(text_html="old", text_html_version=0)
+
+        management.call_command("render_markdown", verbosity=0)
+        self.assertEqual("<p><em>foo</em></p>", Paper.objects.get(id=paper.id).abstract_html.strip())
+        self.assertEqual("<p><em>bar</em></p>", Review.objects.get(id=review.id).text_html.strip())
+
+        # Up to date HTML is only rendered again when using --all
+        Paper.objects.filter(id=paper.id).update(abstract_html="old")
+        management.call_command("render_markdown", verbosity=0)
+        self.assertEqual("old", Paper.objects.get(id=paper.id).abstract_html)
+        management.call_command("render_markdown", verbosity=0, all=True)
+        self.assertEqual("<p><em>foo</em></p>", Paper.objects.get(id=paper.id).abstract_html.strip())
+
+    def test_related_papers(self):
+        Paper.objects.all().delete()
+        author, keyword = create_test_author(), create_test_keyword()
+
+        paper = create_test_paper()
+        same_author = create_test_paper()
+        same_keyword = create_test_paper()
+        unrelated = create_test_paper(n_keywords=1)
+        paper.authors.add(author)
+        paper.keywords.add(keyword)
+        same_author.authors.add(author)
+        same_keyword.keywords.add(keyword)
+
+        self.assertTrue(Paper.objects.get(id=paper.id).related_outdated)
+        management.call_command("update_related_papers", verbosity=0)
+        self.assertFalse(Paper.objects.filter(related_outdated=True).exists())
+
+        with assert_max_queries(n=1):
+            self.assertEqual(paper.get_related_papers(), ([same_author], [same_keyword]))
+        self.assertEqual(same_author.get_related_papers(), ([paper], []))
+        self.assertEqual(unrelated.get_related_papers(), ([], []))
+
+        # Sharing more makes papers more related
+        both = create_test_paper()
+        both.authors.add(author)
+        both.keywords.add(keyword)
+        self.assertFalse(Paper.objects.get(id=paper.id).related_outdated)
+        update_related_papers(both.id)
+        self.assertEqual(paper.get_related_papers(), ([both, same_author], [same_keyword]))
+        self.assertEqual(set(same_keyword.get_related_papers()[1]), {both, paper})
+
+        # Removed relations are removed from the related papers of others
+        both.authors.clear()
+        both.keywords.clear()
+        self.assertTrue(Paper.objects.get(id=both.id).related_outdated)
+        update_related_papers(both.id)
+        self.assertEqual(paper.get_related_papers(), ([same_author], [same_keyword]))
+        self.assertEqual(both.get_related_papers(), ([], []))
+
+        # Outdated papers without related papers (new papers) calculate them on the fly
+        new = create_test_paper()
+        new.authors.add(author)
+        new = Paper.objects.get(id=new.id)
+        by_author, by_subject = new.get_related_papers()
+        self.assertEqual((set(by_author), by_subject), ({paper, same_author}, []))
+        self.assertFalse(RelatedPaper.objects.filter(paper=new).exists())
+
+    def test_related_papers_candidates(self):
+        Paper.objects.all().delete()
+        category = create_test_category()
+        papers = [create_test_paper() for _ in range(TOP_K + 2)]
+        for paper in papers:
+            paper.categories.add(category)
+
+        # Full lists keep their most related papers
+        management.call_command("update_related_papers", verbosity=0)
+        self.assertEqual(RelatedPaper.objects.filter(paper=papers[0]).count(), TOP_K)
+        # The number of queries does not depend on the number of similar papers
+        with assert_max_queries(n=15):
+            update_related_papers(papers[0].id)
+        self.assertEqual(RelatedPaper.objects.filter(paper=papers[0]).count(), TOP_K)
+
+        # Only the papers sharing the most are candidates
+        shared = create_test_category()
+        for paper in papers[:4]:
+            paper.categories.add(shared)
+        self.assertEqual(set(get_similar_papers(papers[0].id, max_candidates=3)), {p.id for p in papers[1:4]})
 
     def get_votes(self):
         pass
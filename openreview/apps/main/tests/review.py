@@ -1,9 +1,8 @@
 from django.contrib.auth.models import AnonymousUser
 
-from django.core.cache import cache
-from django.core.cache.utils import make_template_fragment_key
 from openreview.apps.main.models import review
-from openreview.apps.main.models import Review, set_n_votes_cache, ReviewTree
+from openreview.apps.main.models import Review, ReviewTree
+from openreview.apps.main.versions import get_review_version_key, get_versions
 from openreview.apps.tools.testing import create_test_review, create_test_votes, assert_max_queries, list_queries, \
     create_test_paper, create_test_user, create_test_vote, BaseTestCase
 
@@ -83,30 +82,39 @@ class TestReview(BaseTestCase):
         r.poster = None
         self.assertFalse(r.is_semi_anonymous, msg="(anonymous=1 and poster is None) => review is not semi anonymous")
 
-    def test_set_n_votes_cache(self):
+    def test_stored_vote_counts(self):
         review1 = self.review
         self.setUp()
         review2 = self.review
 
-        # 5 queries must be done without caching
-        with list_queries(destination=[]) as l:
-            self.assertEqual(review1.n_downvotes, 8)
-            self.assertEqual(review2.n_downvotes, 8)
-            self.assertEqual(review1.n_upvotes, 5)
-            self.assertEqual(review2.n_upvotes, 5)
-        self.assertEqual(len(l), 4)
-
         reviews = set(Review.objects.filter(id__in=(review1.id, review2.id)))
-        with assert_max_queries(n=2):
-            set_n_votes_cache(reviews)
-
         review1, review2 = reviews
+
+        # Counters are stored on Review, no queries needed
         with assert_max_queries(n=0):
             self.assertEqual(review1.n_downvotes, 8)
             self.assertEqual(review2.n_downvotes, 8)
             self.assertEqual(review1.n_upvotes, 5)
             self.assertEqual(review2.n_upvotes, 5)
 
+    def test_save_keeps_vote_counts(self):
+        # A stale copy of a review should not overwrite counters updated by votes
+        stale = Review.objects.get(id=self.review.id)
+        create_test_vote(review=self.review, vote=1)
+        stale.text = "edited"
+        stale.save()
+
+        review = Review.objects.get(id=self.review.id)
+        self.assertEqual("edited", review.text)
+        self.assertEqual(6, review.n_upvotes)
+        self.assertEqual(8, review.n_downvotes)
+
+        # Reviews with an id which are not in the database yet are inserted
+        new_id = Review.objects.order_by("-id").values_list("id", flat=True)[0] + 1
+        review = Review(id=new_id, paper=self.review.paper, poster=self.review.poster, text="new", rating=3)
+        review.save()
+        self.assertTrue(Review.objects.filter(id=new_id, text="new").exists())
+
     def test_save(self):
         review1 = create_test_review()
         review2 = create_test_review()
@@ -231,6 +239,56 @@ class TestReview(BaseTestCase):
         self.assertEqual(top1.get_tree_size(), 5)
         self.assertEqual(child1.get_tree_size(), 2)
 
+    def test_path(self):
+        top = create_test_review()
+        child = create_test_review(parent=top)
+        leaf = create_test_review(parent=child)
+        other = create_test_review(paper=top.paper)
+
+        self.assertEqual(("", 0), (top.path, top.depth))
+        self.assertEqual((review.get_path_segment(top.id), 1), (child.path, child.depth))
+        self.assertEqual((child.path + review.get_path_segment(child.id), 2), (leaf.path, leaf.depth))
+        self.assertEqual({child, leaf}, set(top.get_descendants()))
+        self.assertEqual({leaf}, set(child.get_descendants()))
+        self.assertEqual(set(), set(other.get_descendants()))
+
+        # Moving a review should move its descendants
+        child.parent = other
+        child.save()
+        leaf = Review.objects.get(id=leaf.id)
+        self.assertEqual(2, leaf.depth)
+        self.assertEqual(set(), set(top.get_descendants()))
+        self.assertEqual({child, leaf}, set(other.get_descendants()))
+
+        # ...also when their depth changes
+        child.parent = None
+        child.save()
+        leaf = Review.objects.get(id=leaf.id)
+        self.assertEqual((review.get_path_segment(child.id), 1), (leaf.path, leaf.depth))
+        self.assertEqual({leaf}, set(child.get_descendants()))
+        self.assertEqual(set(), set(other.get_descendants()))
+
+    def test_cache_descendants_only(self):
+        paper = create_test_paper()
+        top1 = create_test_review(paper=paper)
+        top2 = create_test_review(paper=paper)
+        child = create_test_review(parent=top1)
+        leaf = create_test_review(parent=child)
+        create_test_review(parent=top2)
+
+        child = Review.objects.get(id=child.id)
+        child.cache(descendants_only=True)
+        self.assertEqual({child.id, leaf.id}, set(child._reviews))
+
+        with assert_max_queries(n=0):
+            self.assertEqual(child.get_tree_size(), 2)
+            self.assertEqual([leaf], [t.review for t in child.get_tree().children])
+
+        # Uncached tree sizes are counted by the database
+        top1 = Review.objects.get(id=top1.id)
+        with assert_max_queries(n=1):
+            self.assertEqual(top1.get_tree_size(), 3)
+
     def test_get_n_comments(self):
         paper = create_test_paper()
         top1 = create_test_review(paper=paper)
@@ -246,40 +304,51 @@ class TestReview(BaseTestCase):
 
     def test_cache_invalidation(self):
         review = create_test_review()
-        review_key = make_template_fragment_key("review", [review.paper_id, review.id])
-
-        # Direct call
-        cache.delete(review_key)
-        self.assertEqual(None, cache.get(review_key))
-        cache.set(review_key, "test")
-        self.assertEqual("test", cache.get(review_key))
-        review._invalidate_template_caches()
-        self.assertEqual(None, cache.get(review_key))
-
-        # After calling review.save()
-        cache.set(review_key, "test")
-        self.assertEqual("test", cache.get(review_key))
-        review.save()
-        self.assertEqual(None, cache.get(review_key))
+        key = get_review_version_key(review.id)
 
-        # After calling review.delete()
-        cache.set(review_key, "test")
-        self.assertEqual("test", cache.get(review_key))
-        review.delete()
-        self.assertEqual(None, cache.get(review_key))
+        def assert_bumped(func):
+            version = get_versions([key])
+            func()
+            self.assertNotEqual(version, get_versions([key]))
 
-        # After calling Vote.save()
+        assert_bumped(review._bump_versions)
+        assert_bumped(review.save)
         vote = create_test_vote(review=review)
-        cache.set(review_key, "test")
-        self.assertEqual("test", cache.get(review_key))
-        vote.save()
-        self.assertEqual(None, cache.get(review_key))
-
-        # After calling Vote.delete()
-        cache.set(review_key, "test")
-        self.assertEqual("test", cache.get(review_key))
-        vote.delete()
-        self.assertEqual(None, cache.get(review_key))
+        assert_bumped(vote.save)
+        assert_bumped(vote.delete)
+        assert_bumped(review.delete)
+
+    def test_rendered_text(self):
+        r = create_test_review(text="*foo* http://example.com")
+        self.assertEqual(
+            '<p><em>foo</em> <a href="http://example.com">http://example.com</a></p>',
+            Review.objects.get(id=r.id).text_html.strip()
+        )
+
+        # Links are not linked again
+        r = create_test_review(text="[foo](http://example.com)")
+        self.assertEqual('<p><a href="http://example.com">foo</a></p>', r.text_html.strip())
+
+        r.text = "*bar*"
+        r.save()
+        r = Review.objects.get(id=r.id)
+
+        with assert_max_queries(n=0):
+            self.assertEqual("<p><em>bar</em></p>", r.get_rendered_text().strip())
+
+        # Outdated HTML is rendered again, and stored
+        Review.objects.filter(id=r.id).update(text_html="old", text_html_version=0)
+        r = Review.objects.get(id=r.id)
+        self.assertEqual("<p><em>bar</em></p>", r.get_rendered_text().strip())
+        self.assertEqual("<p><em>bar</em></p>", Review.objects.get(id=r.id).text_html.strip())
+
+        # Deleted reviews lose their HTML as well
+        r.delete()
+        self.assertIsNone(Review.objects.get(id=r.id).text_html)
+
+        # Previews are not in the database
+        preview = Review(text="*foo*", id=0)
+        self.assertEqual("<p><em>foo</em></p>", preview.get_rendered_text().strip())
 
     def test_cache_ordering(self):
         paper = create_test_paper()
@@ -73,17 +73,14 @@ class TestPaperForm(BaseTestCase):
         self.assertIsNone(b.id)
 
         # save(commit=True) should
-        with assert_max_queries(n=9):
-            # Django queries database before inserting to make sure it doesn't include duplicates
+        with assert_max_queries(n=7):
             # [0] Checkout for duplicate Paper entry
-            # [1] Saving paper
-            # [2] INSERT piere
-            # [3] SELECT authors
+            # [1] INSERT piere
+            # [2] INSERT b
+            # [3] Saving paper
             # [4] INSERT authors
-            # [5] INSERT b
-            # [6] SELECT keywords
-            # [7] INSERT keywords
-            # [8] SELECT categories         
+            # [5] INSERT keywords
+            # [6] Queue paper and new authors for indexing
             paper = form.save(commit=True)
         self.assertIsNotNone(jean.id)
         self.assertIsNotNone(piere.id)
@@ -92,6 +89,7 @@ class TestPaperForm(BaseTestCase):
 
         self.assertEqual({jean, piere}, set(paper.authors.all()))
         self.assertEqual({a, b}, set(paper.keywords.all()))
+        self.assertEqual(Paper.objects.get(id=paper.id).author_line, "Jean, Piere")
 
     def test_no_duplicate_papers(self):
         test_data = {
@@ -114,12 +112,16 @@ class TestPaperForm(BaseTestCase):
 class TestAddPaperView(TestCase):
     def setUp(self):
         call_command("loaddata", "initial_data", verbosity=0)
+        self.oldurlopen = scrapers.urlopen
+
+    def tearDown(self):
+        scrapers.urlopen = self.oldurlopen
 
     def test_form_filled_in_automatically(self):
         cache.clear()
         c = Client()
-        scrapers.urlopen = lambda x: open(os.path.dirname(os.path.realpath(__file__)) +
-                                          "/../../papers/fixtures/arxiv/1306.3879.xml")
+        scrapers.urlopen = lambda x, **kwargs: open(os.path.dirname(os.path.realpath(__file__)) +
+                                                    "/../../papers/fixtures/arxiv/1306.3879.xml", "rb")
         user = create_test_user()
         c.login(username=user.username, password="test")
 
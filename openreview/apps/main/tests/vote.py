@@ -1,8 +1,9 @@
 from openreview.apps.tools.testing import BaseTestCase
 
 from django.contrib.auth.models import AnonymousUser
+from django.core import management
 from django.db import IntegrityError
-from openreview.apps.main.models import Vote
+from openreview.apps.main.models import Vote, Review, PaperScore, cast_votes
 from openreview.apps.tools.testing import create_test_review, create_test_user, create_test_vote
 
 __all__ = ["TestVote"]
@@ -20,6 +21,80 @@ class TestVote(BaseTestCase):
         vote = Vote(review=review, voter=user)
         self.assertRaises(IntegrityError, vote.save)
 
+    def test_review_counts(self):
+        review = create_test_review()
+        get = lambda: Review.objects.values_list("n_upvotes", "n_downvotes").get(id=review.id)
+
+        vote = create_test_vote(review=review, vote=1)
+        self.assertEqual((1, 0), get())
+        self.assertEqual((1, 0), (review.n_upvotes, review.n_downvotes))
+
+        vote = Vote.objects.get(id=vote.id)
+        vote.vote = -1
+        vote.save()
+        self.assertEqual((0, 1), get())
+
+        vote.vote = 0
+        vote.save()
+        self.assertEqual((0, 0), get())
+
+        vote.vote = 1
+        vote.save()
+        create_test_vote(review=review, vote=-1)
+        self.assertEqual((1, 1), get())
+
+        vote.delete()
+        self.assertEqual((0, 1), get())
+
+    def test_cast(self):
+        user = create_test_user()
+        review = create_test_review()
+        get = lambda: Review.objects.values_list("n_upvotes", "n_downvotes").get(id=review.id)
+
+        self.assertEqual((0, 1), Vote.cast(user, review, 1))
+        self.assertEqual((1, 0), get())
+
+        self.assertEqual((1, -1), Vote.cast(user, review, -1))
+        self.assertEqual((0, 1), get())
+
+        self.assertEqual((-1, -1), Vote.cast(user, review, -1))
+        self.assertEqual((0, 1), get())
+        self.assertEqual(-1, Vote.objects.get(voter=user, review=review).vote)
+
+    def test_cast_votes(self):
+        user = create_test_user()
+        review1, review2 = create_test_review(), create_test_review()
+        create_test_vote(review=review1, voter=user, vote=-1)
+        get = lambda r: Review.objects.values_list("n_upvotes", "n_downvotes").get(id=r.id)
+
+        result = cast_votes(user, [(review1, 1), (review2, -1), (review2, 1)])
+        self.assertEqual({review1.id: (-1, 1), review2.id: (0, 1)}, result)
+        self.assertEqual((1, 0), get(review1))
+        self.assertEqual((1, 0), get(review2))
+        self.assertEqual((1, 0), (review2.n_upvotes, review2.n_downvotes))
+        self.assertEqual(1, Vote.objects.filter(voter=user, review=review2).count())
+
+        score = PaperScore.objects.get(paper_id=review1.paper_id)
+        self.assertEqual((1, 0), (score.n_upvotes, score.n_downvotes))
+
+        # Unchanged votes do not touch the counters
+        self.assertEqual({review1.id: (1, 1)}, cast_votes(user, [(review1, 1)]))
+        self.assertEqual((1, 0), get(review1))
+
+    def test_update_vote_counts_command(self):
+        review = create_test_review()
+        create_test_vote(review=review, vote=1)
+        create_test_vote(review=review, vote=-1)
+
+        # Bulk updates bypass Vote.save()
+        Vote.objects.filter(review=review).update(vote=1)
+        Review.objects.filter(id=review.id).update(n_upvotes=10)
+
+        management.call_command("update_vote_counts", verbosity=0)
+        review = Review.objects.get(id=review.id)
+        self.assertEqual(2, review.n_upvotes)
+        self.assertEqual(0, review.n_downvotes)
+
     def test_can_delete(self):
         vote = create_test_vote()
         self.assertFalse(vote.can_delete(AnonymousUser()))
@@ -0,0 +1,70 @@
+"""
+Version stamps of papers and reviews, used to answer conditional GET requests (with
+If-None-Match) before anything is loaded from the database.
+
+A stamp is a random token stored in the cache. Writes bump it by deleting it, after
+which a new token is created on first use. Evicted stamps are replaced the same way,
+so a stamp never returns to a previous value and clients never keep outdated pages.
+
+The stamp of a paper changes whenever the paper, one of its reviews or one of their
+votes changes. The stamp of a review only changes with the review or its votes.
+"""
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+
+__all__ = ["get_paper_version_key", "get_review_version_key", "bump_versions", "get_etag"]
+
+# Stamps expire after this many seconds, which only costs a full response
+VERSION_TIMEOUT = 7 * 24 * 60 * 60
+
+
+def get_paper_version_key(paper_id):
+    return "paper-version-{paper_id}".format(paper_id=paper_id)
+
+
+def get_review_version_key(review_id):
+    return "review-version-{review_id}".format(review_id=review_id)
+
+
+def bump_versions(paper_ids=(), review_ids=()):
+    keys = [get_paper_version_key(paper_id) for paper_id in paper_ids]
+    keys += [get_review_version_key(review_id) for review_id in review_ids]
+    cache.delete_many(keys)
+
+
+def get_versions(keys):
+    """
+    @return: current stamps of `keys`, creating them if needed
+    @rtype: list
+    """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = uuid.uuid4().hex
+            if not cache.add(key, version, VERSION_TIMEOUT):
+                # Created concurrently
+                version = cache.get(key) or version
+            versions[key] = version
+    return [versions[key] for key in keys]
+
+
+def get_etag(request, *keys, csrf_token=False):
+    """
+    Returns an ETag for a response which only changes if one of the stamps of `keys` is
+    bumped. Responses differ per user, url (GET parameters) and requested format, so
+    these are part of the ETag too.
+
+    @param csrf_token: whether the response embeds the CSRF token, which is then part of
+                       the ETag. A new token is set as cookie along with the response, so
+                       the next request of the client has the same ETag.
+    @type csrf_token: bool
+    @rtype: str
+    """
+    parts = [str(request.user.id), request.get_full_path(), request.META.get("HTTP_ACCEPT", "")]
+    if csrf_token:
+        parts.append(get_token(request) or "")
+    parts += get_versions(keys)
+    return hashlib.md5("\n".join(parts).encode("utf-8")).hexdigest()
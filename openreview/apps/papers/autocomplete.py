@@ -0,0 +1,263 @@
+"""
+In-memory autocomplete of paper titles and author names, so typeahead requests do
+not hit the search backend.
+
+Every prefix of every word of a title or name is stored in a sorted array, along
+with the most popular entries containing a word with that prefix, so a lookup is a
+binary search. The index is loaded from a snapshot (see settings.AUTOCOMPLETE_SNAPSHOT)
+or built from the database in a background thread, kept up to date by signals of
+this process, and rebuilt every REBUILD_INTERVAL seconds to pick up changes made
+elsewhere (or in bulk, without signals). Until the first build finishes, lookups find nothing.
+"""
+from bisect import bisect_left, insort
+from collections import defaultdict
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from openreview.apps.main.models import Paper, Author, Review
+
+__all__ = ["PrefixIndex", "get_index"]
+
+PAPER, AUTHOR = "paper", "author"
+
+# Prefixes longer than this are not indexed; longer queries are matched by filtering
+MAX_PREFIX = 20
+
+TOP_K = 10
+
+# Number of entries kept per prefix. More than TOP_K, so that removing entries rarely
+# leaves a prefix with too few.
+STORED_K = 4 * TOP_K
+
+REBUILD_INTERVAL = 60 * 60
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def get_prefixes(label):
+    """Returns the (distinct) indexed prefixes of the words of `label`."""
+    return {word[:i] for word in normalize(label).split(" ") for i in range(1, min(len(word), MAX_PREFIX) + 1)}
+
+
+class PrefixIndex:
+    def __init__(self):
+        # Sorted prefixes, and for each prefix its most popular entries as sorted
+        # (-popularity, kind, id) tuples, most popular first
+        self.prefixes = []
+        self.tops = []
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.built = time.time()
+
+    @classmethod
+    def build(cls, entries):
+        """
+        Builds an index of `entries` at once, which is much faster than adding them
+        one by one.
+
+        @param entries: (kind, id, label, popularity) tuples
+        @type entries: iterable
+        """
+        index = cls()
+        for kind, id, label, popularity in entries:
+            index.entries[(kind, id)] = (label, popularity)
+
+        # Adding the most popular entries first only appends to the prefixes
+        tops = defaultdict(list)
+        for (kind, id), (label, popularity) in sorted(index.entries.items(), key=lambda e: -e[1][1]):
+            item = (-popularity, kind, id)
+            for prefix in get_prefixes(label):
+                top = tops[prefix]
+                if len(top) < STORED_K:
+                    top.append(item)
+
+        index.prefixes = sorted(tops)
+        index.tops = [tops.pop(prefix) for prefix in index.prefixes]
+        return index
+
+    @classmethod
+    def from_database(cls):
+        """Builds an index of all papers (by number of reviews) and authors (by number of papers)."""
+        papers = Paper.objects.values_list("id", "title", "n_reviews")
+        authors = Author.objects.annotate(n_papers=Count("paper")).values_list("id", "name", "n_papers")
+
+        return cls.build(
+            [(PAPER, id, title, n_reviews) for id, title, n_reviews in papers.iterator()] +
+            [(AUTHOR, id, name, n_papers) for id, name, n_papers in authors.iterator()]
+        )
+
+    @classmethod
+    def load(cls, fp):
+        """Builds an index from a snapshot written by dump()."""
+        return cls.build(json.loads(line) for line in fp)
+
+    def dump(self, fp):
+        with self.lock:
+            entries = sorted(self.entries.items(), key=lambda e: e[1][1], reverse=True)
+
+        for (kind, id), (label, popularity) in entries:
+            fp.write(json.dumps([kind, id, label, popularity]) + "\n")
+
+    def _get_top(self, prefix, create=False):
+        """Returns the list of most popular entries of `prefix`, or None if it is not indexed."""
+        i = bisect_left(self.prefixes, prefix)
+        if i < len(self.prefixes) and self.prefixes[i] == prefix:
+            return self.tops[i]
+        if not create:
+            return None
+
+        self.prefixes.insert(i, prefix)
+        self.tops.insert(i, [])
+        return self.tops[i]
+
+    def _remove(self, kind, id):
+        label, popularity = self.entries.pop((kind, id))
+        item = (-popularity, kind, id)
+        for prefix in get_prefixes(label):
+            top = self._get_top(prefix)
+            if top is not None and item in top:
+                top.remove(item)
+
+    def add(self, kind, id, label, popularity=0):
+        """Adds an entry, or updates it if it exists."""
+        with self.lock:
+            if (kind, id) in self.entries:
+                self._remove(kind, id)
+
+            self.entries[(kind, id)] = (label, popularity)
+            item = (-popularity, kind, id)
+            for prefix in get_prefixes(label):
+                top = self._get_top(prefix, create=True)
+                if len(top) < STORED_K or item < top[-1]:
+                    insort(top, item)
+                    del top[STORED_K:]
+
+    def remove(self, kind, id):
+        with self.lock:
+            if (kind, id) in self.entries:
+                self._remove(kind, id)
+
+    def add_popularity(self, kind, id, delta):
+        """Adds `delta` to the popularity of an entry, if it exists."""
+        entry = self.entries.get((kind, id))
+        if entry is not None:
+            label, popularity = entry
+            self.add(kind, id, label, popularity + delta)
+
+    def get_popularity(self, kind, id, default=0):
+        entry = self.entries.get((kind, id))
+        return default if entry is None else entry[1]
+
+    def search(self, query, k=TOP_K):
+        """
+        @return: the `k` most popular entries with a word starting with `query`, as
+                 (kind, id, label) tuples
+        @rtype: list
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        # Every word of the query starts a word of the results, so the entries of the
+        # longest one are a (most selective) superset of them
+        words = query.split(" ")
+        prefix = max(words, key=len)[:MAX_PREFIX]
+        exact = len(words) == 1 and len(query) <= MAX_PREFIX
+
+        with self.lock:
+            results = []
+            for _, kind, id in self._get_top(prefix) or ():
+                label = self.entries[(kind, id)][0]
+                if exact or " " + query in " " + normalize(label):
+                    results.append((kind, id, label))
+                    if len(results) == k:
+                        break
+            return results
+
+
+_index = None
+_index_lock = threading.Lock()
+_building = False
+
+
+def _build():
+    global _index, _building
+    try:
+        snapshot = getattr(settings, "AUTOCOMPLETE_SNAPSHOT", None)
+        if _index is None and snapshot and os.path.exists(snapshot):
+            with open(snapshot) as fp:
+                _index = PrefixIndex.load(fp)
+        else:
+            _index = PrefixIndex.from_database()
+    finally:
+        _building = False
+        connection.close()
+
+
+def get_index():
+    """
+    Returns the index of this process. It is (re)built in the background when it is
+    missing or outdated, so that requests never wait for it.
+
+    @return: the index, or None if it is not built yet
+    @rtype: PrefixIndex
+    """
+    global _building
+
+    with _index_lock:
+        outdated = _index is None or time.time() - _index.built > REBUILD_INTERVAL
+        if outdated and not _building:
+            _building = True
+            threading.Thread(target=_build, daemon=True).start()
+
+        return _index
+
+
+@receiver(post_save, sender=Paper)
+def paper_saved(sender, instance, created, **kwargs):
+    # n_reviews is maintained in the database, so our copy may be outdated
+    if _index is not None:
+        popularity = instance.n_reviews if created else _index.get_popularity(PAPER, instance.id)
+        _index.add(PAPER, instance.id, instance.title, popularity)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    if _index is not None and created and instance.is_review:
+        _index.add_popularity(PAPER, instance.paper_id, 1)
+
+
+@receiver(m2m_changed, sender=Paper.authors.through)
+def authors_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if _index is None or action not in ("post_add", "post_remove"):
+        return
+
+    delta = 1 if action == "post_add" else -1
+    if reverse:
+        _index.add_popularity(AUTHOR, instance.id, delta * len(pk_set))
+    else:
+        for author_id in pk_set:
+            _index.add_popularity(AUTHOR, author_id, delta)
+
+
+@receiver(post_save, sender=Author)
+def author_saved(sender, instance, **kwargs):
+    if _index is not None:
+        _index.add(AUTHOR, instance.id, instance.name, _index.get_popularity(AUTHOR, instance.id))
+
+
+@receiver(post_delete, sender=Paper)
+@receiver(post_delete, sender=Author)
+def deleted(sender, instance, **kwargs):
+    if _index is not None:
+        _index.remove(PAPER if sender is Paper else AUTHOR, instance.id)
@@ -0,0 +1,121 @@
+"""
+A minimal thread-safe HTTP connection pool. Connections to the same host are kept
+alive and shared between requests (and threads), and failed requests are retried with
+exponential backoff.
+"""
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from io import BytesIO
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit, urljoin
+import socket
+import threading
+import time
+
+__all__ = ["ConnectionPool", "pool", "urlopen"]
+
+# Responses with these statuses are retried
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+
+class ConnectionPool:
+    def __init__(self, timeout=10, retries=3, backoff=0.5, max_redirects=5, max_idle=4):
+        """
+        @param timeout: timeout of connecting and reading, in seconds
+        @param retries: number of times a failed request is retried
+        @param backoff: seconds to wait before the first retry, doubled for each next one
+        @param max_idle: maximum number of idle connections kept per host
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_redirects = max_redirects
+        self.max_idle = max_idle
+
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _get_connection(self, scheme, netloc, timeout):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+
+        connection_class = HTTPSConnection if scheme == "https" else HTTPConnection
+        return connection_class(netloc, timeout=timeout)
+
+    def _release(self, scheme, netloc, connection):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_idle:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def clear(self):
+        """Closes all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connection in (c for connections in idle.values() for c in connections):
+            connection.close()
+
+    def _request(self, url, timeout):
+        """Makes a single request, returns (status, headers, body)."""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        connection = self._get_connection(parts.scheme, parts.netloc, timeout)
+        try:
+            connection.request("GET", path, headers={"Connection": "keep-alive"})
+            response = connection.getresponse()
+            body = response.read()
+        except:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(parts.scheme, parts.netloc, connection)
+
+        return response.status, response.msg, body
+
+    def urlopen(self, url, timeout=None):
+        """
+        Fetches `url`, following redirects. Behaves like urllib's urlopen: it returns a
+        file-like object and raises HTTPError or URLError if fetching failed.
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        for redirect in range(self.max_redirects + 1):
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    time.sleep(self.backoff * 2 ** (attempt - 1))
+
+                try:
+                    status, headers, body = self._request(url, timeout)
+                except (HTTPException, OSError) as e:
+                    if attempt == self.retries:
+                        raise e if isinstance(e, socket.timeout) else URLError(e)
+                    continue
+
+                if status not in RETRY_STATUSES or attempt == self.retries:
+                    break
+
+            if status in REDIRECT_STATUSES and headers.get("Location"):
+                url = urljoin(url, headers["Location"])
+                continue
+
+            if status >= 400:
+                raise HTTPError(url, status, "HTTP Error %d" % status, headers, BytesIO(body))
+
+            return BytesIO(body)
+
+        raise URLError("Too many redirects while fetching {url}".format(url=url))
+
+
+# Pool shared by all scrapers
+pool = ConnectionPool()
+urlopen = pool.urlopen
@@ -60,7 +60,8 @@ class ArXivForm(forms.Form):
     def clean_arxiv_id(self):
         arid = self.cleaned_data['arxiv_id']
         try:
-            scrapers.Controller(scrapers.ArXivScraper).run(arid)
+            # Keep result, so save() does not need to scrape again if caching fails
+            self.scraped = scrapers.Controller(scrapers.ArXivScraper).run(arid)
             return arid
         except scrapers.ScraperError:
             raise ValidationError("Invalid ArXiv identifier")
@@ -69,7 +70,7 @@ class ArXivForm(forms.Form):
         if not commit:
             raise ValueError("commit=True mandatory")
 
-        data = scrapers.Controller(scrapers.ArXivScraper).run(self.cleaned_data['arxiv_id'])
+        data = dict(self.scraped)
         authors = data.pop('authors')
         categories = data.pop('categories')
         with transaction.atomic():
@@ -0,0 +1,248 @@
+"""
+Bulk import of arXiv metadata dumps. Dumps are streamed, so memory usage does not
+depend on their size. Supported formats:
+
+ - Atom, as returned by the arXiv API (see ArXivScraper)
+ - OAI-PMH, using the `arXiv` metadata format
+ - JSON lines, as in the arXiv metadata snapshot published by arXiv
+
+Records are imported in chunks. Papers are deduplicated on doc_id, and authors,
+keywords and categories are resolved with a few queries per chunk. Records without
+a document identifier or title are skipped.
+"""
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from itertools import islice
+import gzip
+import json
+import re
+
+from django.db import transaction
+
+from openreview.apps.main.models import Paper, Author, Keyword, Category
+from openreview.apps.main.models.paper import get_author_line
+from openreview.apps.main.search import queue_index_update
+from openreview.apps.papers.scrapers import iter_elements
+
+__all__ = ["import_papers", "read_dump", "read_xml", "read_jsonl"]
+
+ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
+OAI_ARXIV = "{http://arxiv.org/OAI/arXiv/}arXiv"
+
+ARXIV_ID_RE = re.compile(r"arxiv\.org/abs/(?P<id>.+?)(v\d+)?$")
+ARXIV_URL = "http://arxiv.org/abs/{doc_id}"
+
+# Number of papers imported per transaction
+CHUNK_SIZE = 1000
+
+# Maximum number of values per `__in` lookup (SQLite allows 999 parameters)
+IN_BATCH_SIZE = 900
+
+
+def _text(element, path, namespaces):
+    found = element.find(path, namespaces)
+    return None if found is None else found.text
+
+
+def parse_atom_entry(entry):
+    ns = {"atom": "http://www.w3.org/2005/Atom"}
+    url = _text(entry, "atom:id", ns)
+    published = _text(entry, "atom:published", ns)
+
+    match = url and ARXIV_ID_RE.search(url)
+    return {
+        "doc_id": match and match.group("id"),
+        "urls": url,
+        "title": _text(entry, "atom:title", ns),
+        "abstract": _text(entry, "atom:summary", ns),
+        "authors": [name.text for name in entry.iterfind("atom:author/atom:name", ns)],
+        "categories": [c.get("term") for c in entry.iterfind("atom:category", ns)],
+        "publish_date": published and datetime.strptime(published, "%Y-%m-%dT%H:%M:%SZ").date(),
+    }
+
+
+def parse_oai_arxiv(record):
+    ns = {"arxiv": "http://arxiv.org/OAI/arXiv/"}
+    doc_id = _text(record, "arxiv:id", ns)
+    created = _text(record, "arxiv:created", ns)
+
+    authors = []
+    for author in record.iterfind("arxiv:authors/arxiv:author", ns):
+        names = (_text(author, "arxiv:forenames", ns), _text(author, "arxiv:keyname", ns),
+                 _text(author, "arxiv:suffix", ns))
+        authors.append(" ".join(filter(None, names)))
+
+    return {
+        "doc_id": doc_id,
+        "urls": ARXIV_URL.format(doc_id=doc_id),
+        "title": _text(record, "arxiv:title", ns),
+        "abstract": _text(record, "arxiv:abstract", ns),
+        "authors": authors,
+        "categories": (_text(record, "arxiv:categories", ns) or "").split(),
+        "publish_date": created and datetime.strptime(created, "%Y-%m-%d").date(),
+    }
+
+
+def parse_json(record):
+    if record.get("authors_parsed"):
+        authors = [" ".join(filter(None, (first, last, suffix)))
+                   for last, first, suffix in record["authors_parsed"]]
+    else:
+        authors = [a.strip() for a in re.split(r",| and ", record.get("authors") or "") if a.strip()]
+
+    publish_date = None
+    if record.get("versions"):
+        publish_date = parsedate_to_datetime(record["versions"][0]["created"]).date()
+    elif record.get("update_date"):
+        publish_date = datetime.strptime(record["update_date"], "%Y-%m-%d").date()
+
+    return {
+        "doc_id": record.get("id"),
+        "urls": ARXIV_URL.format(doc_id=record.get("id")),
+        "title": record.get("title"),
+        "abstract": record.get("abstract"),
+        "authors": authors,
+        "categories": (record.get("categories") or "").split(),
+        "keywords": record.get("keywords") or [],
+        "publish_date": publish_date,
+    }
+
+
+def read_xml(fp):
+    """
+    Yields records of Atom feeds and OAI-PMH responses in `fp`. Parsed elements are
+    freed immediately, so the tree never grows beyond a single record.
+    """
+    parsers = {ATOM_ENTRY: parse_atom_entry, OAI_ARXIV: parse_oai_arxiv}
+    for element in iter_elements(fp, tuple(parsers)):
+        yield parsers[element.tag](element)
+
+
+def read_jsonl(fp):
+    """Yields records of the JSON lines in `fp`."""
+    for line in fp:
+        line = line.strip()
+        if line:
+            yield parse_json(json.loads(line.decode("utf-8") if isinstance(line, bytes) else line))
+
+
+def read_dump(path):
+    """
+    Yields records of the dump at `path`, which may be gzipped. Files ending in
+    .json or .jsonl (before .gz) are read as JSON lines, all others as XML.
+    """
+    fp = gzip.open(path) if path.endswith(".gz") else open(path, "rb")
+    name = path[:-3] if path.endswith(".gz") else path
+
+    with fp:
+        reader = read_jsonl if name.endswith((".json", ".jsonl")) else read_xml
+        for record in reader(fp):
+            yield record
+
+
+def _values_in(queryset, field, values, *fields):
+    """
+    Returns values_list(*fields) of the objects in `queryset` whose `field` is one of
+    `values`, querying at most IN_BATCH_SIZE values at a time.
+
+    @rtype: list
+    """
+    values = list(values)
+    result = []
+    for i in range(0, len(values), IN_BATCH_SIZE):
+        batch = values[i:i + IN_BATCH_SIZE]
+        result.extend(queryset.filter(**{field + "__in": batch}).values_list(*fields))
+    return result
+
+
+def _resolve(model, field, values):
+    """
+    Returns a mapping of `values` to ids of `model` objects having them as `field`,
+    creating the ones which don't exist yet.
+
+    @rtype: dict
+    """
+    values = set(values)
+    if not values:
+        return {}
+
+    existing = dict(_values_in(model.objects.all(), field, values, field, "id"))
+    missing = values - set(existing)
+    if missing:
+        model.objects.bulk_create([model(**{field: value}) for value in missing])
+        created = dict(_values_in(model.objects.all(), field, missing, field, "id"))
+        queue_index_update(model, created.values())
+        existing.update(created)
+    return existing
+
+
+def _import_chunk(records, categories):
+    # Deduplicate within the chunk, and against papers imported before
+    records = {r["doc_id"]: r for r in records if r.get("doc_id") and r.get("title")}
+    existing = _values_in(Paper.objects.all(), "doc_id", records, "doc_id")
+    for doc_id, in existing:
+        del records[doc_id]
+
+    if not records:
+        return 0
+
+    with transaction.atomic():
+        authors = _resolve(Author, "name", (a for r in records.values() for a in r["authors"]))
+        keywords = _resolve(Keyword, "label", (k for r in records.values() for k in r.get("keywords", ())))
+
+        # Bypasses Paper.save(), so we need to fill all fields it would have filled
+        papers = []
+        for record in records.values():
+            paper = Paper(
+                doc_id=record["doc_id"], title=record["title"], abstract=record["abstract"] or "",
+                urls=record.get("urls"), publish_date=record.get("publish_date"), publisher="ArXiv",
+                author_line=get_author_line(record["authors"])
+            )
+            paper.render_abstract()
+            papers.append(paper)
+        Paper.objects.bulk_create(papers)
+
+        paper_ids = dict(_values_in(Paper.objects.all(), "doc_id", records, "doc_id", "id"))
+        queue_index_update(Paper, paper_ids.values())
+
+        # Add relations in bulk. m2m_changed is not sent, but all fields it maintains
+        # are already set (author_line) or default to outdated (related_outdated).
+        relations = (
+            (Paper.authors.through, "author_id", authors, "authors"),
+            (Paper.keywords.through, "keyword_id", keywords, "keywords"),
+            (Paper.categories.through, "category_id", categories, "categories"),
+        )
+
+        for through, column, ids, key in relations:
+            through.objects.bulk_create([
+                through(**{"paper_id": paper_ids[doc_id], column: ids[value]})
+                for doc_id, record in records.items()
+                for value in set(record.get(key, ())) if value in ids
+            ])
+
+    return len(records)
+
+
+def import_papers(records, chunk_size=CHUNK_SIZE):
+    """
+    Imports the papers described by `records` in chunks of `chunk_size`. Records are
+    dicts as yielded by read_dump(). Papers whose doc_id already exists are skipped,
+    as are records without a doc_id or title, and categories unknown to OpenReview.
+
+    Imported papers and authors are queued for indexing, use `manage.py flush_index_queue`.
+
+    @type records: iterable
+    @return: (number of imported papers, number of skipped records)
+    @rtype: tuple
+    """
+    categories = dict(Category.objects.exclude(arxiv_code=None).values_list("arxiv_code", "id"))
+
+    n_imported, n_read = 0, 0
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return n_imported, n_read - n_imported
+
+        n_read += len(chunk)
+        n_imported += _import_chunk(chunk, categories)
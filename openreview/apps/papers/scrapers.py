@@ -1,27 +1,126 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain, islice
 from django.core.cache import cache
+from django.db import connection
 
-from urllib.request import urlopen, HTTPError
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote
+from collections import OrderedDict
 from datetime import datetime
 from openreview.apps.main.models import Category
+from openreview.apps.papers.connections import urlopen
 
 import lxml.html
 import lxml.etree
 import hashlib
+import json
+import re
+import socket
+import threading
+import time
 
 
 class ScraperError(BaseException):
         pass
 
 
+class InvalidDocument(ScraperError):
+    """Raised if a document does not exist or cannot be parsed. Cached for a while."""
+    pass
+
+
+# Futures of documents currently being fetched by any Controller in this process, by
+# cache key. Used to make sure concurrent requests for a document result in only one
+# request to the scraped site.
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+# Results are refreshed (in the background) after TTL seconds. Until STALE_TTL seconds
+# later, the old result is used in the meantime. Invalid documents are retried after
+# NEGATIVE_TTL seconds.
+TTL = 24 * 60 * 60
+STALE_TTL = 30 * 24 * 60 * 60
+NEGATIVE_TTL = 60 * 60
+
+# Maximum duration of a background refresh, in seconds
+REFRESH_TIMEOUT = 5 * 60
+
+ATOM = {"atom": "http://www.w3.org/2005/Atom"}
+
+# Scrapers by identifier scheme, see register()
+SCRAPERS = OrderedDict()
+
+
+def register(scraper):
+    """Class decorator registering `scraper` for its identifier scheme."""
+    SCRAPERS[scraper.scheme] = scraper
+    return scraper
+
+
+def get_scraper(identifier):
+    """
+    Finds the scraper for `identifier`, which is either prefixed by a scheme (such as
+    `doi:10.1002/0470841559.ch1`) or a bare id recognised by one of the scrapers.
+
+    @raises InvalidDocument: if no scraper recognises `identifier`
+    @return: (scraper, doc_id) tuple
+    @rtype: tuple
+    """
+    identifier = identifier.strip()
+    scheme, sep, doc_id = identifier.partition(":")
+    if sep and scheme.lower() in SCRAPERS:
+        return SCRAPERS[scheme.lower()], doc_id.strip()
+
+    for scraper in SCRAPERS.values():
+        if scraper.id_re is not None and scraper.id_re.match(identifier):
+            return scraper, identifier
+
+    raise InvalidDocument("{identifier} is not a known document identifier".format(**locals()))
+
+
+def iter_elements(fp, tags):
+    """
+    Parses the XML document `fp` incrementally, yielding elements having one of `tags`
+    as soon as they are complete. Elements are freed once the consumer continues,
+    including earlier siblings of (ancestors of) them, so the tree never grows beyond
+    a single element.
+    """
+    for _, element in lxml.etree.iterparse(fp, events=("end",), tag=tags):
+        yield element
+
+        element.clear()
+        for node in chain([element], element.iterancestors()):
+            while node.getprevious() is not None:
+                del node.getparent()[0]
+
+
 class Controller:
-    def __init__(self, scraper, caching=True):
+    # Maximum number of concurrent requests made by run_many()
+    max_workers = 4
+
+    def __init__(self, scraper, caching=True, ttl=TTL, stale_ttl=STALE_TTL, negative_ttl=NEGATIVE_TTL):
         self.scraper = scraper
-        self.scraper_name = scraper.__class__.__name__
+        self.scraper_name = getattr(scraper, "__name__", scraper.__class__.__name__)
         self.caching = caching
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+
+    @classmethod
+    def for_identifier(cls, identifier, **kwargs):
+        """
+        Returns a Controller for the scraper registered for `identifier`, see get_scraper().
+
+        @return: (controller, doc_id) tuple
+        @rtype: tuple
+        """
+        scraper, doc_id = get_scraper(identifier)
+        return cls(scraper, **kwargs), doc_id
 
     def get_cache_key(self, doc_id):
-        key_string = "{scraper}-res-{id}".format(scraper=self.scraper_name, id=doc_id)
-        
+        key_string = "{scraper}-{version}-res-{id}".format(
+            scraper=self.scraper_name, version=self.scraper.cache_version, id=doc_id)
+
         # Hash the key_string, because special characters (i.e. non-alphanumeric characters)
         # cannot be used in a MemcachedKey.
         # Also, this ensures the key is well under the maximum length (250 characters).
@@ -29,59 +128,387 @@ class Controller:
         return key_hash
 
     def run(self, doc_id):
-        doc_id = doc_id.strip()
-        
-        url = self.scraper.get_url(doc_id)
+        result = self.run_many([doc_id])[self.scraper.normalize(doc_id)]
+        if isinstance(result, ScraperError):
+            raise result
+        return result
 
-        if self.caching and cache.get(self.get_cache_key(doc_id)):
-            return cache.get(self.get_cache_key(doc_id))
-        else:
-            try:
-                doc = self.scraper.get_doc(url)
-            except self.scraper.fetching_errors:
-                raise ScraperError("An exception occurred while fetching {doc_id}".format(**locals()))
+    def run_many(self, doc_ids):
+        """
+        Scrapes all documents in `doc_ids`. Documents are fetched in batches (if the
+        scraper supports it) by at most `max_workers` concurrent requests. Documents
+        which are being fetched by another thread already are not fetched again.
+
+        Cached results older than `ttl` are returned immediately, while they are
+        refreshed in the background.
 
+        @return: dictionary mapping (normalized) ids to results, or to a ScraperError
+                 if the document could not be scraped
+        @rtype: dict
+        """
+        doc_ids = list(dict.fromkeys(map(self.scraper.normalize, doc_ids)))
+        if not self.caching:
+            return self._fetch_and_store(doc_ids)
+
+        keys = {doc_id: self.get_cache_key(doc_id) for doc_id in doc_ids}
+        cached = cache.get_many(list(keys.values()))
+
+        results, stale = {}, []
+        for doc_id, key in keys.items():
+            entry = cached.get(key)
+            if entry is None:
+                continue
+            elif entry["error"] is not None:
+                results[doc_id] = InvalidDocument(entry["error"])
+            else:
+                results[doc_id] = entry["result"]
+                if time.time() - entry["time"] > self.ttl:
+                    stale.append(doc_id)
+
+        if stale:
+            self._refresh(stale)
+
+        results.update(self._fetch_and_store([doc_id for doc_id in doc_ids if doc_id not in results]))
+        return results
+
+    def _refresh(self, doc_ids):
+        """Refreshes `doc_ids` in a background thread, unless they are being refreshed already."""
+        # cache.add() is atomic, which makes sure only one process refreshes a document
+        locks = {doc_id: self.get_cache_key(doc_id) + "-refresh" for doc_id in doc_ids}
+        locks = {doc_id: lock for doc_id, lock in locks.items() if cache.add(lock, True, REFRESH_TIMEOUT)}
+        if not locks:
+            return
+
+        def refresh():
             try:
-                result = dict(self.scraper.parse(doc))
-            except self.scraper.parsing_errors:
-                raise ScraperError("An exception occurred while parsing {doc_id}".format(**locals()))
+                self._fetch_and_store(list(locks))
+            finally:
+                cache.delete_many(list(locks.values()))
+                connection.close()
+
+        threading.Thread(target=refresh, daemon=True).start()
 
-            result.update({"doc_id": doc_id})
+    def _store(self, results):
+        now = time.time()
+        valid, invalid = {}, {}
+        for doc_id, result in results.items():
+            if not isinstance(result, ScraperError):
+                valid[self.get_cache_key(doc_id)] = {"time": now, "result": result, "error": None}
+            elif isinstance(result, InvalidDocument):
+                invalid[self.get_cache_key(doc_id)] = {"time": now, "result": None, "error": str(result)}
 
+        # Other errors (such as timeouts) are likely to be temporary, and are not cached
+        if valid:
+            cache.set_many(valid, self.ttl + self.stale_ttl)
+        if invalid:
+            cache.set_many(invalid, self.negative_ttl)
+
+    def _fetch_and_store(self, doc_ids):
+        keys = {doc_id: self.get_cache_key(doc_id) for doc_id in doc_ids}
+
+        # Claim documents which are not yet being fetched, wait for the others
+        owned, waiting = [], {}
+        with _in_flight_lock:
+            for doc_id in doc_ids:
+                if keys[doc_id] in _in_flight:
+                    waiting[doc_id] = _in_flight[keys[doc_id]]
+                else:
+                    _in_flight[keys[doc_id]] = Future()
+                    owned.append(doc_id)
+
+        fetched = {}
+        try:
+            fetched = self._fetch_many(owned)
             if self.caching:
-                cache.set(self.get_cache_key(doc_id), result)
-            return result
+                self._store(fetched)
+        finally:
+            with _in_flight_lock:
+                for doc_id in owned:
+                    error = ScraperError("An exception occurred while fetching {doc_id}".format(**locals()))
+                    _in_flight.pop(keys[doc_id]).set_result(fetched.get(doc_id, error))
+
+        fetched.update((doc_id, future.result()) for doc_id, future in waiting.items())
+        return fetched
+
+    def _fetch_many(self, doc_ids):
+        if not doc_ids:
+            return {}
+
+        size = self.scraper.batch_size if self.scraper.batch_url else 1
+        batches = [doc_ids[i:i+size] for i in range(0, len(doc_ids), size)]
+
+        raw = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+            for results in pool.map(self._fetch, batches):
+                raw.update(results)
+
+        # Postprocessing may query the database, which should happen in this thread
+        results = {doc_id: r for doc_id, r in raw.items() if not isinstance(r, ScraperError)}
+        results = dict(self.scraper.postprocess(results))
+        results.update((doc_id, r) for doc_id, r in raw.items() if isinstance(r, ScraperError))
+
+        for doc_id, result in results.items():
+            if not isinstance(result, ScraperError):
+                result.update({"doc_id": doc_id})
+        return results
+
+    def _fetch(self, doc_ids):
+        """Fetches and parses `doc_ids`. Does not touch the database, as it runs in a worker."""
+        if len(doc_ids) == 1:
+            url = self.scraper.get_url(doc_ids[0])
+        else:
+            url = self.scraper.get_batch_url(doc_ids)
+
+        try:
+            doc = self.scraper.get_doc(url)
+        except self.scraper.fetching_errors as e:
+            # A 404 means the documents do not exist, other errors are likely temporary
+            if getattr(e, "code", None) != 404:
+                return {doc_id: ScraperError("An exception occurred while fetching {doc_id}".format(**locals()))
+                        for doc_id in doc_ids}
+            doc = None
+
+        results, complete = {}, True
+        try:
+            documents = self.scraper.split(doc) if doc is not None else ()
+            if len(doc_ids) == 1:
+                # A single document is identified by the requested id
+                documents = [(doc_ids[0], d) for _, d in islice(documents, 1)]
+
+            for doc_id, document in documents:
+                # Documents which were not requested are ignored
+                requested = [d for d in self.scraper.match(self.scraper.normalize(doc_id), doc_ids) if d not in results]
+                if not requested:
+                    continue
+
+                try:
+                    result = dict(self.scraper.parse(document))
+                except self.scraper.parsing_errors:
+                    result = InvalidDocument("An exception occurred while parsing {doc_id}".format(**locals()))
+
+                for doc_id in requested:
+                    results[doc_id] = result if isinstance(result, ScraperError) else dict(result)
+        except self.scraper.parsing_errors:
+            # The response is truncated or malformed, which is likely temporary
+            complete = False
+
+        for doc_id in doc_ids:
+            if doc_id in results:
+                continue
+            elif complete:
+                results[doc_id] = InvalidDocument("{doc_id} was not found".format(**locals()))
+            else:
+                results[doc_id] = ScraperError("An exception occurred while fetching {doc_id}".format(**locals()))
+
+        return results
 
 
 class Scraper:
-    scarper_url = None
+    # Identifier scheme (see register()), and regex matching bare ids of this scheme
+    scheme = None
+    id_re = None
+
+    scraper_url = None
     parser = lxml.html.parse
 
-    fetching_errors = HTTPError
+    # Url to fetch multiple documents at once, formatted with a comma separated list of
+    # `doc_ids` and their number `n`. Scrapers supporting it must override split().
+    batch_url = None
+    batch_size = 1
+
+    # Timeout of requests, in seconds
+    timeout = 10
+
+    # Increase when changing the results of parse(), to invalidate cached results
+    cache_version = 1
+
+    fetching_errors = (HTTPError, URLError, socket.timeout)
     parsing_errors = (lxml.etree.LxmlError, IndexError)
 
+    @classmethod
+    def normalize(cls, doc_id):
+        """Returns the canonical form of `doc_id`, used to cache and match documents."""
+        return doc_id.strip()
+
+    @classmethod
+    def match(cls, doc_id, doc_ids):
+        """
+        Returns the requested (normalized) ids in `doc_ids` which the document
+        identified as `doc_id` by split() answers.
+
+        @rtype: list
+        """
+        return [doc_id] if doc_id in doc_ids else []
+
     @classmethod
     def get_url(cls, doc_id):
         return cls.scraper_url.format(doc_id=doc_id)
 
+    @classmethod
+    def get_batch_url(cls, doc_ids):
+        return cls.batch_url.format(doc_ids=",".join(doc_ids), n=len(doc_ids))
+
     @classmethod
     def get_doc(cls, url):
-        return cls.parser(urlopen(url)).getroot()
+        return cls.parser(urlopen(url, timeout=cls.timeout)).getroot()
+
+    @classmethod
+    def split(cls, doc):
+        """
+        Splits a response into (doc_id, document) tuples. By default, a response
+        contains a single document.
+        """
+        yield None, doc
 
     @classmethod
     def parse(cls, doc):
-        raise NotImplemented
+        raise NotImplementedError
+
+    @classmethod
+    def postprocess(cls, results):
+        """
+        Processes parsed documents in bulk, after fetching. Unlike parse(), this is
+        allowed to query the database.
+
+        @param results: dictionary mapping ids to results
+        @return: iterable of (id, result) tuples
+        """
+        return results.items()
 
 
+@register
 class ArXivScraper(Scraper):
+    scheme = "arxiv"
+    id_re = re.compile(r"^(\d{4}\.\d{4,5}|[a-z\-]+(\.[A-Z]{2})?/\d{7})(v\d+)?$")
+
     scraper_url = "http://export.arxiv.org/api/query?search_query=id:{doc_id}&start=0&max_results=1"
+    batch_url = "http://export.arxiv.org/api/query?id_list={doc_ids}&start=0&max_results={n}"
+    batch_size = 100
+
+    url_re = re.compile(r"arxiv\.org/abs/(?P<id>.+)$")
+    version_re = re.compile(r"v\d+$")
+    subject_class_re = re.compile(r"\.[A-Za-z\-]+/")
+
+    # Selectors are compiled once, instead of on every call
+    entry_tag = "{http://www.w3.org/2005/Atom}entry"
+    select_id = lxml.etree.XPath("atom:id", namespaces=ATOM)
+    select_title = lxml.etree.XPath("atom:title", namespaces=ATOM)
+    select_summary = lxml.etree.XPath("atom:summary", namespaces=ATOM)
+    select_authors = lxml.etree.XPath("atom:author/atom:name", namespaces=ATOM)
+    select_published = lxml.etree.XPath("atom:published", namespaces=ATOM)
+    select_categories = lxml.etree.XPath("atom:category/@term", namespaces=ATOM)
+
+    @classmethod
+    def get_doc(cls, url):
+        # The response is parsed while being split into entries, see split()
+        return urlopen(url, timeout=cls.timeout)
+
+    @classmethod
+    def split(cls, doc):
+        # Entries are identified by their versioned id, such as 1306.3879v1
+        for entry in iter_elements(doc, cls.entry_tag):
+            match = cls.url_re.search(cls.select_id(entry)[0].text)
+            if match is not None:
+                yield match.group("id"), entry
+
+    @classmethod
+    def split_version(cls, doc_id):
+        """
+        Splits `doc_id` into its id without subject class (arXiv drops it from old-style
+        ids, like math.GT/0309136), and its version (or None).
+
+        @rtype: tuple
+        """
+        version = cls.version_re.search(doc_id)
+        if version is not None:
+            doc_id = doc_id[:version.start()]
+        return cls.subject_class_re.sub("/", doc_id), version and version.group()
+
+    @classmethod
+    def match(cls, doc_id, doc_ids):
+        # Unversioned ids are answered by the latest version
+        base, version = cls.split_version(doc_id)
+        matches = []
+        for requested in doc_ids:
+            requested_base, requested_version = cls.split_version(requested)
+            if requested_base == base and requested_version in (None, version):
+                matches.append(requested)
+        return matches
 
     @classmethod
     def parse(cls, doc):
-        yield "urls", doc.cssselect("entry id")[0].text
-        yield "title", doc.cssselect("entry title")[0].text
-        yield "abstract", doc.cssselect("entry summary")[0].text
-        yield "authors", [x.text for x in doc.cssselect("entry author name")]
+        # `doc` is a single entry, see split()
+        yield "urls", cls.select_id(doc)[0].text
+        yield "title", cls.select_title(doc)[0].text
+        yield "abstract", cls.select_summary(doc)[0].text
+        yield "authors", [x.text for x in cls.select_authors(doc)]
         yield "publisher", "ArXiv"
-        yield "publish_date", datetime.strptime(doc.cssselect("entry published")[0].text, "%Y-%m-%dT%H:%M:%SZ")
-        yield "categories", [c.pk for c in Category.objects.filter(arxiv_code__in=[x.get('term') for x in doc.cssselect("entry category")])]
+        yield "publish_date", datetime.strptime(cls.select_published(doc)[0].text, "%Y-%m-%dT%H:%M:%SZ")
+        yield "categories", [str(term) for term in cls.select_categories(doc)]
+
+    @classmethod
+    def postprocess(cls, results):
+        # Map arXiv codes to categories in a single query
+        codes = {code for result in results.values() for code in result["categories"]}
+        categories = dict(Category.objects.filter(arxiv_code__in=codes).values_list("arxiv_code", "id"))
+
+        for doc_id, result in results.items():
+            result["categories"] = [categories[c] for c in result["categories"] if c in categories]
+            yield doc_id, result
+
+
+@register
+class DOIScraper(Scraper):
+    """Scrapes metadata of DOIs from the Crossref REST API."""
+    scheme = "doi"
+    id_re = re.compile(r"^10\.\d{4,9}/\S+$")
+
+    scraper_url = "https://api.crossref.org/works/{doc_id}"
+    batch_url = "https://api.crossref.org/works?filter={doc_ids}&rows={n}"
+    batch_size = 20
+
+    # Malformed JSON is treated like a failed request, and is not cached
+    fetching_errors = Scraper.fetching_errors + (ValueError,)
+    parsing_errors = (KeyError, IndexError, TypeError, ValueError)
+
+    # Crossref abstracts are JATS XML
+    tag_re = re.compile(r"<[^>]+>")
+
+    @classmethod
+    def normalize(cls, doc_id):
+        # DOIs are case insensitive
+        return doc_id.strip().lower()
+
+    @classmethod
+    def get_url(cls, doc_id):
+        return cls.scraper_url.format(doc_id=quote(doc_id))
+
+    @classmethod
+    def get_batch_url(cls, doc_ids):
+        doi_filter = ",".join("doi:" + doc_id for doc_id in doc_ids)
+        return cls.batch_url.format(doc_ids=quote(doi_filter, safe=":,/"), n=len(doc_ids))
+
+    @classmethod
+    def get_doc(cls, url):
+        return json.loads(urlopen(url, timeout=cls.timeout).read().decode("utf-8"))
+
+    @classmethod
+    def split(cls, doc):
+        # A single work, or a list of works if multiple DOIs were requested
+        message = doc["message"]
+        for work in message.get("items", [message]):
+            yield work["DOI"], work
+
+    @classmethod
+    def parse(cls, doc):
+        date_parts = doc["issued"]["date-parts"][0]
+        date_parts = list(date_parts) + [1] * (3 - len(date_parts))
+
+        yield "urls", doc["URL"]
+        yield "title", doc["title"][0]
+        yield "abstract", " ".join(cls.tag_re.sub(" ", doc.get("abstract", "")).split())
+        yield "authors", [" ".join(filter(None, (a.get("given"), a.get("family"))))
+                          for a in doc.get("author", ())]
+        yield "publisher", doc.get("publisher", "")
+        yield "publish_date", datetime(*date_parts[:3])
+        yield "categories", []
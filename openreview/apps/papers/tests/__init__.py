@@ -4,3 +4,6 @@ from .voting import *
 from .scrapers import *
 from .papers import *
 from .search import *
+from .importer import *
+from .connections import *
+from .autocomplete import *
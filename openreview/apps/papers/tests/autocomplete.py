@@ -0,0 +1,122 @@
+import io
+import json
+
+from django.core.urlresolvers import reverse
+from django.test import Client
+
+from openreview.apps.papers import autocomplete
+from openreview.apps.papers.autocomplete import PrefixIndex, PAPER, AUTHOR
+from openreview.apps.tools.testing import BaseTestCase, create_test_paper, create_test_author, create_test_review
+
+__all__ = ["TestPrefixIndex", "TestAutocompleteView"]
+
+
+class TestPrefixIndex(BaseTestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        self.index.add(PAPER, 1, "Deep learning", 5)
+        self.index.add(PAPER, 2, "Learning to  learn", 10)
+        self.index.add(AUTHOR, 3, "Yann LeCun", 2)
+
+    def test_search(self):
+        self.assertEqual(self.index.search("learn"), [(PAPER, 2, "Learning to  learn"), (PAPER, 1, "Deep learning")])
+        self.assertEqual(self.index.search("DEEP  l"), [(PAPER, 1, "Deep learning")])
+        self.assertEqual(self.index.search("lecun"), [(AUTHOR, 3, "Yann LeCun")])
+        self.assertEqual(self.index.search("learn", k=1), [(PAPER, 2, "Learning to  learn")])
+        self.assertEqual(self.index.search("earn"), [])
+        self.assertEqual(self.index.search(" "), [])
+
+    def test_long_query(self):
+        title = "A title which is longer than the longest indexed prefix"
+        self.index.add(PAPER, 4, title, 1)
+        self.assertEqual(self.index.search(title.lower()), [(PAPER, 4, title)])
+        self.assertEqual(self.index.search("A title which is longer than the shortest"), [])
+
+    def test_update(self):
+        self.index.add(PAPER, 1, "Deep learning", 20)
+        self.assertEqual(self.index.search("learn")[0], (PAPER, 1, "Deep learning"))
+
+        self.index.add(PAPER, 1, "Shallow learning", 20)
+        self.assertEqual(self.index.search("deep"), [])
+        self.assertEqual(self.index.search("shallow"), [(PAPER, 1, "Shallow learning")])
+
+        self.index.remove(PAPER, 2)
+        self.index.remove(PAPER, 2)
+        self.assertEqual(self.index.search("learn"), [(PAPER, 1, "Shallow learning")])
+
+    def test_top_k(self):
+        for i in range(100):
+            self.index.add(PAPER, 10 + i, "Popular paper {i}".format(i=i), i)
+
+        results = self.index.search("pop", k=10)
+        self.assertEqual([id for _, id, _ in results], list(range(109, 99, -1)))
+
+    def test_build(self):
+        index = PrefixIndex.build([(kind, id, label, popularity) for (kind, id), (label, popularity) in self.index.entries.items()])
+        self.assertEqual(index.prefixes, self.index.prefixes)
+        self.assertEqual(index.tops, self.index.tops)
+
+        # Only word starts are indexed
+        self.assertIn("lec", index.prefixes)
+        self.assertNotIn("cun", index.prefixes)
+
+    def test_snapshot(self):
+        fp = io.StringIO()
+        self.index.dump(fp)
+        fp.seek(0)
+
+        index = PrefixIndex.load(fp)
+        self.assertEqual(index.entries, self.index.entries)
+        self.assertEqual(index.search("learn"), self.index.search("learn"))
+
+
+class TestAutocompleteView(BaseTestCase):
+    def setUp(self):
+        self.client = Client()
+        self.url = reverse("autocomplete")
+        autocomplete._index = PrefixIndex.from_database()
+
+    def tearDown(self):
+        autocomplete._index = None
+        autocomplete._building = False
+        super().tearDown()
+
+    def _get(self, query):
+        response = self.client.get(self.url, {"q": query})
+        return json.loads(response.content.decode("utf-8"))["results"]
+
+    def test_autocomplete(self):
+        paper = create_test_paper(title="Autocompleted paper", n_reviews=2)
+        author = create_test_author(name="Autocompleted author")
+        paper.authors.add(author)
+
+        results = self._get("autocompleted")
+        self.assertEqual([(r["type"], r["id"]) for r in results], [("paper", paper.id), ("author", author.id)])
+        self.assertEqual(results[0]["url"], reverse("paper", args=[paper.id]))
+        self.assertEqual(self._get(""), [])
+
+        # Changes are applied to the index of this process
+        paper.title = "Renamed paper"
+        paper.save()
+        new_paper = create_test_paper(title="Autocompleted new paper")
+        self.assertEqual([r["id"] for r in self._get("autocompleted ")], [author.id, new_paper.id])
+        self.assertEqual([r["id"] for r in self._get("renamed")], [paper.id])
+
+        # So are new reviews and authors, which make entries more popular
+        create_test_review(paper=new_paper)
+        create_test_review(paper=new_paper)
+        self.assertEqual([r["id"] for r in self._get("autocompleted ")], [new_paper.id, author.id])
+        create_test_paper().authors.add(author)
+        create_test_paper().authors.add(author)
+        self.assertEqual([r["id"] for r in self._get("autocompleted ")], [author.id, new_paper.id])
+
+        new_paper.delete()
+        self.assertEqual([r["id"] for r in self._get("autocompleted ")], [author.id])
+
+    def test_not_built(self):
+        create_test_paper(title="Autocompleted paper")
+
+        # Requests do not wait for the index to be built
+        autocomplete._index = None
+        autocomplete._building = True
+        self.assertEqual(self._get("autocompleted"), [])
@@ -0,0 +1,80 @@
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.error import HTTPError, URLError
+import socket
+import threading
+
+from openreview.apps.papers.connections import ConnectionPool
+from openreview.apps.tools.testing import BaseTestCase
+
+__all__ = ["TestConnectionPool"]
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Responds with the client port. Paths are `/<status>`, or `/redirect`."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+
+        if self.path == "/redirect":
+            status = 302
+        elif self.path != "/":
+            status = int(self.path[1:])
+
+        body = str(self.client_address[1]).encode("utf-8")
+        self.send_response(status)
+        if status == 302:
+            self.send_header("Location", "/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPool(BaseTestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        self.server.requests, self.server.statuses = [], []
+        threading.Thread(target=self.server.serve_forever).start()
+
+        self.url = "http://127.0.0.1:{port}/".format(port=self.server.server_port)
+        self.pool = ConnectionPool(timeout=1, retries=2, backoff=0)
+
+    def tearDown(self):
+        self.pool.clear()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_keep_alive(self):
+        port = self.pool.urlopen(self.url).read()
+        self.assertEqual(self.pool.urlopen(self.url).read(), port)
+        self.assertEqual(self.pool.urlopen(self.url + "redirect").read(), port)
+        self.assertEqual(self.server.requests, ["/", "/", "/redirect", "/"])
+
+    def test_retry(self):
+        self.server.statuses = [503, 502]
+        self.assertEqual(self.pool.urlopen(self.url).read(), self.pool.urlopen(self.url).read())
+        self.assertEqual(len(self.server.requests), 4)
+
+        # Client errors are not retried
+        with self.assertRaises(HTTPError) as cm:
+            self.pool.urlopen(self.url + "404")
+        self.assertEqual(cm.exception.code, 404)
+        self.assertEqual(len(self.server.requests), 5)
+
+        # Gives up after the last retry
+        self.assertRaises(HTTPError, self.pool.urlopen, self.url + "503")
+        self.assertEqual(len(self.server.requests), 8)
+
+    def test_connection_error(self):
+        # Nothing listens on a port which was just released
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        self.assertRaises(URLError, self.pool.urlopen, "http://127.0.0.1:{port}/".format(port=port))
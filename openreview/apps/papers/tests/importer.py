@@ -0,0 +1,108 @@
+from io import BytesIO
+import json
+import os
+import tempfile
+
+from django.core import management
+from openreview.apps.main.models import Paper, Author, Category
+from openreview.apps.papers.importer import import_papers, read_xml, read_dump
+from openreview.apps.tools.testing import BaseTestCase, create_test_author
+
+__all__ = ["TestImporter"]
+
+FIXTURE = os.path.join(os.path.dirname(os.path.realpath(__file__)), "../fixtures/arxiv/1306.3879.xml")
+
+OAI_RESPONSE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+  <ListRecords>
+    <record>
+      <header><identifier>oai:arXiv.org:0704.0002</identifier></header>
+      <metadata>
+        <arXiv xmlns="http://arxiv.org/OAI/arXiv/">
+          <id>0704.0002</id>
+          <created>2007-03-30</created>
+          <authors>
+            <author><keyname>Streinu</keyname><forenames>Ileana</forenames></author>
+            <author><keyname>Theran</keyname><forenames>Louis</forenames></author>
+          </authors>
+          <title>Sparsity-certifying Graph Decompositions</title>
+          <categories>math.CO cs.CG</categories>
+          <abstract>We describe a new algorithm.</abstract>
+        </arXiv>
+      </metadata>
+    </record>
+  </ListRecords>
+</OAI-PMH>
+"""
+
+
+class TestImporter(BaseTestCase):
+    def setUp(self):
+        management.call_command("loaddata", "initial_data", verbosity=0)
+        Paper.objects.all().delete()
+
+    def test_read_xml(self):
+        with open(FIXTURE, "rb") as fp:
+            atom, = read_xml(fp)
+        self.assertEqual(atom["doc_id"], "1306.3879")
+        self.assertEqual(atom["urls"], "http://arxiv.org/abs/1306.3879v1")
+        self.assertEqual(len(atom["authors"]), 5)
+        self.assertEqual(atom["publish_date"].isoformat(), "2013-06-17")
+
+        oai, = read_xml(BytesIO(OAI_RESPONSE))
+        self.assertEqual(oai["doc_id"], "0704.0002")
+        self.assertEqual(oai["authors"], ["Ileana Streinu", "Louis Theran"])
+        self.assertEqual(oai["categories"], ["math.CO", "cs.CG"])
+
+    def test_import(self):
+        existing = create_test_author(name="Louis Theran")
+
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as fp:
+            for i in range(5):
+                fp.write(json.dumps({
+                    "id": "0704.000%d" % i,
+                    "title": "Paper %d" % i,
+                    "abstract": "*abstract*",
+                    "authors_parsed": [["Theran", "Louis", ""], ["Author", str(i), ""]],
+                    "categories": "astro-ph.CO unknown",
+                    "versions": [{"created": "Mon, 2 Apr 2007 19:18:42 GMT"}]
+                }) + "\n")
+
+        try:
+            self.assertEqual(import_papers(read_dump(fp.name), chunk_size=2), (5, 0))
+            self.assertEqual(import_papers(read_dump(fp.name), chunk_size=2), (0, 5))
+        finally:
+            os.remove(fp.name)
+
+        self.assertEqual(Paper.objects.count(), 5)
+        self.assertEqual(Author.objects.filter(name="Louis Theran").count(), 1)
+
+        paper = Paper.objects.get(doc_id="0704.0003")
+        self.assertEqual(set(paper.authors.all()), {existing, Author.objects.get(name="3 Author")})
+        self.assertEqual(list(paper.categories.all()), [Category.objects.get(arxiv_code="astro-ph.CO")])
+        self.assertEqual(paper.author_line, "Louis Theran, 3 Author")
+        self.assertEqual(paper.abstract_html.strip(), "<p><em>abstract</em></p>")
+        self.assertEqual(paper.publish_date.isoformat(), "2007-04-02")
+        self.assertTrue(paper.related_outdated)
+
+        with open(FIXTURE, "rb") as fp:
+            self.assertEqual(import_papers(read_xml(fp)), (1, 0))
+
+    def test_import_incomplete(self):
+        feed = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry><title>Without identifier</title></entry>
+  <entry><id>http://arxiv.org/abs/1306.3880v1</id></entry>
+  <entry><id>http://arxiv.org/abs/1306.3881v1</id><title>Complete</title></entry>
+</feed>
+"""
+        self.assertEqual(import_papers(read_xml(BytesIO(feed))), (1, 2))
+        self.assertEqual(list(Paper.objects.values_list("doc_id", flat=True)), ["1306.3881"])
+
+    def test_import_large_chunk(self):
+        # Lookups of a chunk exceed the number of parameters SQLite allows in one query
+        records = [{"doc_id": "0704.%04d" % i, "title": "Paper", "abstract": "", "authors": ["Author %d" % i]}
+                   for i in range(1000)]
+        self.assertEqual(import_papers(records), (1000, 0))
+        self.assertEqual(import_papers(records), (0, 1000))
+        self.assertEqual(Author.objects.filter(name__startswith="Author ").count(), 1000)
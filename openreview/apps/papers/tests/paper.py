@@ -1,9 +1,14 @@
+from django.conf import settings
+from django.contrib.messages import constants
+from django.contrib.messages.storage.base import Message
 from django.core.urlresolvers import reverse
 from django.test import Client
 from selenium.common.exceptions import NoSuchElementException
 
+from openreview.apps.main.models import update_related_papers
 from openreview.apps.tools.testing import BaseTestCase
 from openreview.apps.tools.testing import create_test_paper, assert_max_queries, create_test_user, SeleniumTestCase
+from openreview.apps.tools.testing import create_test_vote
 
 
 __all__ = ["TestPaperWithReviewsView", "TestPaperViewLive"]
@@ -12,6 +17,8 @@ __all__ = ["TestPaperWithReviewsView", "TestPaperViewLive"]
 class TestPaperWithReviewsView(BaseTestCase):
     def setUp(self):
         self.paper = create_test_paper(2, 2, 2, 2)
+        # Outdated related papers are calculated on each view, see Paper.get_related_papers()
+        update_related_papers(self.paper.id)
         self.client = Client()
 
     def test_queries_anonymous(self):
@@ -25,6 +32,47 @@ class TestPaperWithReviewsView(BaseTestCase):
         with assert_max_queries(n=14):
             self.client.get(reverse("paper", args=[self.paper.id]))
 
+    def test_conditional_get(self):
+        url = reverse("paper", args=[self.paper.id])
+        etag = self.client.get(url)["ETag"]
+
+        with assert_max_queries(n=0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Votes change the paper page
+        create_test_vote(review=self.paper.reviews.all()[0])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        # So does renaming the poster of a review
+        etag = response["ETag"]
+        poster = self.paper.reviews.all()[0].poster
+        poster.first_name = "Renamed"
+        poster.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # Forms embed the CSRF token
+        etag = self.client.get(url)["ETag"]
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = "other-token"
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_conditional_get_messages(self):
+        user = create_test_user(password="123")
+        self.assertTrue(self.client.login(username=user.username, password="123"))
+        url = reverse("paper", args=[self.paper.id])
+        etag = self.client.get(url)["ETag"]
+
+        # Pending messages are shown on the next page
+        session = self.client.session
+        session["_messages"] = [Message(constants.INFO, "Paper added")]
+        session.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Paper added")
+
 
 class TestPaperViewLive(SeleniumTestCase):
     def test_new_review(self):
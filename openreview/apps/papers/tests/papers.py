@@ -1,24 +1,84 @@
 from django.core.urlresolvers import reverse
 from django.test import Client
 
-from openreview.apps.tools.testing import create_test_paper, BaseTestCase
+from openreview.apps.main.models import Paper, PaperScore
+from openreview.apps.tools.testing import create_test_paper, create_test_review, BaseTestCase
+from openreview.apps.tools.testing import assert_max_queries, list_queries
 
 __all__ = ["TestPapersView"]
 
 
 class TestPapersView(BaseTestCase):
     def test_get(self):
-        create_test_paper()
+        self._create_listed_papers(11)
         c = Client()
 
         subpages = ["new", "trending", "controversial"]
         for subpage in subpages:
             url = reverse(subpage)
-            self.assertEqual(c.get(url).status_code, 200)
-            self.assertEqual(c.get(url + "?page=0").status_code, 200)
-            self.assertEqual(c.get(url + "?page=1").status_code, 200)
-            self.assertEqual(c.get(url + "?page=999").status_code, 200)
-            self.assertEqual(c.get(url + "?page=-1").status_code, 404)
-            self.assertEqual(c.get(url + "?page=").status_code, 404)
-            self.assertEqual(c.get(url + "?page=abc").status_code, 404)
-            self.assertEqual(c.get(url + "?page=1abc").status_code, 404)
+            response = c.get(url)
+            self.assertEqual(response.status_code, 200)
+            cursor = response.context["papers"].next_cursor
+            self.assertIsNotNone(cursor)
+            self.assertEqual(c.get(url, {"cursor": cursor}).status_code, 200)
+            self.assertEqual(c.get(url + "?cursor=").status_code, 200)
+            self.assertEqual(c.get(url + "?cursor=abc").status_code, 404)
+            self.assertEqual(c.get(url + "?cursor=1abc").status_code, 404)
+
+        self.assertEqual(c.get(reverse("new") + "?cursor=999").status_code, 200)
+        self.assertEqual(c.get(reverse("trending") + "?cursor=1.5_3").status_code, 200)
+        self.assertEqual(c.get(reverse("trending") + "?cursor=999").status_code, 404)
+        self.assertEqual(c.get(reverse("controversial") + "?cursor=999").status_code, 404)
+        self.assertEqual(c.get(reverse("trending") + "?cursor=1.5").status_code, 404)
+        self.assertEqual(c.get(reverse("trending") + "?cursor=abc_3").status_code, 404)
+
+    def _walk(self, url):
+        c = Client()
+        papers, cursor = [], None
+        while True:
+            response = c.get(url, {} if cursor is None else {"cursor": cursor})
+            self.assertEqual(response.status_code, 200)
+            page = response.context["papers"]
+            papers.extend(page)
+            if not page.has_next():
+                return papers
+            cursor = page.next_cursor
+
+    def test_pagination(self):
+        Paper.objects.all().delete()
+        papers = [create_test_paper() for i in range(25)]
+        self.assertEqual(self._walk(reverse("new")), papers[::-1])
+
+        # Ties in scores are broken on id
+        controversial = papers[:12]
+        for i, paper in enumerate(controversial):
+            PaperScore.objects.create(paper=paper, controversy=i // 5 + 1)
+        expected = sorted(controversial, key=lambda p: (p.score.controversy, p.id), reverse=True)
+        self.assertEqual(self._walk(reverse("controversial")), expected)
+
+    def _create_listed_papers(self, n):
+        for i in range(n):
+            paper = create_test_paper(n_comments=1)
+            create_test_review(paper=paper, rating=1)
+            create_test_review(paper=paper, rating=7)
+
+    def test_queries(self):
+        Paper.objects.all().delete()
+        self._create_listed_papers(1)
+        c = Client()
+
+        for subpage in ["new", "trending", "controversial"]:
+            url = reverse(subpage)
+
+            queries = []
+            with list_queries(destination=queries, log_output=False):
+                c.get(url)
+
+            # Listing more papers must not take more queries
+            self._create_listed_papers(9)
+            with assert_max_queries(n=len(queries)):
+                response = c.get(url)
+
+            self.assertEqual(len(response.context["papers"]), 10)
+            Paper.objects.all().delete()
+            self._create_listed_papers(1)
@@ -2,7 +2,7 @@ from django.test import TestCase
 from django.core.urlresolvers import reverse
 from django.test import Client
 
-from openreview.apps.main.models import Review, Paper
+from openreview.apps.main.models import Review, Paper, update_related_papers
 from openreview.apps.tools.testing import create_test_user, create_test_review, SeleniumTestCase, create_test_paper, \
     assert_max_queries
 
@@ -13,6 +13,7 @@ class TestReviewView(TestCase):
     def test_n_queries_anonymous(self):
         """As an anonymous user, TestReview doesn't have to fetch owned reviews or votes."""
         paper = create_test_paper(n_reviews=1)
+        update_related_papers(paper.id)
 
         with assert_max_queries(n=11):
             # [0] Paper
@@ -34,6 +35,7 @@ class TestReviewView2(TestCase):
 
         paper = create_test_paper(n_reviews=1)
         user = create_test_user(password="test")
+        update_related_papers(paper.id)
 
         client = Client()
         client.login(username=user.username, password="test")
@@ -1,15 +1,61 @@
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime
+import io
 import json
+import re
+import threading
+import time
 
 import os
 from django.test.client import Client
 from django.core.urlresolvers import reverse
 from django.core import management
+from django.core.cache import get_cache
 from openreview.apps.papers import scrapers
 from openreview.apps.tools.testing import BaseTestCase
 from openreview.apps.main.models import Category
 
 
-__all__ = ['TestArXivScraper']
+__all__ = ['TestArXivScraper', 'TestDOIScraper', 'TestBatchScraper']
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "../fixtures")
+
+
+def get_entry_id(doc_id):
+    # The arXiv API returns the latest version, and drops the subject class of old-style ids
+    doc_id = re.sub(r"\.[A-Za-z\-]+/", "/", doc_id)
+    return doc_id if re.search(r"v\d+$", doc_id) else doc_id + "v1"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """
+    Serves arXiv API responses for any requested ids, based on the entry in
+    fixtures/arxiv/1306.3879.xml. Requests for id `missing` return no entry.
+    """
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        time.sleep(self.server.delay)
+        self.server.requests.append(query)
+
+        if "id_list" in query:
+            doc_ids = query["id_list"][0].split(",")
+        else:
+            doc_ids = [query["search_query"][0][len("id:"):]]
+
+        with open(os.path.join(FIXTURE_DIR, "arxiv/1306.3879.xml")) as fp:
+            feed = fp.read()
+        start, end = feed.index("<entry>"), feed.index("</entry>") + len("</entry>")
+        entries = "".join(feed[start:end].replace("1306.3879v1", get_entry_id(doc_id))
+                          for doc_id in doc_ids if doc_id != "missing")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.end_headers()
+        self.wfile.write((feed[:start] + entries + feed[end:]).encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
 
 
 class TestArXivScraper(BaseTestCase):
@@ -35,8 +81,8 @@ relativistic electrons.\n"""
         management.call_command("loaddata", "initial_data", verbosity=0)
         self.arxivscraper = scrapers.Controller(scrapers.ArXivScraper, caching=False)
         self.oldurlopen = scrapers.urlopen
-        scrapers.urlopen = lambda x: open(os.path.dirname(os.path.realpath(__file__)) +
-                                          "/../fixtures/arxiv/1306.3879.xml")
+        scrapers.urlopen = lambda url, timeout=None: open(os.path.dirname(os.path.realpath(__file__)) +
+                                                          "/../fixtures/arxiv/1306.3879.xml", "rb")
 
     def tearDown(self):
         scrapers.urlopen = self.oldurlopen
@@ -60,3 +106,186 @@ relativistic electrons.\n"""
         self.assertEqual(result.get('urls'), self.expected_urls)
         self.assertEqual(result.get('categories'), list(self.expected_categories))
 
+    def test_split_streaming(self):
+        with open(os.path.join(FIXTURE_DIR, "arxiv/1306.3879.xml")) as fp:
+            feed = fp.read()
+        start, end = feed.index("<entry>"), feed.index("</entry>") + len("</entry>")
+        entries = "".join(feed[start:end].replace("1306.3879", "1306.{0:04}".format(i)) for i in range(2000))
+        feed = io.BytesIO((feed[:start] + entries + feed[end:]).encode("utf-8"))
+
+        n = 0
+        for doc_id, entry in scrapers.ArXivScraper.split(feed):
+            self.assertEqual(doc_id, "1306.{0:04}v1".format(n))
+            self.assertEqual(dict(scrapers.ArXivScraper.parse(entry))["title"], self.expected_title)
+
+            # Entries parsed before are freed, except for the (emptied) last one
+            previous = [e for e in entry.itersiblings(preceding=True) if e.tag == entry.tag]
+            self.assertLessEqual(len(previous), 1)
+            self.assertTrue(all(len(e) == 0 for e in previous))
+            n += 1
+        self.assertEqual(n, 2000)
+
+
+
+class TestDOIScraper(BaseTestCase):
+    def setUp(self):
+        self.controller = scrapers.Controller(scrapers.DOIScraper, caching=False)
+        self.oldurlopen = scrapers.urlopen
+        scrapers.urlopen = lambda url, timeout=None: open(os.path.join(FIXTURE_DIR, "crossref/10.1038_nature14539.json"), "rb")
+
+    def tearDown(self):
+        scrapers.urlopen = self.oldurlopen
+
+    def test_doi_scraper(self):
+        results = self.controller.run("10.1038/NATURE14539")
+        self.assertEqual(results["doc_id"], "10.1038/nature14539")
+        self.assertEqual(results["title"], "Deep learning")
+        self.assertEqual(results["authors"], ["Yann LeCun", "Yoshua Bengio", "Geoffrey Hinton"])
+        self.assertEqual(results["abstract"], "Deep learning allows computational models that are composed of "
+                                              "multiple processing layers to learn representations of data with "
+                                              "multiple levels of abstraction.")
+        self.assertEqual(results["publisher"], "Springer Science and Business Media LLC")
+        self.assertEqual(results["publish_date"], datetime(2015, 5, 27))
+        self.assertEqual(results["urls"], "http://dx.doi.org/10.1038/nature14539")
+
+    def test_doi_scraper_request(self):
+        response = Client().get(reverse("doi-scraper", kwargs={"id": "10.1038/nature14539"}))
+        result = json.loads(response.content.decode("utf-8"))
+        self.assertEqual(result.get("title"), "Deep learning")
+        self.assertEqual(result.get("doc_id"), "10.1038/nature14539")
+
+    def test_get_scraper(self):
+        self.assertEqual(scrapers.get_scraper("doi:10.1038/nature14539"), (scrapers.DOIScraper, "10.1038/nature14539"))
+        self.assertEqual(scrapers.get_scraper(" 10.1038/nature14539"), (scrapers.DOIScraper, "10.1038/nature14539"))
+        self.assertEqual(scrapers.get_scraper("arXiv:1306.3879"), (scrapers.ArXivScraper, "1306.3879"))
+        self.assertEqual(scrapers.get_scraper("1306.3879v2"), (scrapers.ArXivScraper, "1306.3879v2"))
+        self.assertEqual(scrapers.get_scraper("hep-th/9901001"), (scrapers.ArXivScraper, "hep-th/9901001"))
+        self.assertRaises(scrapers.InvalidDocument, scrapers.get_scraper, "isbn:0470841559")
+
+        controller, doc_id = scrapers.Controller.for_identifier("doi:10.1038/nature14539", caching=False)
+        self.assertEqual(controller.run(doc_id)["title"], "Deep learning")
+
+
+class TestBatchScraper(BaseTestCase):
+    def setUp(self):
+        management.call_command("loaddata", "initial_data", verbosity=0)
+
+        self.server = HTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self.server.requests, self.server.delay = [], 0
+        threading.Thread(target=self.server.serve_forever).start()
+
+        url = "http://127.0.0.1:{port}/api/query?".format(port=self.server.server_port)
+        self.scraper = type("LocalArXivScraper", (scrapers.ArXivScraper,), {
+            "scraper_url": url + "search_query=id:{doc_id}",
+            "batch_url": url + "id_list={doc_ids}&max_results={n}",
+            "batch_size": 2
+        })
+
+        self.oldcache = scrapers.cache
+        scrapers.cache = get_cache("django.core.cache.backends.locmem.LocMemCache")
+        # Local memory caches without a location share their storage, so earlier
+        # tests may have cached documents already
+        scrapers.cache.clear()
+
+    def tearDown(self):
+        scrapers.cache = self.oldcache
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def _wait_for_requests(self, n):
+        for i in range(50):
+            if len(self.server.requests) >= n:
+                return
+            time.sleep(0.1)
+
+    def test_run_many(self):
+        controller = scrapers.Controller(self.scraper, caching=False)
+        results = controller.run_many(["1306.3879", "1306.3880 ", "1306.3881", "missing"])
+
+        # Two batches of two documents
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(set(results), {"1306.3879", "1306.3880", "1306.3881", "missing"})
+        self.assertIsInstance(results["missing"], scrapers.ScraperError)
+        self.assertEqual(results["1306.3880"]["doc_id"], "1306.3880")
+        self.assertEqual(results["1306.3880"]["urls"], "http://arxiv.org/abs/1306.3880v1")
+        self.assertEqual(results["1306.3881"]["categories"], list(TestArXivScraper.expected_categories))
+
+        self.assertEqual(controller.run("1306.3879")["title"], TestArXivScraper.expected_title)
+        self.assertRaises(scrapers.ScraperError, controller.run, "missing")
+
+    def test_run_many_versions(self):
+        controller = scrapers.Controller(self.scraper, caching=False)
+        results = controller.run_many(["1306.3879v2", "math.GT/0309136", "1306.3880"])
+
+        # Entries are matched to the requested ids, and no others are added
+        self.assertEqual(set(results), {"1306.3879v2", "math.GT/0309136", "1306.3880"})
+        self.assertEqual(results["1306.3879v2"]["urls"], "http://arxiv.org/abs/1306.3879v2")
+        self.assertEqual(results["math.GT/0309136"]["urls"], "http://arxiv.org/abs/math/0309136v1")
+        self.assertEqual(results["math.GT/0309136"]["doc_id"], "math.GT/0309136")
+        self.assertEqual(results["1306.3880"]["urls"], "http://arxiv.org/abs/1306.3880v1")
+
+    def test_split_error(self):
+        def split(cls, doc):
+            yield next(ArXivScraper.split(doc))
+            raise IndexError("Entry without id")
+
+        ArXivScraper = self.scraper
+        scraper = type("TruncatedArXivScraper", (self.scraper,), {"split": classmethod(split)})
+        controller = scrapers.Controller(scraper)
+        results = controller.run_many(["1306.3879", "1306.3880"])
+
+        # Documents after a failing entry are not known to be missing, and are not cached as such
+        self.assertEqual(results["1306.3879"]["doc_id"], "1306.3879")
+        self.assertIsInstance(results["1306.3880"], scrapers.ScraperError)
+        self.assertNotIsInstance(results["1306.3880"], scrapers.InvalidDocument)
+        self.assertIsNone(scrapers.cache.get(controller.get_cache_key("1306.3880")))
+
+    def test_single_flight(self):
+        # Do not touch the database from other threads
+        self.scraper.postprocess = classmethod(lambda cls, results: results.items())
+        controller = scrapers.Controller(self.scraper, caching=False)
+        self.server.delay = 0.5
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(controller.run("1306.3879")))
+                   for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r["doc_id"] == "1306.3879" for r in results))
+
+    def test_caching(self):
+        self.scraper.postprocess = classmethod(lambda cls, results: results.items())
+        controller = scrapers.Controller(self.scraper)
+
+        controller.run("1306.3879")
+        controller.run("1306.3879")
+        self.assertRaises(scrapers.InvalidDocument, controller.run, "missing")
+        self.assertRaises(scrapers.InvalidDocument, controller.run, "missing")
+        self.assertEqual(len(self.server.requests), 2)
+
+        # Results are cached per scraper (version)
+        self.scraper.cache_version += 1
+        controller.run("1306.3879")
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_stale_while_revalidate(self):
+        self.scraper.postprocess = classmethod(lambda cls, results: results.items())
+        controller = scrapers.Controller(self.scraper, ttl=0)
+        controller.run("1306.3879")
+        self.assertEqual(len(self.server.requests), 1)
+
+        # Stale result is returned without waiting for the (single) refresh
+        self.server.delay = 0.5
+        for i in range(3):
+            self.assertEqual(controller.run("1306.3879")["doc_id"], "1306.3879")
+        self.assertEqual(len(self.server.requests), 1)
+
+        self._wait_for_requests(2)
+        time.sleep(0.2)
+        self.assertEqual(len(self.server.requests), 2)
@@ -1,14 +1,23 @@
+from unittest import skipIf
+
+from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.test import Client
 from openreview.apps.tools.testing import BaseTestCase as TestCase
-from openreview.apps.tools.testing import create_test_paper
+from openreview.apps.tools.testing import create_test_paper, create_test_author, create_test_keyword
+from openreview.apps.tools.testing import list_queries
+from haystack.query import SearchQuerySet
+from openreview.apps.main.models import Paper, QueuedIndexUpdate
+from openreview.apps.main.search import flush_index_queue, deferred_indexing
+from openreview.apps.papers.views import SearchView
 
-__all__ = ["TestSearchView"]
+__all__ = ["TestSearchView", "TestQueuedIndexing"]
 
 class TestSearchView(TestCase):
     def setUp(self):
         self.client = Client()
         self.url = reverse("search-paper")
+        QueuedIndexUpdate.objects.all().delete()
         super().setUp()
 
     def test_empty_query(self):
@@ -20,6 +29,7 @@ class TestSearchView(TestCase):
 
     def test_non_empty(self):
         create_test_paper(title="Bitcoin in headline!")
+        flush_index_queue()
 
         # This result must be in elastic
         c = self.client.get(self.url + "?q=bitcoin")
@@ -28,3 +38,131 @@ class TestSearchView(TestCase):
         # This result probably isn't in elastic :)
         c = self.client.get(self.url + "?q=jameson")
         self.assertTrue(b"no results" in c.content.lower())
+
+    def test_full_text(self):
+        paper = create_test_paper(title="A peer-to-peer electronic cash system", abstract="Double-spending prevention")
+        paper.authors.add(create_test_author(name="Satoshi Nakamoto"))
+        paper.keywords.add(create_test_keyword(label="cryptocurrency"))
+        flush_index_queue()
+
+        for query in ("spending", "nakamoto", "cryptocurrency", "peer"):
+            c = self.client.get(self.url + "?q=" + query)
+            self.assertIn(b"A peer-to-peer electronic cash system", c.content)
+
+    @skipIf("whoosh" in settings.HAYSTACK_TESTING_CONNECTIONS["default"]["ENGINE"], "Whoosh does not support faceting")
+    def test_facets(self):
+        paper1, paper2 = create_test_paper(title="Bitcoin mining"), create_test_paper(title="Bitcoin trading")
+        paper1.authors.add(create_test_author(name="Miner"))
+        paper2.authors.add(create_test_author(name="Trader"))
+        flush_index_queue()
+
+        c = self.client.get(self.url + "?q=bitcoin")
+        self.assertEqual(set(c.context["papers"]), {paper1, paper2})
+        authors = dict(c.context["facets"])["authors"]
+        self.assertEqual({(value, count) for value, count, url in authors}, {("Miner", 1), ("Trader", 1)})
+
+        c = self.client.get(self.url + "?q=bitcoin&authors=Trader")
+        self.assertEqual(list(c.context["papers"]), [paper2])
+
+    def test_queries(self):
+        create_test_paper(title="Bitcoin 1")
+        flush_index_queue()
+        with list_queries() as queries1:
+            self.client.get(self.url + "?q=bitcoin")
+
+        for i in range(5):
+            create_test_paper(title="Bitcoin {i}".format(i=i + 2))
+        flush_index_queue()
+        with list_queries() as queries2:
+            c = self.client.get(self.url + "?q=bitcoin")
+
+        self.assertEqual(len(c.context["papers"]), 6)
+        self.assertEqual(len(queries1), len(queries2))
+
+    def test_pagination(self):
+        papers = {create_test_paper(title="Bitcoin {i}".format(i=i)) for i in range(5)}
+        flush_index_queue()
+
+        old = SearchView.per_page, SearchView.max_results
+        SearchView.per_page, SearchView.max_results = 2, 4
+        try:
+            seen, cursor = [], None
+            for i in range(2):
+                c = self.client.get(self.url, {"q": "bitcoin", "cursor": cursor} if cursor else {"q": "bitcoin"})
+                page = c.context["papers"]
+                self.assertEqual(len(page), 2)
+                seen.extend(page)
+                cursor = page.next_cursor
+
+            # Results beyond max_results are not served
+            self.assertIsNone(cursor)
+            self.assertEqual(len(set(seen)), 4)
+            self.assertTrue(set(seen) <= papers)
+            self.assertIn(b"q=bitcoin&amp;cursor=2", self.client.get(self.url + "?q=bitcoin").content)
+
+            self.assertEqual(self.client.get(self.url + "?q=bitcoin&cursor=4").status_code, 404)
+            self.assertEqual(self.client.get(self.url + "?q=bitcoin&cursor=1").status_code, 404)
+            self.assertEqual(self.client.get(self.url + "?q=bitcoin&cursor=-1").status_code, 404)
+            self.assertEqual(self.client.get(self.url + "?q=bitcoin&cursor=a").status_code, 404)
+        finally:
+            SearchView.per_page, SearchView.max_results = old
+
+
+class TestQueuedIndexing(TestCase):
+    def setUp(self):
+        QueuedIndexUpdate.objects.all().delete()
+        super().setUp()
+
+    def _search(self, query):
+        return [int(result.pk) for result in SearchQuerySet().models(Paper).auto_query(query)]
+
+    def test_queue(self):
+        paper = create_test_paper(title="Queued paper")
+        self.assertEqual(self._search("queued"), [])
+
+        # Relation changes queue the paper again
+        paper.authors.add(create_test_author(name="Queued author"))
+        queued = QueuedIndexUpdate.objects.filter(model="main.paper", object_id=paper.id)
+        self.assertEqual(queued.count(), 2)
+
+        n_queued = QueuedIndexUpdate.objects.count()
+        self.assertEqual(flush_index_queue(batch_size=1), n_queued)
+        self.assertEqual(QueuedIndexUpdate.objects.count(), 0)
+        self.assertEqual(self._search("queued"), [paper.id])
+
+        # Deleted papers are removed from the index
+        paper.delete()
+        flush_index_queue()
+        self.assertEqual(self._search("queued"), [])
+
+    def test_deferred_indexing(self):
+        with deferred_indexing():
+            paper = create_test_paper(title="Deferred paper", n_authors=2)
+            paper.save()
+            with deferred_indexing():
+                paper.keywords.add(create_test_keyword())
+            self.assertEqual(QueuedIndexUpdate.objects.count(), 0)
+
+        # Queued once per object
+        self.assertEqual(QueuedIndexUpdate.objects.filter(model="main.paper").count(), 1)
+        self.assertEqual(QueuedIndexUpdate.objects.filter(model="main.author").count(), 2)
+
+        flush_index_queue()
+        self.assertEqual(self._search("deferred"), [paper.id])
+
+        # Objects are queued when the context exits with an exception too
+        with self.assertRaises(ValueError):
+            with deferred_indexing():
+                create_test_paper(title="Failed import")
+                raise ValueError
+        self.assertEqual(QueuedIndexUpdate.objects.filter(model="main.paper").count(), 1)
+
+    def test_unknown_model(self):
+        paper = create_test_paper(title="Queued paper")
+        QueuedIndexUpdate.objects.create(model="main.removed", object_id=1)
+        QueuedIndexUpdate.objects.create(model="main.review", object_id=1)
+
+        # Entries of unknown or unindexed models do not block the queue
+        flush_index_queue()
+        self.assertEqual(QueuedIndexUpdate.objects.count(), 0)
+        self.assertEqual(self._search("queued"), [paper.id])
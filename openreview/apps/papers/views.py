@@ -1,16 +1,20 @@
 import json
 
 from functools import partial
-from django.core.paginator import Paginator, EmptyPage
+from urllib.parse import urlencode
 from django.http import Http404
 from django.shortcuts import HttpResponse, redirect
 from django.core.urlresolvers import reverse
-from django.views.decorators.cache import cache_page
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from haystack.query import SearchQuerySet
 from django.views.generic import TemplateView
-from openreview.apps.main.models import set_n_votes_cache, Review, Vote, Paper
+from openreview.apps.main.models import Review, Vote, Paper
+from openreview.apps.main.versions import get_etag, get_paper_version_key
+from openreview.apps.tools.pagination import CursorPaginator, SearchPaginator, InvalidCursor
 from openreview.apps.tools.views import ModelViewMixin
 from openreview.apps.papers import scrapers
+from openreview.apps.papers.autocomplete import get_index
 from openreview.apps.papers.forms import PaperForm, ArXivForm
 from django.utils.translation import ugettext_lazy as _
 from django.contrib import messages
@@ -38,9 +42,23 @@ class BaseReviewView(ModelViewMixin, TemplateView):
         )
 
 
+def paper_etag(request, paper_id, **kwargs):
+    # Pending messages are shown once, so the page has to be rendered
+    if len(messages.get_messages(request)):
+        return None
+
+    # The version of a paper changes with all its reviews and votes, so it also
+    # covers comment threads. Their forms embed the CSRF token.
+    return get_etag(request, get_paper_version_key(paper_id), csrf_token=True)
+
+
 class PaperWithReviewsView(BaseReviewView):
     template_name = "papers/paper.html"
 
+    @method_decorator(condition(etag_func=paper_etag))
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
     def get_context_data(self, **kwargs):
         paper = self.objects.get_paper(lambda p: p.prefetch_related("authors", "keywords", "categories"))
 
@@ -55,14 +73,9 @@ class PaperWithReviewsView(BaseReviewView):
             review.cache(select_related=["poster"])
             reviews = [r for r in review._reviews.values() if r.parent_id is None]
 
-        related_by_author = set(Paper.objects.filter(authors__in=paper.authors.all()).exclude(id=paper.id)[:4])
-        related_by_subject = set(Paper.objects.filter(keywords__in=paper.keywords.all()).exclude(id=paper.id)[:4])
-
-        if len(related_by_subject) < 4:
-            related_by_subject |= set(Paper.objects.filter(categories__in=paper.categories.all()).exclude(id=paper.id)[:4-len(related_by_subject)])
+        related_by_author, related_by_subject = paper.get_related_papers()
 
-        # Set cache and sort reviews by up-/downvotes
-        set_n_votes_cache(reviews)
+        # Sort reviews by up-/downvotes
         reviews.sort(key=lambda r: r.n_upvotes - r.n_downvotes, reverse=True)
         keywords = [{'url': '#', 'text': keyword} for keyword in paper.keywords.all()]
         return super().get_context_data(
@@ -70,10 +83,11 @@ class PaperWithReviewsView(BaseReviewView):
             related_s=related_by_subject, **kwargs)
 
 
+# Maps orderings to (queryset function, sort key, type of sort key)
 orderings = {
-    "new": Paper.latest,
-    "trending": partial(Paper.trending, 100),
-    "controversial": partial(Paper.controversial, 100)
+    "new": (Paper.latest, "id", int),
+    "trending": (partial(Paper.trending, None), "score__trending", float),
+    "controversial": (Paper.controversial, "score__controversy", float)
 }
 
 
@@ -82,19 +96,15 @@ class PapersView(TemplateView):
     order = ''
 
     def get_context_data(self, **kwargs):
-        page = self.request.GET.get('page', '1')
-
-        if not (page.isdigit() and int(page) >= 0):
-            raise Http404
-
-        page = int(page)
-        paginator = Paginator(orderings[self.order](), 10)
+        # An empty cursor is the first page, as in the API
+        cursor = self.request.GET.get('cursor') or None
+        papers, key, key_type = orderings[self.order]
+        paginator = CursorPaginator(papers(), 10, key=key, key_type=key_type)
 
         try:
-            papers = paginator.page(page)
-        except EmptyPage:
-            page = paginator.num_pages
-            papers = paginator.page(page)
+            papers = paginator.page(cursor)
+        except InvalidCursor:
+            raise Http404
 
         return super().get_context_data(order=self.order, papers=papers, **kwargs)
 
@@ -104,11 +114,14 @@ class PapersView(TemplateView):
 class ReviewView(BaseReviewView):
     template_name = "papers/comment_thread.html"
 
+    @method_decorator(condition(etag_func=paper_etag))
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
     def get_context_data(self, **kwargs):
         paper = self.objects.paper
         review = self.objects.review
-        review.cache(select_related=("poster",))
-        set_n_votes_cache(review._reviews.values())
+        review.cache(select_related=("poster",), descendants_only=True)
 
         return super().get_context_data(tree=review.get_tree(), paper=paper, review=review, **kwargs)
 
@@ -116,16 +129,63 @@ class ReviewView(BaseReviewView):
 class SearchView(TemplateView):
     template_name = "papers/search_results.html"
 
+    # Results can be narrowed down by these fields, passed as GET parameters
+    facets = ("authors", "keywords", "categories")
+    per_page = 20
+    max_results = 500
+
+    def get_search_queryset(self, query):
+        # Full-text search, or titles starting with (each word of) the query
+        sqs = SearchQuerySet().models(Paper)
+        sqs = sqs.auto_query(query) | sqs.autocomplete(content_auto=query)
+
+        for facet in self.facets:
+            sqs = sqs.facet(facet)
+            for value in self.request.GET.getlist(facet):
+                sqs = sqs.narrow('{facet}_exact:"{value}"'.format(facet=facet, value=sqs.query.clean(value)))
+
+        return sqs
+
+    def get_params(self):
+        """@return: GET parameters of this search, without the cursor"""
+        params = self.request.GET.copy()
+        params.pop("cursor", None)
+        return params
+
+    def get_facets(self, sqs):
+        """@return: list of (facet, [(value, count, url)]) tuples"""
+        counts = (sqs.facet_counts() or {}).get("fields", {})
+
+        facets = []
+        for facet in self.facets:
+            values = []
+            for value, count in counts.get(facet, ()):
+                params = self.get_params()
+                params.appendlist(facet, value)
+                values.append((value, count, "?" + params.urlencode()))
+            facets.append((facet, values))
+        return facets
+
     def get_context_data(self, **kwargs):
         query = self.request.GET.get('q') or ''
-        search_results = ()
+        papers, facets = (), ()
 
         if query:
-            search_results = (x.object for x in SearchQuerySet().models(Paper).autocomplete(content_auto=query))
-            # SearchQuerySet can end with 'None'. This filter will remove value from list.
-            search_results = tuple(filter(bool, search_results))
+            sqs = self.get_search_queryset(query)
+            paginator = SearchPaginator(sqs, self.per_page, Paper, max_results=self.max_results)
+
+            try:
+                # Only fetches and loads the papers on this page
+                papers = paginator.page(self.request.GET.get('cursor') or None)
+            except InvalidCursor:
+                raise Http404
 
-        return dict(super().get_context_data(papers=search_results, query=query))
+            # Facet counts are returned along with the page
+            facets = self.get_facets(sqs)
+
+        params = self.get_params().urlencode()
+        return dict(super().get_context_data(papers=papers, facets=facets, query=query,
+                                             params=params + "&" if params else ""))
 
 
 class AddPaperView(TemplateView):
@@ -159,17 +219,32 @@ class AddPaperView(TemplateView):
 
         return super().get(request)
 
-@cache_page(60 * 10)
-def doi_scraper(request, id):
-    return HttpResponse(json.dumps({"error": "Invalid document identifier"}),
-                        content_type="application/json")
+def autocomplete(request):
+    index, results = get_index(), []
+    # Nothing is found until the index of this process is built
+    for kind, id, label in index.search(request.GET.get("q", "")) if index else ():
+        if kind == "paper":
+            url = reverse("paper", args=[id])
+        else:
+            url = reverse("search-paper") + "?" + urlencode({"q": label, "authors": label})
+        results.append({"type": kind, "id": id, "label": label, "url": url})
 
+    return HttpResponse(json.dumps({"results": results}), content_type="application/json")
 
-def arxiv_scraper(request, doc_id):
+
+def _scrape(scraper, doc_id):
     try:
-        scraper_info = scrapers.Controller(scrapers.ArXivScraper).run(doc_id)
+        scraper_info = scrapers.Controller(scraper).run(doc_id)
         scraper_info.update({'publish_date': scraper_info['publish_date'].strftime("%A, %d. %B %Y %I:%M%p")})
         return HttpResponse(json.dumps(scraper_info), content_type="application/json")
     except scrapers.ScraperError:
         return HttpResponse(json.dumps({"error": "Invalid document identifier"}),
                             content_type="application/json")
+
+
+def doi_scraper(request, id):
+    return _scrape(scrapers.DOIScraper, id)
+
+
+def arxiv_scraper(request, doc_id):
+    return _scrape(scrapers.ArXivScraper, doc_id)
@@ -0,0 +1,29 @@
+import re
+
+import markdown2
+
+__all__ = ["RENDERER_VERSION", "render_markdown"]
+
+# Version of the output of render_markdown(). Stored HTML rendered with another
+# version is rendered again, so bump this when changing render_markdown().
+RENDERER_VERSION = 2
+
+# Urls in text, without trailing punctuation
+URL_PATTERN = re.compile(r"""((?:https?|ftp)://[^\s<>"']*[^\s<>"'.,;:!?)\]])""", re.IGNORECASE)
+
+
+def render_markdown(text, urls=False):
+    """
+    Renders `text` as markdown. HTML in `text` is escaped.
+
+    @param urls: convert urls in text to links
+    @type urls: bool
+
+    @rtype: str
+    """
+    if not urls:
+        return markdown2.markdown(text, safe_mode=True)
+
+    # Links are added while rendering, as urlizing HTML also matches urls in tags
+    return markdown2.markdown(
+        text, safe_mode=True, extras=["link-patterns"], link_patterns=[(URL_PATTERN, r"\1")])
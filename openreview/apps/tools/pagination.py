@@ -0,0 +1,181 @@
+from functools import reduce
+from django.db.models import Q
+
+__all__ = ["CursorPaginator", "CursorPage", "InvalidCursor", "SearchPaginator"]
+
+CURSOR_SEPARATOR = "_"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorPage(object):
+    """
+    A page of objects as returned by CursorPaginator. Unlike Django's Page it does not
+    know its number, nor the total number of pages.
+    """
+    def __init__(self, object_list, paginator, cursor, next_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def is_first(self):
+        return self.cursor is None
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class CursorPaginator(object):
+    """
+    Paginates a queryset on (`key`, id) without using OFFSET or COUNT(*), which get
+    linearly slower as pages get deeper. Instead, each page returns a cursor containing
+    the sort key and id of its last object, which is used to select the next page by
+    comparing against an (indexed) sort key:
+
+    >>> paginator = CursorPaginator(Paper.objects.all(), 10, key="score__trending", key_type=float)
+    >>> page = paginator.page()
+    >>> next_page = paginator.page(page.next_cursor)
+
+    `key` may span a relation (for example "score__trending"), in which case that
+    relation is selected along. Cursors are opaque to clients, invalid cursors raise
+    InvalidCursor.
+    """
+    def __init__(self, queryset, per_page, key="id", key_type=int, descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.key = key
+        self.key_type = key_type
+        self.descending = descending
+
+    @property
+    def count(self):
+        """Total number of objects. Executes a COUNT(*), so only use if asked for."""
+        return self.queryset.count()
+
+    def get_ordering(self):
+        direction = "-" if self.descending else ""
+        if self.key == "id":
+            return (direction + "id",)
+        return (direction + self.key, direction + "id")
+
+    def get_key(self, obj):
+        return reduce(getattr, self.key.split("__"), obj)
+
+    def make_cursor(self, obj):
+        if self.key == "id":
+            return str(obj.id)
+        return "{key!r}{sep}{obj.id}".format(key=self.get_key(obj), sep=CURSOR_SEPARATOR, obj=obj)
+
+    def parse_cursor(self, cursor):
+        """
+        @return: (key, id) of the last object of the previous page
+        @rtype: tuple
+        """
+        try:
+            if self.key == "id":
+                value = int(cursor)
+                return value, value
+
+            key, id = cursor.rsplit(CURSOR_SEPARATOR, 1)
+            return self.key_type(key), int(id)
+        except (ValueError, TypeError, OverflowError):
+            raise InvalidCursor("Invalid cursor: %r" % cursor)
+
+    def get_queryset(self, cursor=None):
+        objects = self.queryset.order_by(*self.get_ordering())
+        if "__" in self.key:
+            objects = objects.select_related(self.key.rsplit("__", 1)[0])
+
+        if cursor is None:
+            return objects
+
+        key, id = self.parse_cursor(cursor)
+        op = "lt" if self.descending else "gt"
+        if self.key == "id":
+            return objects.filter(**{"id__" + op: id})
+
+        return objects.filter(
+            Q(**{"%s__%s" % (self.key, op): key}) |
+            Q(**{self.key: key, "id__" + op: id})
+        )
+
+    def page(self, cursor=None):
+        """
+        Returns the page following `cursor`, or the first page if cursor is None.
+
+        @type cursor: str
+        @rtype: CursorPage
+        """
+        # Fetch a single extra object to find out whether there's a next page
+        objects = list(self.get_queryset(cursor)[:self.per_page + 1])
+
+        next_cursor = None
+        if len(objects) > self.per_page:
+            objects = objects[:self.per_page]
+            next_cursor = self.make_cursor(objects[-1])
+
+        return CursorPage(objects, self, cursor, next_cursor)
+
+
+class SearchPaginator(object):
+    """
+    Paginates a (Haystack) SearchQuerySet. Search results are ranked by relevance, so
+    there is no sort key to build a cursor from; cursors are offsets instead. Only
+    the results of the requested page are fetched from the search backend, and
+    their objects are loaded from the database with a single query.
+
+    Offsets are capped at `max_results`, as deep pages get expensive for search
+    backends and are of little use to anyone. They are multiples of `per_page`, as
+    Whoosh only fetches whole pages: it returns the results of the page containing
+    the start of a slice, so other slices repeat results of previous pages.
+    """
+    def __init__(self, searchqueryset, per_page, model, max_results=1000):
+        self.searchqueryset = searchqueryset
+        self.per_page = per_page
+        self.model = model
+        self.max_results = max_results
+
+    def parse_cursor(self, cursor):
+        """@return: offset of the first result of the page"""
+        try:
+            offset = int(cursor)
+        except (ValueError, TypeError, OverflowError):
+            raise InvalidCursor("Invalid cursor: %r" % cursor)
+
+        if not 0 <= offset < self.max_results or offset % self.per_page:
+            raise InvalidCursor("Invalid cursor: %r" % cursor)
+        return offset
+
+    def page(self, cursor=None):
+        """
+        Returns the page starting at `cursor`, or the first page if cursor is None.
+
+        @type cursor: str
+        @rtype: CursorPage
+        """
+        offset = 0 if cursor is None else self.parse_cursor(cursor)
+        end = min(offset + self.per_page, self.max_results)
+
+        # Results may be None if the index is out of sync with the database. The number
+        # of results is returned along with them, so counting does not query again.
+        results = list(self.searchqueryset[offset:end])
+        ids = [int(result.pk) for result in results if result is not None]
+        objects = self.model.objects.in_bulk(ids)
+
+        next_cursor = None
+        if end < min(self.searchqueryset.count(), self.max_results):
+            next_cursor = str(end)
+
+        return CursorPage([objects[id] for id in ids if id in objects], self, cursor, next_cursor)
@@ -16,7 +16,8 @@ from logging import getLogger
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.management import call_command
-from django.db import connection
+from django.core.signals import request_started
+from django.db import connection, reset_queries
 from django.test import LiveServerTestCase, SimpleTestCase
 from django.test.utils import override_settings
 
@@ -344,9 +345,13 @@ def list_queries(destination=None, log_output=True, ignore=("QUERY = 'BEGIN' - P
     debug_prev = settings.DEBUG
     settings.DEBUG = True
 
+    # Requests made by the test client would reset the recorded queries
+    request_started.disconnect(reset_queries)
+
     if destination is None:
         destination = []
 
+    queries = []
     try:
         yield destination
         queries = connection.queries[nqueries:]
@@ -354,6 +359,7 @@ def list_queries(destination=None, log_output=True, ignore=("QUERY = 'BEGIN' - P
         destination += queries
     finally:
         settings.DEBUG = debug_prev
+        request_started.connect(reset_queries)
 
         if log_output:
             for query in queries:
@@ -10,6 +10,7 @@ https://docs.djangoproject.com/en/1.6/ref/settings/
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 import os
+import tempfile
 
 from openreview.apps.tools.string import get_bool
 
@@ -64,7 +65,7 @@ MIDDLEWARE_CLASSES = (
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'openreview.apps.accounts.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 )
@@ -121,7 +122,22 @@ HAYSTACK_TESTING_CONNECTIONS = {
     },
 }
 
-HAYSTACK_SIGNAL_PROCESSOR = 'haystack.signals.RealtimeSignalProcessor'
+# Set DJANGO_TEST_WHOOSH to run tests against a local Whoosh index instead of
+# Elasticsearch (requires `pip install whoosh`). Whoosh does not support faceting.
+if get_bool("DJANGO_TEST_WHOOSH", False):
+    HAYSTACK_TESTING_CONNECTIONS = {
+        'default': {
+            'ENGINE': 'haystack.backends.whoosh_backend.WhooshEngine',
+            'PATH': os.path.join(tempfile.gettempdir(), 'openreview_whoosh_test'),
+        },
+    }
+
+# Snapshot of the autocomplete index (see manage.py dump_autocomplete), loaded instead
+# of querying all papers and authors when a process first serves autocomplete requests
+AUTOCOMPLETE_SNAPSHOT = os.environ.get("DJANGO_AUTOCOMPLETE_SNAPSHOT")
+
+# Saved objects are queued for indexing, run `manage.py flush_index_queue` to index them
+HAYSTACK_SIGNAL_PROCESSOR = 'openreview.apps.main.search.QueuedSignalProcessor'
 
 if DEBUG:
     CACHE_MIDDLEWARE_KEY_PREFIX = "DEBUG_"